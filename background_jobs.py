@@ -0,0 +1,183 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+import reporting
+import stage_metrics
+
+# ✅ 동시에 실행할 백그라운드 작업 수 / 진행 표시 갱신 주기(초) - 환경변수로 조정 가능
+JOB_WORKERS = int(os.environ.get("EXCEL_JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.environ.get("EXCEL_JOB_POLL_SECONDS", "0.5"))
+
+# 작업 상태
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "대기", "실행 중", "완료", "실패", "취소"
+
+logger = logging.getLogger("excel_tools.jobs")
+
+
+class JobCancelled(BaseException):
+    """ 취소 요청으로 중단된 작업 (파일별 오류 처리의 except Exception에 잡히지 않도록 BaseException 상속) """
+
+
+class Job:
+    """
+    백그라운드에서 실행되는 작업 하나 (진행 상황, 결과, 작업 중 발생한 메시지, 단계별 측정 결과)
+    key: 입력(업로드 + 설정) 식별 키 - 같은 키면 재실행 시 다시 처리하지 않고 이 작업을 재사용
+    """
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.status = PENDING
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.messages = []  # 작업 중 reporting으로 남긴 (수준, 메시지) - 끝난 뒤 화면에 다시 표시
+        self.recorder = None
+        self.future = None
+        self.shown = False  # 끝난 결과(실패/취소 포함)를 화면에 표시했는지 여부
+        self.started_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def fraction(self):
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+
+    def progress_text(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        counts = f" ({self.done}/{self.total})" if self.total else ""
+        return f"⏳ {self.label} · {self.message or self.status}{counts} · {elapsed:.0f}초"
+
+    def report(self, done, total, message=""):
+        """ 진행 상황 갱신 (취소 요청이 있으면 JobCancelled 발생) """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.done, self.total, self.message = done, total, message
+
+    def cancel(self):
+        """ 취소 요청 (실행 전이면 바로 취소, 실행 중이면 다음 진행 보고 시점에 중단) """
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = CANCELLED
+            self.finished_at = time.time()
+
+
+# 현재 스레드에서 실행 중인 작업 (작업 밖에서는 None)
+_current_job = contextvars.ContextVar("background_job", default=None)
+
+def report_progress(done, total, message=""):
+    """ 현재 실행 중인 작업에 진행 상황을 보고 (작업 밖에서는 아무것도 하지 않음, 취소 요청 시 JobCancelled) """
+    job = _current_job.get()
+    if job is not None:
+        job.report(done, total, message)
+
+
+class JobRunner:
+    """
+    작업을 스레드 풀에서 실행하는 실행기
+    파일 파싱은 작업 안에서 다시 프로세스 풀(parallel_ingest)을 사용하므로, 결과(DataFrame/바이트)를 복사 없이 넘기도록 스레드로 실행
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="excel-job")
+
+    def submit(self, key, label, func, *args, **kwargs):
+        job = Job(key, label)
+        job.future = self.executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    @staticmethod
+    def _run(job, func, args, kwargs):
+        token = _current_job.set(job)
+        job.status = RUNNING
+        try:
+            with reporting.capturing() as messages, stage_metrics.recording(job.label) as recorder:
+                job.messages, job.recorder = messages, recorder
+                job.result = func(*args, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            logger.exception(f"백그라운드 작업 실패: {job.label}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            _current_job.reset(token)
+
+
+@st.cache_resource
+def get_job_runner():
+    """ Streamlit 재실행(rerun) 간에 유지되는 전역 작업 실행기 반환 """
+    return JobRunner()
+
+def session_jobs():
+    """ 현재 세션의 작업 목록 (작업 구분 -> Job) """
+    return st.session_state.setdefault("background_jobs", {})
+
+def submit_session_job(slot, key, label, func, *args, **kwargs):
+    """
+    세션에 작업을 연결하는 함수 (slot: 기능별 작업 구분)
+    같은 key의 작업이 이미 있으면 그대로 반환 (재실행 시 다시 처리하지 않음), key가 바뀌었으면 기존 작업을 취소하고 새로 제출
+    같은 key라도 실패/취소로 끝나 그 결과를 이미 표시한 작업이면 새로 제출 (실패 결과를 계속 재사용하지 않음)
+    작업은 스크립트 스레드 밖에서 실행되므로 st.cache_resource 자원 등은 호출하는 쪽에서 구해 인자로 넘겨야 함
+    """
+    jobs = session_jobs()
+    job = jobs.get(slot)
+    if job is not None:
+        if job.key == key and not (job.status in (FAILED, CANCELLED) and job.shown):
+            return job
+        job.cancel()
+    jobs[slot] = get_job_runner().submit(key, label, func, *args, **kwargs)
+    return jobs[slot]
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _show_job_progress(slot):
+    """ 진행률 막대와 취소 버튼 (이 부분만 주기적으로 다시 실행, 작업이 끝나면 전체 화면을 다시 실행하여 결과 표시) """
+    job = session_jobs().get(slot)
+    if job is None or job.finished:
+        st.rerun()
+    st.progress(job.fraction, text=job.progress_text())
+    if st.button("⏹️ 작업 취소", key=f"cancel_job_{slot}"):
+        job.cancel()
+
+def wait_for_job(slot):
+    """
+    세션 작업이 완료되었으면 Job을 반환하고, 진행 중이면 진행 상황을 표시한 뒤 None 반환
+    작업 중 발생한 경고/오류는 다시 표시하고, 취소/실패한 작업은 안내 후 None 반환
+    """
+    job = session_jobs().get(slot)
+    if job is None:
+        return None
+    if not job.finished:
+        _show_job_progress(slot)
+        return None
+
+    reporting.replay(job.messages)
+    job.shown = True
+    if job.status == CANCELLED:
+        st.info(f"⏹️ {job.label} 작업이 취소되었습니다.")
+        if st.button("🔄 다시 실행", key=f"restart_job_{slot}"):
+            del session_jobs()[slot]
+            st.rerun()
+        return None
+    if job.status == FAILED:
+        st.error(f"🚨 {job.label} 처리 중 오류 발생: {job.error}")
+        return None
+
+    st.caption(f"✅ {job.label} 완료 ({job.finished_at - job.started_at:.1f}초)")
+    if job.recorder is not None and st.session_state.get(stage_metrics.METRICS_PANEL_KEY):
+        stage_metrics.show_stage_metrics(job.recorder, title=f"⏱️ {job.label} 단계별 처리 현황")
+    return job
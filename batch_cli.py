@@ -0,0 +1,258 @@
+"""
+엑셀 병합 / 인원 분석 / 4대보험 검증을 Streamlit 없이 폴더 단위로 실행하는 배치 CLI
+
+사용 예:
+    python batch_cli.py merge ./uploads -o merged.xlsx --delete-keywords 연봉
+    python batch_cli.py analyze ./rosters -o analysis.xlsx --month 2025-02 --timeline-months 12
+    python batch_cli.py insurance ./insurance -o insurance.xlsx --report validation.xlsx
+    python batch_cli.py insurance ./insurance-2025 -o insurance.xlsx --report validation.xlsx --reconcile
+    python batch_cli.py analyze ./rosters -o analysis.xlsx --config batch.json --metrics metrics.json
+    python batch_cli.py analyze ./rosters -o analysis.xlsx --month 2025-02 --compare-previous --diff-keys 성명,입사일
+    python batch_cli.py analyze ./rosters -o analysis.xlsx --month 2025-02 --transfers --transfer-keys 성명,생년월일 --transfer-days 14
+
+설정 파일(JSON)의 키는 옵션 이름과 같음 (예: {"month": "2025-02", "delete_keywords": ["주민", "연봉"], "workers": 4})
+명령줄 옵션이 설정 파일보다 우선함
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+
+from excel_cache import WorkbookCache
+from excel_stream_writer import StreamingWorkbookWriter
+from parallel_ingest import DEFAULT_INGEST_WORKERS
+from stage_metrics import recording, stage
+
+# 옵션별 기본값 (설정 파일과 명령줄 모두 지정하지 않은 경우)
+DEFAULTS = {
+    "delete_keywords": [],
+    "include_columns": [],
+    "sheet_order": None,
+    "month": None,
+    "timeline_months": None,
+    "snapshot": False,
+    "incremental": False,
+    "diff_keys": None,
+    "transfers": False,
+    "transfer_keys": None,
+    "transfer_days": None,
+    "report": None,
+    "reconcile": False,
+    "workers": DEFAULT_INGEST_WORKERS,
+    "metrics": None,
+}
+
+
+class MessageCollector(logging.Handler):
+    """ 처리 중 발생한 경고/오류 메시지를 지표 요약에 담기 위해 모으는 로그 핸들러 """
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.errors = []
+        self.warnings = []
+
+    def emit(self, record):
+        (self.errors if record.levelno >= logging.ERROR else self.warnings).append(record.getMessage())
+
+
+def split_list(value):
+    """ 쉼표로 구분된 문자열을 목록으로 변환 """
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def collect_xlsx_files(inputs):
+    """ 입력 경로(폴더 또는 파일)에서 .xlsx 파일 목록을 이름순으로 수집 (엑셀 임시 파일 '~$' 제외) """
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.lower().endswith(".xlsx") and not name.startswith("~$"))
+            files.extend(os.path.join(path, name) for name in names)
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"입력 경로를 찾을 수 없습니다: {path}")
+    return files
+
+def resolve_settings(args):
+    """ 기본값 < 설정 파일 < 명령줄 옵션 순서로 설정을 합침 """
+    settings = dict(DEFAULTS)
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 설정 키: {', '.join(sorted(unknown))}")
+        settings.update(config)
+
+    for key in DEFAULTS:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+    return settings
+
+def run_merge(files, output, settings):
+    """ 단순 엑셀 병합 실행 """
+    from streamlit_app_merge import merge_excel_files
+
+    with stage("merge"):
+        merged = merge_excel_files(files, settings["delete_keywords"], settings["include_columns"], settings["workers"], WorkbookCache())
+    with open(output, "wb") as f:
+        f.write(merged.getvalue())
+    return {}
+
+def run_analyze(files, output, settings):
+    """ 엑셀 병합 및 인원 분석 실행 """
+    import streamlit_app_HR as hr
+
+    _, previous_month, previous_month_last_day = hr.get_date_info()
+    date_columns, _ = hr.get_analysis_settings()
+    month = settings["month"] or previous_month
+    month_date = datetime.strptime(month, "%Y-%m")  # 형식 검증
+    sheet_order = settings["sheet_order"] or hr.DEFAULT_SHEET_ORDER
+    identity_columns = (settings["transfer_keys"] or hr.DEFAULT_IDENTITY_COLUMNS) if settings["transfers"] else None
+    max_gap_days = hr.TRANSFER_MAX_GAP_DAYS if settings["transfer_days"] is None else int(settings["transfer_days"])
+
+    pipeline = hr.EmployeeAnalysisPipeline(sheet_order, settings["delete_keywords"], settings["include_columns"], date_columns, settings["workers"], WorkbookCache())
+    with stage("load"):
+        pipeline.load(list(files))
+    if settings["snapshot"]:
+        from roster_snapshots import RosterSnapshotStore
+        with stage("snapshot"):
+            pipeline.save_snapshots(RosterSnapshotStore(), month, previous_month_last_day)
+    with stage("analyze"):
+        pipeline.analyze(month, previous_month, previous_month_last_day, identity_columns, max_gap_days)
+    if settings["incremental"]:
+        from roster_snapshots import RosterSnapshotStore
+        with stage("compare"):
+            pipeline.compare_snapshots(RosterSnapshotStore(), month, previous_month_last_day, settings["diff_keys"])
+    if settings["timeline_months"]:
+        with stage("timeline"):
+            pipeline.build_timeline(month, int(settings["timeline_months"]), previous_month_last_day)
+    with stage("write"):
+        pipeline.write(output)
+
+    return {
+        "month": month_date.strftime("%Y-%m"),
+        "sheets": {name: len(df) for name, df in pipeline.sheets.items()},
+        "sheet_metrics": pipeline.metrics,
+        "new_hires": 0 if pipeline.new_hires is None else len(pipeline.new_hires),
+        "resigned": 0 if pipeline.resigned is None else len(pipeline.resigned),
+        "transfers": 0 if pipeline.transfers is None else len(pipeline.transfers),
+        "roster_changes": {name: diff.summary() for name, diff in pipeline.diffs.items()},
+    }
+
+def run_insurance(files, output, settings):
+    """ 4대보험 병합 및 보험료 검증 실행 """
+    from streamlit_app_insurance import merge_insurance_files, build_premium_validation, summarize_validation, build_premium_reconciliation, write_reconciliation_sheets
+
+    with stage("merge"):
+        merged_wb = merge_insurance_files(files, settings["workers"])
+    if merged_wb is None:
+        return {}
+    with stage("write"):
+        merged_wb.save(output)
+
+    month = datetime.strptime(settings["month"], "%Y-%m") if settings["month"] else datetime.today()
+    with open(output, "rb") as f:
+        merged_data = f.read()
+    with stage("validate"):
+        report = build_premium_validation(merged_data, month.year * 12 + month.month)
+    reconciliation = None
+    if settings["reconcile"]:
+        with stage("reconcile"):
+            reconciliation = build_premium_reconciliation(files, month.year * 12 + month.month, settings["workers"])
+
+    if settings["report"] and (report is not None or reconciliation is not None):
+        writer = StreamingWorkbookWriter()
+        if report is not None:
+            writer.add_sheet("검증결과").write_dataframe(report)
+            writer.add_sheet("시트별_요약").write_dataframe(summarize_validation(report).reset_index())
+        if reconciliation is not None:
+            write_reconciliation_sheets(writer, reconciliation)
+        with stage("report"):
+            writer.save(settings["report"])
+
+    result = {"validated": 0, "mismatches": 0}
+    if report is not None:
+        result = {
+            "validated": len(report),
+            "mismatches": int((report["검증결과"] == "불일치").sum()),
+            "rate_versions": sorted(report["요율버전"].unique().tolist()),
+        }
+    if reconciliation is not None:
+        result["reconciliation"] = reconciliation["구분"].value_counts(sort=False).astype(int).to_dict()
+    return result
+
+COMMANDS = {
+    "merge": run_merge,
+    "analyze": run_analyze,
+    "insurance": run_insurance,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="엑셀 병합 / 인원 분석 / 4대보험 검증 배치 실행")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="실행할 작업")
+    parser.add_argument("inputs", nargs="+", help=".xlsx 파일 또는 폴더")
+    parser.add_argument("-o", "--output", required=True, help="결과 엑셀 파일 경로")
+    parser.add_argument("--config", help="설정 파일(JSON) 경로")
+    parser.add_argument("--delete-keywords", type=split_list, help="삭제할 컬럼 키워드 (쉼표로 구분)")
+    parser.add_argument("--include-columns", type=split_list, help="추출할 컬럼 (쉼표로 구분)")
+    parser.add_argument("--sheet-order", type=split_list, help="시트 정렬 순서 (쉼표로 구분, analyze)")
+    parser.add_argument("--month", help="기준 월 YYYY-MM (analyze: 기본 전월, insurance: 시트명에 월이 없을 때 적용할 요율 월)")
+    parser.add_argument("--timeline-months", type=int, help="월별 인원 추이 분석 개월 수 (analyze)")
+    parser.add_argument("--snapshot", action="store_true", default=None, help="정리된 명부를 기준 월 스냅샷으로 저장 (analyze)")
+    parser.add_argument("--compare-previous", "--incremental", dest="incremental", action="store_true", default=None, help="기준 월 전월 스냅샷과 사원 키로 대조하여 명부 변경 내역 시트 추가 (analyze, 집계는 전체 분석 그대로 - 증분 계산 아님, --incremental은 이전 이름)")
+    parser.add_argument("--diff-keys", type=split_list, help="전월 스냅샷 비교 사원 식별 키 컬럼 (쉼표로 구분, 기본 성명,입사일,부서명)")
+    parser.add_argument("--transfers", action="store_true", default=None, help="계열사 간 이동을 입사자/퇴사자와 구분 (analyze, 동명이인 구분을 위해 --transfer-keys에 생년월일/사번 등 지정 권장)")
+    parser.add_argument("--transfer-keys", type=split_list, help="계열사 간 이동 사원 식별 컬럼 (쉼표로 구분, 기본 성명,English Name)")
+    parser.add_argument("--transfer-days", type=int, help="계열사 간 이동으로 볼 퇴사일 → 입사일 최대 공백 일수 (기본 31)")
+    parser.add_argument("--report", help="보험료 검증 결과 엑셀 경로 (insurance)")
+    parser.add_argument("--reconcile", action="store_true", default=None, help="월별 보험료를 전월과 사원별로 대사하여 보고서에 추가 (insurance)")
+    parser.add_argument("--workers", type=int, help=f"파싱 워커 프로세스 수 (기본 {DEFAULT_INGEST_WORKERS}, 0/1이면 직렬)")
+    parser.add_argument("--metrics", help="처리 지표 요약(JSON) 저장 경로 (기본: 표준 출력)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    collector = MessageCollector()
+    logging.getLogger("excel_tools").addHandler(collector)
+
+    try:
+        settings = resolve_settings(args)
+        files = collect_xlsx_files(args.inputs)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    started_at = datetime.now()
+
+    # ✅ 단계별 시간/메모리는 화면과 같은 stage_metrics 기록기로 측정 (안쪽 단계는 stage_details에만 표시)
+    with recording(f"batch {args.command}") as recorder:
+        result = COMMANDS[args.command](files, args.output, settings)
+
+    metrics = {
+        "command": args.command,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "elapsed_seconds": round((datetime.now() - started_at).total_seconds(), 3),
+        "stages": {record.name: round(record.wall_seconds, 3) for record in recorder.top_stages()},
+        "stage_details": recorder.to_dict()["stages"],
+        "files": len(files),
+        "workers": settings["workers"],
+        "output": args.output,
+        "output_bytes": os.path.getsize(args.output) if os.path.exists(args.output) else None,
+        "errors": collector.errors,
+        "warnings": collector.warnings,
+        **result,
+    }
+    text = json.dumps(metrics, ensure_ascii=False, indent=2)
+    if settings["metrics"]:
+        with open(settings["metrics"], "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    return 1 if collector.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
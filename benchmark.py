@@ -0,0 +1,253 @@
+"""
+합성 엑셀 데이터로 단순 병합 / 인원 분석 / 4대보험 병합·검증의 단계별 소요 시간과 최대 메모리를 측정하는 벤치마크
+
+사용 예:
+    python benchmark.py                                   # 1,000 / 10,000 / 100,000행 측정 후 결과 출력
+    python benchmark.py --sizes 1000 10000 -o result.json
+    python benchmark.py --sizes                            # 시작 시간(import)만 측정
+    python benchmark.py -o result.json --baseline baseline.json            # 기준 결과와 비교 (느려진 단계가 있으면 종료 코드 1)
+    python benchmark.py --baseline baseline.json --update-baseline         # 이번 결과를 기준 결과로 저장
+
+생성한 합성 파일은 --data-dir 아래에 (종류, 행 수, seed)별로 보관하여 다음 실행에서 재사용
+최대 메모리는 단계마다 초기화한 프로세스 RSS 최댓값 (Linux), 그 외 환경에서는 프로세스 전체 최댓값
+시작 시간(startup)은 메인 화면과 기능 모듈별로 새 인터프리터에서 import 시간을 측정 (기능이 늘어나도 메인 화면 시작이 느려지지 않는지 확인)
+"""
+import os
+import io
+import gc
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import calendar
+import statistics
+import subprocess
+from datetime import datetime
+from contextlib import contextmanager
+
+import stage_metrics
+from excel_cache import WorkbookCache
+from synthetic_data import generate_roster_files, generate_insurance_files
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "excel_tools_benchmark")
+REFERENCE_MONTH = "2025-01"
+INSURANCE_MONTHS = ("2025-06", "2025-07")
+DELETE_KEYWORDS = ["연봉", "주민"]
+
+# 기준 결과 대비 이 비율 이상 느려지면 성능 저하로 표시
+DEFAULT_TOLERANCE = 0.2
+
+# 새 인터프리터에서 모듈 하나를 import하고 (초, 최대 메모리 바이트, 함께 불러온 기능 모듈)을 출력하는 스크립트
+STARTUP_PROBE = """
+import sys, time, json, resource
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+print(json.dumps({{"seconds": seconds, "peak_bytes": peak, "modules": sorted(set(sys.modules) & set({features!r}))}}))
+"""
+
+
+@contextmanager
+def measured(name):
+    """ 이전 단계가 남긴 객체를 정리(gc)한 뒤 stage_metrics 단계로 측정 """
+    gc.collect()
+    with stage_metrics.stage(name) as record:
+        yield record
+
+def stage_results(recorder):
+    """ 최상위 단계별 {"seconds", "peak_mb"} (기준 결과와 같은 형식) """
+    return {
+        record.name: {"seconds": round(record.wall_seconds, 3), "peak_mb": round(record.peak_bytes / 1024 / 1024, 1)}
+        for record in recorder.top_stages()
+    }
+
+
+def month_last_day(month_str):
+    """ 'YYYY-MM'의 마지막 날 'YYYY-MM-DD' """
+    month_date = datetime.strptime(month_str, "%Y-%m")
+    return f"{month_str}-{calendar.monthrange(month_date.year, month_date.month)[1]:02d}"
+
+def prepare_data(data_dir, kind, rows, seed):
+    """ 합성 파일을 (종류, 행 수, seed)별 폴더에 생성 (이미 있으면 재사용), (파일 목록, 생성 시간) 반환 """
+    directory = os.path.join(data_dir, f"{kind}_{rows}_{seed}")
+    done_marker = os.path.join(directory, ".complete")
+    if os.path.exists(done_marker):
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".xlsx")), 0.0
+
+    start = time.perf_counter()
+    if kind == "roster":
+        paths = generate_roster_files(directory, rows, seed, REFERENCE_MONTH)
+    else:
+        paths = generate_insurance_files(directory, rows, seed, INSURANCE_MONTHS)
+    open(done_marker, "w").close()
+    return sorted(paths), round(time.perf_counter() - start, 3)
+
+def bench_merge(files, workers):
+    """ 단순 엑셀 병합 (streamlit_app_merge.merge_excel_files) """
+    from streamlit_app_merge import merge_excel_files
+
+    with measured("merge"):
+        merge_excel_files(files, DELETE_KEYWORDS, [], workers, WorkbookCache())
+
+def bench_hr(files, workers, output_dir):
+    """ 인원 분석 파이프라인 (읽기 → 입·퇴사 분석 → 12개월 추이 → 결과 저장) """
+    import streamlit_app_HR as hr
+
+    last_day = month_last_day(REFERENCE_MONTH)
+    date_columns, _ = hr.get_analysis_settings()
+    pipeline = hr.EmployeeAnalysisPipeline(hr.DEFAULT_SHEET_ORDER, DELETE_KEYWORDS, [], date_columns, workers, WorkbookCache())
+    with measured("hr_load"):
+        pipeline.load(list(files))
+    with measured("hr_analyze"):
+        pipeline.analyze(REFERENCE_MONTH, REFERENCE_MONTH, last_day)
+    with measured("hr_timeline"):
+        pipeline.build_timeline(REFERENCE_MONTH, 12, last_day)
+    with measured("hr_write"):
+        pipeline.write(os.path.join(output_dir, "analysis.xlsx"))
+
+def bench_insurance(files, workers):
+    """ 4대보험 병합 → 저장 → 보험료 검증 """
+    from streamlit_app_insurance import merge_insurance_files, build_premium_validation
+
+    with measured("insurance_merge"):
+        merged_wb = merge_insurance_files(files, workers)
+    buffer = io.BytesIO()
+    with measured("insurance_write"):
+        merged_wb.save(buffer)
+    month_date = datetime.strptime(INSURANCE_MONTHS[0], "%Y-%m")
+    with measured("insurance_validate"):
+        build_premium_validation(buffer.getvalue(), month_date.year * 12 + month_date.month)
+
+def measure_startup(repeat=3):
+    """
+    streamlit, 메인 화면(streamlit_app), 기능 모듈별로 새 인터프리터에서 import 시간(중앙값)과 최대 메모리 측정
+    반환값: {"import:모듈명": {"seconds", "peak_mb", "feature_modules"}}
+    """
+    from streamlit_app import FEATURES
+
+    feature_modules = [module for module, _ in FEATURES.values()]
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    stages = {}
+    for module in ["streamlit", "streamlit_app", *feature_modules]:
+        probe = STARTUP_PROBE.format(module=module, features=feature_modules)
+        runs = []
+        for _ in range(repeat):
+            completed = subprocess.run([sys.executable, "-c", probe], cwd=repo_dir, capture_output=True, text=True, check=True)
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        stages[f"import:{module}"] = {
+            "seconds": round(statistics.median(run["seconds"] for run in runs), 3),
+            "peak_mb": round(max(run["peak_bytes"] for run in runs) / 1024 / 1024, 1),
+            "feature_modules": runs[-1]["modules"],  # 함께 불러온 기능 모듈 (메인 화면은 비어 있어야 함)
+        }
+    return stages
+
+def run_benchmarks(sizes, seed, workers, data_dir, startup_repeat=3):
+    """ 행 수별로 전체 단계를 측정하여 결과 딕셔너리 반환 """
+    results = {}
+    if startup_repeat:
+        results["startup"] = {"stages": measure_startup(startup_repeat)}
+        logging.info("시작 시간 측정 완료: %s", ", ".join(f"{name} {stage['seconds']}s" for name, stage in results["startup"]["stages"].items()))
+
+    for rows in sizes:
+        roster_files, roster_seconds = prepare_data(data_dir, "roster", rows, seed)
+        insurance_files, insurance_seconds = prepare_data(data_dir, "insurance", rows, seed)
+
+        with tempfile.TemporaryDirectory(prefix="bench_") as output_dir, stage_metrics.recording(f"benchmark {rows}") as recorder:
+            bench_merge(roster_files, workers)
+            bench_hr(roster_files, workers, output_dir)
+            bench_insurance(insurance_files, workers)
+
+        stages = stage_results(recorder)
+        results[str(rows)] = {
+            "generate_seconds": {"roster": roster_seconds, "insurance": insurance_seconds},
+            "stages": stages,
+        }
+        logging.info("%d행 완료: %s", rows, ", ".join(f"{name} {measured['seconds']}s" for name, measured in stages.items()))
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "workers": workers,
+        "memory_method": stage_metrics.PeakMemory().method,
+        "results": results,
+    }
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    기준 결과와 행 수/단계별로 비교 (양쪽에 모두 있는 항목만)
+    반환값: [(행 수, 단계, 기준 초, 현재 초, 비율, 기준 MB, 현재 MB, 성능 저하 여부)]
+    """
+    rows = []
+    for size, result in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {}).get("stages", {})
+        for stage, measured in result["stages"].items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            ratio = measured["seconds"] / base["seconds"] if base["seconds"] else None
+            regressed = ratio is not None and ratio > 1 + tolerance
+            rows.append((size, stage, base["seconds"], measured["seconds"], ratio, base.get("peak_mb"), measured["peak_mb"], regressed))
+    return rows
+
+def format_comparison(rows):
+    lines = [f"{'행 수':>8} {'단계':<20} {'기준(s)':>9} {'현재(s)':>9} {'비율':>7} {'기준MB':>8} {'현재MB':>8}"]
+    for size, stage, base_seconds, seconds, ratio, base_mb, peak_mb, regressed in rows:
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        lines.append(
+            f"{size:>8} {stage:<20} {base_seconds:>9.3f} {seconds:>9.3f} {ratio_text:>7} "
+            f"{base_mb if base_mb is not None else '-':>8} {peak_mb:>8}{'  ⚠️ 느려짐' if regressed else ''}"
+        )
+    return "\n".join(lines)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="합성 데이터 기반 단계별 성능 측정")
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="측정할 행 수 목록 (기본 1000 10000 100000, 값 없이 지정하면 시작 시간만 측정)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--workers", type=int, default=0, help="파싱 워커 프로세스 수 (기본 0: 직렬, 메모리는 현재 프로세스만 측정)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="합성 파일 보관 폴더")
+    parser.add_argument("-o", "--output", help="측정 결과(JSON) 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 기준 결과(JSON) 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 --baseline 경로에 저장")
+    parser.add_argument("--startup-repeat", type=int, default=3, help="시작 시간(import) 측정 반복 횟수 (0이면 측정 안 함)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="성능 저하로 볼 소요 시간 증가 비율 (기본 0.2)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline 에는 --baseline 경로가 필요합니다.")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    current = run_benchmarks(args.sizes, args.seed, args.workers, args.data_dir, args.startup_repeat)
+    text = json.dumps(current, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if not args.baseline:
+        return 0
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        logging.info("기준 결과 저장: %s", args.baseline)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare_results(current, baseline, args.tolerance)
+    print(format_comparison(rows), file=sys.stderr)
+    return 1 if any(row[-1] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
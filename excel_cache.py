@@ -0,0 +1,187 @@
+import os
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+import reporting
+
+# ✅ 캐시 최대 메모리 (MB) - 환경변수로 조정 가능
+DEFAULT_CACHE_MAX_MB = int(os.environ.get("EXCEL_CACHE_MAX_MB", "512"))
+
+def file_digest(source):
+    """ 파일 경로, 바이트 또는 업로드 객체 내용의 SHA-256 해시를 계산하는 함수 """
+    hasher = hashlib.sha256()
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        hasher.update(source)
+    elif hasattr(source, "getbuffer"):  # Streamlit UploadedFile / BytesIO (복사 없이 버퍼 사용)
+        hasher.update(source.getbuffer())
+    elif hasattr(source, "read"):
+        position = source.tell()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            hasher.update(chunk)
+        source.seek(position)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+def settings_key(**settings):
+    """ 파싱 설정(헤더 탐지, 삭제 키워드, 추출 컬럼 등)을 캐시 키로 사용할 수 있도록 변환하는 함수 """
+    return tuple(
+        (name, tuple(value) if isinstance(value, (list, set)) else value)
+        for name, value in sorted(settings.items())
+    )
+
+def estimate_size(value):
+    """ 캐시 항목이 차지하는 메모리(바이트)를 추정하는 함수 """
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+_MISSING = object()  # 캐시 미스 표시용 (None 값도 캐시할 수 있도록)
+
+
+class WorkbookCache:
+    """ 파싱된 DataFrame을 (파일 해시, 시트, 설정) 단위로 보관하는 LRU 캐시 """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """ 캐시에서 값을 조회하고 최근 사용 항목으로 갱신 """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """ 캐시에 값을 저장하고 메모리 한도를 넘으면 오래된 항목부터 제거 """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._used_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # 한도보다 큰 항목은 캐시하지 않음
+            self._entries[key] = (value, size)
+            self._used_bytes += size
+            while self._used_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._used_bytes -= evicted_size
+        return value
+
+    def get_or_compute(self, key, compute):
+        """ 캐시에 값이 없을 때만 compute()를 실행하여 저장 (None 결과는 저장하지 않음) """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def get_or_compute_reported(self, key, compute):
+        """
+        get_or_compute와 같지만 compute() 중 남긴 경고/오류 메시지를 결과와 함께 저장하는 함수
+        캐시에서 꺼낸 경우에도 계산할 때의 메시지를 다시 표시 (None 결과는 저장하지 않음)
+        """
+        entry = self.get(key, _MISSING)
+        if entry is _MISSING:
+            with reporting.capturing() as messages:
+                value = compute()
+            entry = (value, messages)
+            if value is not None:
+                self.put(key, entry)
+        reporting.replay(entry[1])
+        return entry[0]
+
+    def get_sheets(self, digest, settings):
+        """ 파일 해시 + 설정 기준으로 시트별 DataFrame을 조회 (하나라도 없으면 None) """
+        sheet_names = self.get(("sheets", digest, settings))
+        if sheet_names is None:
+            return None
+
+        sheets = {}
+        for sheet_name in sheet_names:
+            value = self.get(("sheet", digest, sheet_name, settings), _MISSING)
+            if value is _MISSING:
+                return None
+            sheets[sheet_name] = value
+        return sheets
+
+    def put_sheets(self, digest, settings, sheets):
+        """ 파싱된 {시트명: DataFrame}을 시트 단위로 저장 """
+        for sheet_name, value in sheets.items():
+            self.put(("sheet", digest, sheet_name, settings), value)
+        self.put(("sheets", digest, settings), list(sheets))
+        return sheets
+
+    def get_or_parse_sheets(self, digest, settings, parse):
+        """
+        파일 해시 + 설정 기준으로 시트별 DataFrame을 조회하고, 하나라도 없으면 parse()로 다시 파싱
+        parse()는 {시트명: DataFrame} 딕셔너리를 반환해야 함
+        """
+        sheets = self.get_sheets(digest, settings)
+        if sheets is None:
+            sheets = self.put_sheets(digest, settings, parse())
+        return sheets
+
+    def clear(self):
+        """ 캐시 전체 비우기 """
+        with self._lock:
+            self._entries.clear()
+            self._used_bytes = 0
+
+    @property
+    def used_bytes(self):
+        return self._used_bytes
+
+    def stats(self):
+        """ 캐시 적중/미스 횟수 및 사용량 반환 """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "used_bytes": self._used_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@st.cache_resource
+def get_workbook_cache(max_mb=DEFAULT_CACHE_MAX_MB):
+    """ Streamlit 재실행(rerun) 간에 유지되는 전역 워크북 캐시 반환 """
+    return WorkbookCache(max_bytes=max_mb * 1024 * 1024)
+
+def show_cache_stats(cache):
+    """ Streamlit 사이드바에 캐시 적중/미스 현황을 표시하는 함수 """
+    stats = cache.stats()
+    st.sidebar.caption(
+        f"🗂️ 파싱 캐시: 적중 {stats['hits']}회 / 미스 {stats['misses']}회 · "
+        f"{stats['used_bytes'] / 1024 / 1024:.1f}MB / {stats['max_bytes'] / 1024 / 1024:.0f}MB"
+    )
@@ -0,0 +1,154 @@
+import math
+from datetime import datetime, date
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Border, Side, Alignment
+from openpyxl.styles.numbers import is_date_format
+from openpyxl.utils import get_column_letter
+
+# ✅ DataFrame을 나눠서 변환할 행 수 (변환용 임시 메모리 상한)
+CHUNK_ROWS = 5000
+
+# pandas.ExcelWriter 헤더와 동일한 스타일 (굵게 + 얇은 테두리 + 가운데 정렬)
+_thin = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_thin, right=_thin, top=_thin, bottom=_thin)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+# 엑셀 시트명 최대 길이
+MAX_SHEET_NAME = 31
+
+def unique_sheet_name(base_name, used_names):
+    """
+    31자 제한에 맞춘 중복 없는 시트명 (중복이면 '(2)', '(3)' ... 추가, 엑셀처럼 대소문자 구분 없이 비교)
+    used_names: 이미 사용한 시트명(소문자) 집합 - 반환한 시트명을 추가함
+    """
+    new_sheet_name = base_name[:MAX_SHEET_NAME]
+
+    suffix = 1
+    while new_sheet_name.lower() in used_names:
+        suffix += 1
+        tail = f"({suffix})"
+        new_sheet_name = base_name[:MAX_SHEET_NAME - len(tail)] + tail
+
+    used_names.add(new_sheet_name.lower())
+    return new_sheet_name
+
+def to_excel_value(value):
+    """ pandas/numpy 값을 openpyxl이 기록할 수 있는 값으로 변환 (결측값은 빈 셀) """
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):  # numpy 스칼라
+        value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+    return value
+
+
+class StreamingSheet:
+    """
+    write-only 워크시트 래퍼
+    행을 생성하는 즉시 파일로 내보내므로 행 수와 관계없이 메모리 사용량이 일정함
+    열 너비, 행 높이, 열별 숫자/날짜 표기법은 첫 행을 쓰기 전에 선언해야 함
+    """
+
+    def __init__(self, ws, column_formats=None, copied_formats=None):
+        self.ws = ws
+        self.column_formats = dict(column_formats or {})  # 열 번호(1부터) -> 표기법
+        self.copied_formats = dict(copied_formats or {})  # 열 번호(1부터) -> 원본에서 복사한 표기법 (값 종류와 관계없이 적용)
+        self.date_columns = {col_idx for col_idx, fmt in self.column_formats.items() if is_date_format(fmt)}
+        self.rows_written = 0
+
+    def append(self, values, cell_formats=None):
+        """
+        값 목록을 한 행으로 기록
+        cell_formats: 이 행에만 적용할 {열 번호: 표기법} (복사한 열 표기법, 열별 기본 표기법보다 우선)
+        """
+        row = []
+        for col_idx, value in enumerate(values, start=1):
+            value = to_excel_value(value)
+            number_format = None
+            if cell_formats and col_idx in cell_formats:
+                number_format = cell_formats[col_idx]
+            elif col_idx in self.copied_formats:
+                number_format = self.copied_formats[col_idx]
+            elif col_idx in self.column_formats:
+                # 날짜 표기법은 날짜 값에만, 숫자 표기법은 숫자 값에만 적용
+                is_date = isinstance(value, (datetime, date))
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if (is_date if col_idx in self.date_columns else is_number):
+                    number_format = self.column_formats[col_idx]
+
+            if number_format is None or number_format == "General" or value is None:
+                row.append(value)
+            else:
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.number_format = number_format
+                row.append(cell)
+
+        self.ws.append(row)
+        self.rows_written += 1
+
+    def append_cells(self, cells):
+        """ 스타일이 지정된 WriteOnlyCell 목록을 한 행으로 기록 """
+        self.ws.append(cells)
+        self.rows_written += 1
+
+    def write_header(self, columns):
+        """ pandas.ExcelWriter와 같은 스타일로 헤더 행을 기록 """
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(self.ws, value=to_excel_value(column))
+            cell.font = HEADER_FONT
+            cell.border = HEADER_BORDER
+            cell.alignment = HEADER_ALIGNMENT
+            cells.append(cell)
+        self.append_cells(cells)
+
+    def write_dataframe(self, df, header=True):
+        """ DataFrame을 일정 크기씩 나눠 변환하며 기록 (index 제외) """
+        if header:
+            self.write_header(df.columns)
+        for start in range(0, len(df), CHUNK_ROWS):
+            for values in df.iloc[start:start + CHUNK_ROWS].itertuples(index=False, name=None):
+                self.append(values)
+
+    def merge_cells(self, cell_range):
+        """ 병합 셀 추가 (시트를 닫을 때 기록됨) """
+        self.ws.merged_cells.add(cell_range)
+
+
+class StreamingWorkbookWriter:
+    """ write-only 워크북 기반의 스트리밍 엑셀 작성기 """
+
+    def __init__(self):
+        self.wb = Workbook(write_only=True)
+
+    def add_sheet(self, title, column_widths=None, column_formats=None, row_heights=None, copied_formats=None):
+        """
+        시트를 추가하고 서식을 미리 선언
+        column_widths / column_formats / copied_formats: {열 번호(1부터): 값}, row_heights: {행 번호: 높이}
+        column_formats는 값 종류(날짜/숫자)에 맞는 셀에만, copied_formats는 값이 있는 모든 셀에 적용
+        """
+        ws = self.wb.create_sheet(title=title)
+
+        for col_idx, width in (column_widths or {}).items():
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        for row_idx, height in (row_heights or {}).items():
+            ws.row_dimensions[row_idx].height = height
+
+        return StreamingSheet(ws, column_formats, copied_formats)
+
+    @property
+    def sheetnames(self):
+        return self.wb.sheetnames
+
+    def save(self, target):
+        """ 파일 경로 또는 BytesIO에 저장 """
+        self.wb.save(target)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+def month_label(code):
+    """ 정수 월 코드(연도*12 + 월)를 'YYYY-MM' 문자열로 변환하는 함수 """
+    year, month = divmod(int(code) - 1, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+def build_headcount_timeline(sheet_codes, type_labels, start_code, end_code):
+    """
+    입사/퇴사 이벤트를 누적합(cumsum) 한 번으로 훑어 월별 입사자/퇴사자/재직자 수를 계산하는 함수
+    O(행 수 + 월 수 × 그룹 수) - 월마다 전체 인원을 다시 훑지 않음
+
+    sheet_codes: {시트명: (입사 월 코드, 퇴사 월 코드, 사원구분 코드)} (코드는 numpy 배열)
+    type_labels: 사원구분 코드 순서의 사원구분명 목록
+    반환값: 월, 시트명, 사원구분명, 입사자, 퇴사자, 재직자 컬럼의 DataFrame
+    """
+    month_count = end_code - start_code + 1
+    type_count = len(type_labels)
+    sheet_names = list(sheet_codes)
+
+    if month_count <= 0 or not sheet_names:
+        return pd.DataFrame(columns=["월", "시트명", "사원구분명", "입사자", "퇴사자", "재직자"])
+
+    group_count = len(sheet_names) * type_count
+    hires = np.zeros((group_count, month_count), dtype=np.int64)
+    exits = np.zeros((group_count, month_count), dtype=np.int64)
+    active_delta = np.zeros((group_count, month_count + 1), dtype=np.int64)  # 재직 시작 +1 / 종료 -1
+
+    for sheet_idx, (hire_codes, exit_codes, type_codes) in enumerate(sheet_codes.values()):
+        hire_codes = np.asarray(hire_codes, dtype=np.int64)
+        exit_codes = np.asarray(exit_codes, dtype=np.int64)
+        groups = sheet_idx * type_count + np.asarray(type_codes, dtype=np.int64)
+
+        # 📌 입사/퇴사 이벤트 (기간 안의 월만)
+        in_range = (hire_codes >= start_code) & (hire_codes <= end_code)
+        np.add.at(hires, (groups[in_range], hire_codes[in_range] - start_code), 1)
+        in_range = (exit_codes >= start_code) & (exit_codes <= end_code)
+        np.add.at(exits, (groups[in_range], exit_codes[in_range] - start_code), 1)
+
+        # 📌 재직 구간 [입사 월, 퇴사 월) 을 기간으로 잘라 시작/종료 이벤트로 기록
+        active_start = np.maximum(hire_codes, start_code) - start_code
+        active_end = np.minimum(exit_codes, end_code + 1) - start_code
+        valid = active_start < active_end
+        np.add.at(active_delta, (groups[valid], active_start[valid]), 1)
+        np.add.at(active_delta, (groups[valid], active_end[valid]), -1)
+
+    active = np.cumsum(active_delta, axis=1)[:, :month_count]
+
+    # ✅ (그룹 × 월) 배열을 월/시트/사원구분 기준 긴 형식 표로 변환
+    months = [month_label(code) for code in range(start_code, end_code + 1)]
+    timeline = pd.DataFrame({
+        "월": np.tile(months, group_count),
+        "시트명": np.repeat(sheet_names, type_count * month_count),
+        "사원구분명": np.tile(np.repeat(type_labels, month_count), len(sheet_names)),
+        "입사자": hires.ravel(),
+        "퇴사자": exits.ravel(),
+        "재직자": active.ravel(),
+    })
+
+    # 인원이 한 번도 없는 (시트, 사원구분) 그룹은 제외
+    has_people = (hires.any(axis=1) | exits.any(axis=1) | active.any(axis=1)).repeat(month_count)
+    return timeline[has_people].reset_index(drop=True)
+
+def summarize_timeline(timeline, value="재직자"):
+    """ 월별 시트 합계를 (월 × 시트) 표로 변환하는 함수 (차트 표시용) """
+    return timeline.pivot_table(index="월", columns="시트명", values=value, aggfunc="sum", sort=False).fillna(0).astype(int)
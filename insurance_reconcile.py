@@ -0,0 +1,153 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from headcount_timeline import month_label
+from insurance_validation import PREMIUM_ITEMS, RATE_MONTH_PATTERN, compute_expected_premiums, extract_premium_sheet, parse_rate_month
+
+# 대사 결과 구분 (전월 → 기준 월)
+NEW, LOST, UNEXPLAINED, WAGE_CHANGED, RATE_CHANGED, UNCHANGED = "신규 취득", "상실", "미설명 변동", "보수 변경", "요율 변경", "변동 없음"
+RECONCILE_STATUSES = [NEW, LOST, UNEXPLAINED, WAGE_CHANGED, RATE_CHANGED, UNCHANGED]
+
+# 대사 대상 금액 컬럼 (보수월액 + 보험료 항목)
+AMOUNT_COLUMNS = ["보수월액", *PREMIUM_ITEMS]
+
+# 시트명/파일명에서 적용 월 표기('YYYY-MM', 'YYYY년 MM월' 등)를 지우고 계열사명만 남기는 패턴
+_MONTH_TEXT = re.compile(RATE_MONTH_PATTERN.pattern + r"월?")
+# 파일명에서 계열사명이 아닌 공통 단어 (예: '계열사_4대보험_2025-06.xlsx')
+_FILE_WORDS = re.compile(r"4대\s*보험|보험료|공제\s*내역")
+
+def strip_month(text):
+    """ 월 표기와 앞뒤 구분 기호를 지운 문자열 (남는 것이 없으면 빈 문자열) """
+    return _MONTH_TEXT.sub("", str(text)).strip(" -_()")
+
+def affiliate_name(sheet_name, file_name=None):
+    """
+    시트명에서 월 표기를 뺀 계열사명
+    시트명이 월 표기뿐이면(예: '2025-06') 파일명에서 월 표기와 공통 단어를 뺀 이름, 그것도 없으면 None
+    """
+    name = strip_month(sheet_name)
+    if name or not file_name:
+        return name or None
+    stem = os.path.splitext(os.path.basename(str(file_name)))[0]
+    return strip_month(_FILE_WORDS.sub("", stem)) or None
+
+def premium_table(workbooks, default_month_code):
+    """
+    파일별 시트를 (계열사, 월) 컬럼을 가진 하나의 보험료 표로 합치는 함수
+    workbooks: [(파일명, {시트명: header=None으로 읽은 DataFrame})] - 파일 순서대로
+    적용 월은 시트명 → 파일명 → default_month_code 순서로 찾고, 같은 (계열사, 월)이 여러 번 나오면 나중 시트만 사용
+    계열사는 시트명 → 파일명 순서로 찾고, 둘 다 월 표기뿐이면 파일명 자체를 계열사로 사용 (다른 파일 시트와 겹쳐 제외되지 않도록)
+    반환값: (보험료 표, 중복으로 제외한 (파일명, 시트명) 목록) - 보수월액이 있는 시트가 없으면 표는 None
+    """
+    tables, owners, replaced = [], {}, []
+    for file_name, sheets in workbooks:
+        for sheet_name, raw in sheets.items():
+            table = extract_premium_sheet(raw, sheet_name)
+            if table is None:
+                continue
+            month = parse_rate_month(sheet_name) or parse_rate_month(file_name) or default_month_code
+            key = (affiliate_name(sheet_name, file_name) or os.path.splitext(os.path.basename(str(file_name)))[0], month)
+            if key in owners:
+                replaced.append(owners[key][1:])
+                tables[owners[key][0]] = None
+            owners[key] = (len(tables), file_name, sheet_name)
+            tables.append(table.assign(계열사=key[0], 월=month))
+
+    tables = [table for table in tables if table is not None]
+    return (pd.concat(tables, ignore_index=True) if tables else None), replaced
+
+def employee_keys(table):
+    """
+    (계열사, 성명, 동명이인 순번)을 해시 인덱스(pd.factorize)로 정수 코드화하는 함수
+    성명은 공백을 지워 비교하고, 같은 달 같은 계열사의 동명이인은 시트에 나온 순서로 구분
+    """
+    names = table["성명"].astype(str).str.replace(r"\s+", "", regex=True)
+    occurrence = names.groupby([table["계열사"], table["월"], names], sort=False).cumcount()
+    codes, _ = pd.MultiIndex.from_arrays([table["계열사"], names, occurrence]).factorize()
+    return codes
+
+def reconcile_premiums(workbooks, default_month_code, rate_table=None, tolerance=10):
+    """
+    월별 보험료를 사원 키로 전월과 해시 조인하여 증감을 분류하는 함수 (전체 월을 한 번의 조인으로 처리)
+    - 기준 월과 전월 시트가 모두 있는 계열사만 대사 (첫 달은 비교 대상 없음)
+    - 신규 취득 / 상실: 한쪽 달에만 있는 사원
+    - 보험료 증감이 요율표 기준 계산액 증감과 tolerance(원) 넘게 다르면 미설명 변동, 그 외 보수 변경 / 요율 변경 / 변동 없음
+    반환값: (사원별 대사 결과 DataFrame, 중복으로 제외한 (파일명, 시트명) 목록) - 대사할 달이 없으면 결과는 None
+    """
+    table, replaced = premium_table(workbooks, default_month_code)
+    if table is None:
+        return None, replaced
+
+    # ✅ 보험료 계산액(요율표 기준)을 전체 월에 대해 한 번에 계산 - 증감의 기대값으로 사용
+    expected = compute_expected_premiums(table["보수월액"].to_numpy(), table["월"].to_numpy(), rate_table)
+    columns = pd.DataFrame({
+        "키": employee_keys(table),
+        "월": table["월"].to_numpy(),
+        "계열사": table["계열사"].to_numpy(),
+        "성명": table["성명"].to_numpy(),
+        **{column: table[column].to_numpy(dtype=float) for column in AMOUNT_COLUMNS},
+        **{f"{item}_계산액": expected[item].to_numpy() for item in PREMIUM_ITEMS},
+    })
+
+    # 📌 기준 월과 전월 시트가 모두 있는 (계열사, 기준 월)
+    sheet_months = columns[["계열사", "월"]].drop_duplicates()
+    pairs = sheet_months.merge(sheet_months.assign(월=sheet_months["월"] + 1), on=["계열사", "월"])
+    if pairs.empty:
+        return None, replaced
+
+    # ✅ 전월 표의 월을 +1 하여 (사원 키, 월)로 한 번에 outer 해시 조인 (월마다 따로 조인하지 않음)
+    previous = columns.assign(월=columns["월"] + 1)
+    joined = previous.merge(columns, on=["키", "월"], how="outer", suffixes=("_전월", ""), indicator=True, sort=False)
+    joined["계열사"] = joined["계열사"].fillna(joined["계열사_전월"])
+    joined["성명"] = joined["성명"].fillna(joined["성명_전월"])
+    joined = joined.merge(pairs, on=["계열사", "월"])
+
+    only_current = (joined["_merge"] == "right_only").to_numpy()
+    only_previous = (joined["_merge"] == "left_only").to_numpy()
+    matched = ~(only_current | only_previous)
+
+    unexplained_items = pd.Series("", index=joined.index)
+    unexplained = np.zeros(len(joined), dtype=bool)
+    changed = np.zeros(len(joined), dtype=bool)
+    for item in PREMIUM_ITEMS:
+        reported_delta = joined[item].to_numpy() - joined[f"{item}_전월"].to_numpy()
+        expected_delta = joined[f"{item}_계산액"].to_numpy() - joined[f"{item}_계산액_전월"].to_numpy()
+        flag = matched & ~np.isnan(reported_delta) & (np.abs(reported_delta - expected_delta) > tolerance)
+        unexplained_items += np.where(flag, f"{item}, ", "")
+        unexplained |= flag
+        changed |= matched & (np.nan_to_num(reported_delta) != 0)
+    wage_changed = matched & (joined["보수월액"].to_numpy() != joined["보수월액_전월"].to_numpy())
+
+    status = np.select(
+        [only_current, only_previous, unexplained, wage_changed, changed],
+        [NEW, LOST, UNEXPLAINED, WAGE_CHANGED, RATE_CHANGED],
+        default=UNCHANGED,
+    )
+
+    report = pd.DataFrame({
+        "계열사": joined["계열사"].to_numpy(),
+        "기준월": joined["월"].map({code: month_label(code) for code in pairs["월"].unique()}).to_numpy(),
+        "성명": joined["성명"].to_numpy(),
+        "구분": pd.Categorical(status, categories=RECONCILE_STATUSES),
+    })
+    for column in AMOUNT_COLUMNS:
+        report[f"{column}_전월"] = joined[f"{column}_전월"].to_numpy()
+        report[column] = joined[column].to_numpy()
+        report[f"{column}_증감"] = np.nan_to_num(joined[column].to_numpy()) - np.nan_to_num(joined[f"{column}_전월"].to_numpy())
+    report["미설명항목"] = unexplained_items.str.removesuffix(", ").to_numpy()
+
+    report = report.sort_values(["계열사", "기준월", "구분"], kind="stable", ignore_index=True)
+    return report, replaced
+
+def summarize_reconciliation(report):
+    """ (계열사, 기준월)별 구분 인원과 보험료 증감 합계 """
+    counts = report.groupby(["계열사", "기준월", "구분"], sort=False, observed=False).size().unstack("구분", fill_value=0)
+    deltas = report.groupby(["계열사", "기준월"], sort=False)[[f"{item}_증감" for item in PREMIUM_ITEMS]].sum()
+    return counts.join(deltas)
+
+def changed_rows(report):
+    """ 변동 없음을 제외한 대사 결과 (리포트 시트용) """
+    return report[report["구분"] != UNCHANGED].reset_index(drop=True)
@@ -0,0 +1,181 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ✅ 4대보험 요율표 (적용 시작 월 기준, 근로자 부담분 계산용)
+# pension_rate: 국민연금 근로자 요율, pension_base_min/max: 기준소득월액 하한/상한
+# health_rate: 건강보험 전체 요율, health_premium_min/max: 월 보험료(전체) 하한/상한
+# care_rate: 장기요양보험료 = 건강보험료 × care_rate, employment_rate: 고용보험(실업급여) 근로자 요율
+# 새 요율/상·하한이 고시되면 적용 시작 월과 함께 아래에 추가
+INSURANCE_RATE_TABLE = [
+    {"version": "2023-01", "pension_rate": 0.045, "pension_base_min": 350000, "pension_base_max": 5530000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 7822560,
+     "care_rate": 0.1281, "employment_rate": 0.009},
+    {"version": "2023-07", "pension_rate": 0.045, "pension_base_min": 370000, "pension_base_max": 5900000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 7822560,
+     "care_rate": 0.1281, "employment_rate": 0.009},
+    {"version": "2024-01", "pension_rate": 0.045, "pension_base_min": 370000, "pension_base_max": 5900000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 8481420,
+     "care_rate": 0.1295, "employment_rate": 0.009},
+    {"version": "2024-07", "pension_rate": 0.045, "pension_base_min": 390000, "pension_base_max": 6170000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 8481420,
+     "care_rate": 0.1295, "employment_rate": 0.009},
+    {"version": "2025-01", "pension_rate": 0.045, "pension_base_min": 390000, "pension_base_max": 6170000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 9008340,
+     "care_rate": 0.1295, "employment_rate": 0.009},
+    {"version": "2025-07", "pension_rate": 0.045, "pension_base_min": 400000, "pension_base_max": 6370000,
+     "health_rate": 0.0709, "health_premium_min": 19780, "health_premium_max": 9008340,
+     "care_rate": 0.1295, "employment_rate": 0.009},
+    {"version": "2026-01", "pension_rate": 0.0475, "pension_base_min": 400000, "pension_base_max": 6370000,
+     "health_rate": 0.0719, "health_premium_min": 19780, "health_premium_max": 9008340,
+     "care_rate": 0.1314, "employment_rate": 0.009},
+]
+
+# 검증 항목별로 찾을 컬럼명 (앞에 있는 이름을 우선 사용, 컬럼명에 포함되면 일치)
+INSURANCE_COLUMNS = {
+    "보수월액": ["보수월액", "기준소득월액"],
+    "국민연금": ["국민연금", "연금"],
+    "건강보험": ["건강보험"],
+    "장기요양보험": ["장기요양", "요양"],
+    "고용보험": ["고용보험"],
+}
+PREMIUM_ITEMS = ["국민연금", "건강보험", "장기요양보험", "고용보험"]
+
+# 헤더 행을 찾을 때 확인할 최대 행 수
+HEADER_SEARCH_ROWS = 10
+
+# 시트명/파일명에서 적용 월을 찾는 패턴 ('YYYY-MM', 'YYYY년 MM월', 'YYYYMM')
+RATE_MONTH_PATTERN = re.compile(r"(20\d{2})\D{0,2}(\d{1,2})")
+
+def parse_rate_month(text):
+    """ 'YYYY-MM', 'YYYY년 MM월', 'YYYYMM' 형태의 문자열에서 정수 월 코드(연도*12 + 월)를 찾는 함수 (없으면 None) """
+    match = RATE_MONTH_PATTERN.search(str(text))
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        return None
+    return int(match.group(1)) * 12 + int(match.group(2))
+
+def rate_arrays(month_codes, rate_table=None):
+    """
+    월 코드 배열에 해당하는 요율표 값을 항목별 배열로 반환하는 함수 (np.searchsorted로 한 번에 조회)
+    요율표 첫 버전보다 이전 월은 첫 버전을 적용
+    """
+    rate_table = sorted(rate_table or INSURANCE_RATE_TABLE, key=lambda rate: parse_rate_month(rate["version"]))
+    versions = np.array([parse_rate_month(rate["version"]) for rate in rate_table])
+    idx = np.maximum(np.searchsorted(versions, month_codes, side="right") - 1, 0)
+
+    arrays = {"version": np.array([rate["version"] for rate in rate_table])[idx]}
+    for key in rate_table[0]:
+        if key != "version":
+            arrays[key] = np.array([rate[key] for rate in rate_table], dtype=float)[idx]
+    return arrays
+
+def floor_to(values, unit):
+    """ unit 원 미만 절사 """
+    return np.floor(values / unit) * unit
+
+def compute_expected_premiums(wages, month_codes, rate_table=None):
+    """
+    보수월액과 적용 월로 근로자 부담 4대보험료를 계산하는 함수 (행 반복 없이 배열 연산)
+    - 국민연금: 기준소득월액(천원 미만 절사, 상·하한 적용) × 요율, 10원 미만 절사
+    - 건강보험: 보수월액 × 요율(10원 미만 절사, 상·하한 적용)의 1/2, 10원 미만 절사
+    - 장기요양보험: 건강보험료(전체) × 장기요양 요율의 1/2, 10원 미만 절사
+    - 고용보험: 보수월액 × 근로자 요율, 10원 미만 절사
+    """
+    wages = np.asarray(wages, dtype=float)
+    rates = rate_arrays(month_codes, rate_table)
+
+    pension_base = np.clip(floor_to(wages, 1000), rates["pension_base_min"], rates["pension_base_max"])
+    health_total = np.clip(floor_to(wages * rates["health_rate"], 10), rates["health_premium_min"], rates["health_premium_max"])
+    care_total = floor_to(health_total * rates["care_rate"], 10)
+
+    return pd.DataFrame({
+        "요율버전": rates["version"],
+        "국민연금": floor_to(pension_base * rates["pension_rate"], 10),
+        "건강보험": floor_to(health_total / 2, 10),
+        "장기요양보험": floor_to(care_total / 2, 10),
+        "고용보험": floor_to(wages * rates["employment_rate"], 10),
+    })
+
+# 합계 행은 검증에서 제외
+TOTAL_ROW_NAMES = {"합계", "소계", "계", "총계"}
+
+def find_columns(headers):
+    """
+    검증 항목별로 사용할 열 위치를 찾는 함수 ({항목: 열 번호(0부터)}, 없는 항목은 제외)
+    같은 이름의 열이 여러 개면 (예: 근로자/사업주 부담분) 첫 번째 열을 사용
+    """
+    found = {}
+    for item, names in INSURANCE_COLUMNS.items():
+        for name in names:
+            match = next((idx for idx, header in enumerate(headers) if name in header and idx not in found.values()), None)
+            if match is not None:
+                found[item] = match
+                break
+    return found
+
+def extract_premium_sheet(raw, sheet_name):
+    """
+    header=None으로 읽은 시트에서 '보수월액' 헤더 행을 찾아 검증용 표로 변환하는 함수
+    보수월액 컬럼이 없으면 None 반환
+    """
+    header_idx = None
+    for row_idx in range(min(HEADER_SEARCH_ROWS, len(raw))):
+        if any(name in str(value) for value in raw.iloc[row_idx] for name in INSURANCE_COLUMNS["보수월액"]):
+            header_idx = row_idx
+            break
+    if header_idx is None:
+        return None
+
+    headers = ["" if pd.isna(value) else str(value).strip() for value in raw.iloc[header_idx]]
+    columns = find_columns(headers)
+    df = raw.iloc[header_idx + 1:]
+
+    table = pd.DataFrame({"시트명": sheet_name, "행": df.index + 1}, index=df.index)  # 엑셀 행 번호
+    name_idx = next((idx for idx, header in enumerate(headers) if "성명" in header or "이름" in header), None)
+    table["성명"] = df.iloc[:, name_idx] if name_idx is not None else None
+    for item in INSURANCE_COLUMNS:
+        table[item] = pd.to_numeric(df.iloc[:, columns[item]], errors="coerce") if item in columns else np.nan
+
+    is_total = table["성명"].astype(str).str.replace(" ", "").isin(TOTAL_ROW_NAMES)
+    return table[table["보수월액"].notna() & ~is_total]
+
+def validate_premiums(sheets, default_month_code, rate_table=None, tolerance=10):
+    """
+    여러 시트의 신고 보험료를 한 번에 재계산하여 비교하는 함수
+    sheets: {시트명: header=None으로 읽은 DataFrame}, 시트명에서 적용 월을 찾지 못하면 default_month_code 사용
+    tolerance: 허용 오차(원), 차이가 이보다 크면 불일치로 표시
+    반환값: 사원별 신고액/계산액/차이 및 검증결과 DataFrame (검증할 시트가 없으면 None)
+    """
+    tables = []
+    for sheet_name, raw in sheets.items():
+        table = extract_premium_sheet(raw, sheet_name)
+        if table is not None:
+            tables.append(table)
+    if not tables:
+        return None
+
+    # ✅ 전체 시트를 한 표로 합쳐서 한 번의 배열 연산으로 계산
+    report = pd.concat(tables, ignore_index=True)
+    sheet_months = {sheet_name: parse_rate_month(sheet_name) or default_month_code for sheet_name in report["시트명"].unique()}
+    month_codes = report["시트명"].map(sheet_months).to_numpy()
+    expected = compute_expected_premiums(report["보수월액"].to_numpy(), month_codes, rate_table)
+
+    report["요율버전"] = expected["요율버전"].to_numpy()
+    mismatch = np.zeros(len(report), dtype=bool)
+    for item in PREMIUM_ITEMS:
+        reported = report[item].to_numpy(dtype=float)
+        diff = reported - expected[item].to_numpy()
+        report[f"{item}_계산액"] = expected[item].to_numpy()
+        report[f"{item}_차이"] = diff
+        mismatch |= ~np.isnan(reported) & (np.abs(diff) > tolerance)
+
+    report["검증결과"] = np.where(mismatch, "불일치", "정상")
+    return report
+
+def summarize_validation(report):
+    """ 시트별 검증 인원 / 불일치 인원 요약 """
+    return report.assign(불일치=report["검증결과"].eq("불일치")).groupby("시트명", sort=False).agg(
+        검증인원=("불일치", "size"),
+        불일치인원=("불일치", "sum"),
+    )
@@ -0,0 +1,110 @@
+import io
+import os
+import atexit
+import pickle
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from background_jobs import JobCancelled, report_progress
+
+# ✅ 파싱 워커 프로세스 수 (0 또는 1이면 직렬 처리) - 환경변수로 조정 가능
+DEFAULT_INGEST_WORKERS = int(os.environ.get("EXCEL_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class IngestResult:
+    """ 파일 하나의 파싱 결과 (프로세스 간 전달 가능한 값 또는 오류 메시지) """
+
+    def __init__(self, source, value=None, error=None):
+        self.source = source
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def _to_picklable(source):
+    """
+    워커 프로세스로 넘길 입력으로 변환
+    - 파일 경로는 그대로 (디스크에 기록한 큰 업로드도 경로만 넘기고 워커가 직접 읽음)
+    - 디스크에 기록하지 않은 업로드 버퍼만 getbuffer()에서 바이트로 한 번 복사 (getvalue()로 내용을 다시 만들지 않음)
+    """
+    if isinstance(source, (str, os.PathLike, bytes)):
+        return source
+    if hasattr(source, "getbuffer"):
+        with source.getbuffer() as buffer:
+            return bytes(buffer)
+    return source
+
+def _run_parse(parse, source, args):
+    """ 워커 프로세스에서 실행되는 파싱 함수 (오류는 메시지로 반환) """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        return parse(source, *args), None
+    except Exception as e:
+        return None, str(e)
+
+def _get_pool(workers):
+    """ 재실행 간에 재사용되는 프로세스 풀 반환 (워커 수가 바뀌면 새로 생성) """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # Streamlit 스레드와 fork 충돌을 피하기 위해 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def _reset_pool():
+    """ 손상된 프로세스 풀 정리 """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+atexit.register(_reset_pool)
+
+def parse_files(sources, parse, args=(), workers=None):
+    """
+    여러 파일을 프로세스 풀에서 병렬로 파싱하고 입력 순서대로 결과를 반환하는 함수
+    parse는 모듈 최상위 함수(pickle 가능)여야 하며 parse(파일, *args) 형태로 호출됨
+    workers가 0/1이거나 파일이 하나뿐이면, 또는 풀 사용에 실패하면 직렬로 처리
+    백그라운드 작업 안에서는 파일마다 진행 상황을 보고하고, 취소되면 남은 파싱을 취소함
+    """
+    workers = DEFAULT_INGEST_WORKERS if workers is None else workers
+    sources = list(sources)
+
+    if workers > 1 and len(sources) > 1:
+        try:
+            pool = _get_pool(workers)
+            futures = [pool.submit(_run_parse, parse, _to_picklable(source), tuple(args)) for source in sources]
+            results = []
+            try:
+                for source, future in zip(sources, futures):
+                    results.append(IngestResult(source, *future.result()))
+                    report_progress(len(results), len(sources), "파일 읽기")
+            except JobCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+            return results
+        except (BrokenProcessPool, pickle.PicklingError, OSError, RuntimeError):
+            _reset_pool()  # 풀 사용 불가 시 직렬 처리로 대체
+
+    results = []
+    for source in sources:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        value, error = _run_parse(parse, source, tuple(args))
+        results.append(IngestResult(source, value, error))
+        report_progress(len(results), len(sources), "파일 읽기")
+    return results
@@ -0,0 +1,79 @@
+import logging
+import contextvars
+from contextlib import contextmanager
+
+# ✅ Streamlit 밖(CLI/배치)에서 실행될 때 메시지를 기록할 로거
+logger = logging.getLogger("excel_tools")
+
+# 백그라운드 작업에서 남긴 메시지를 모아 두는 목록 (작업이 끝난 뒤 화면에 다시 표시)
+_captured = contextvars.ContextVar("reporting_captured", default=None)
+
+@contextmanager
+def capturing():
+    """ with 블록 안에서 남긴 메시지를 화면/로그 대신 (수준, 메시지) 목록에 모음 """
+    messages = []
+    token = _captured.set(messages)
+    try:
+        yield messages
+    finally:
+        _captured.reset(token)
+
+def _capture(level, message):
+    """ 메시지를 모으는 중이면 목록에 추가하고 True 반환 (로그에도 기록) """
+    messages = _captured.get()
+    if messages is None:
+        return False
+    messages.append((level, message))
+    getattr(logger, level)(message)
+    return True
+
+def _streamlit():
+    """ Streamlit 스크립트 실행 중이면 streamlit 모듈을, 아니면 None을 반환하는 함수 """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+
+    import streamlit as st
+    return st
+
+def error(message):
+    """ 오류 메시지 표시 (Streamlit 화면 또는 로그) """
+    if _capture("error", message):
+        return
+    st = _streamlit()
+    if st:
+        st.error(message)
+    else:
+        logger.error(message)
+
+def warning(message):
+    """ 경고 메시지 표시 (Streamlit 화면 또는 로그) """
+    if _capture("warning", message):
+        return
+    st = _streamlit()
+    if st:
+        st.warning(message)
+    else:
+        logger.warning(message)
+
+def info(message):
+    """ 안내 메시지 표시 (Streamlit 화면 또는 로그) """
+    if _capture("info", message):
+        return
+    st = _streamlit()
+    if st:
+        st.info(message)
+    else:
+        logger.info(message)
+
+def replay(messages):
+    """ capturing으로 모은 메시지를 다시 표시 (모으는 중이면 로그에 다시 기록하지 않고 목록에만 추가) """
+    captured = _captured.get()
+    if captured is not None:
+        captured.extend(messages)
+        return
+    for level, message in messages:
+        {"error": error, "warning": warning, "info": info}[level](message)
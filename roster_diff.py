@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 사원을 식별하는 기본 키 컬럼 (시트에 있는 컬럼만 사용)
+DEFAULT_DIFF_KEY_COLUMNS = ["성명", "입사일", "부서명"]
+
+# 변경 여부 비교에서 제외할 컬럼 (행 순서에 따라 바뀌는 번호 등)
+DIFF_IGNORE_COLUMNS = {"No"}
+
+# 값은 같지만 월/사원구분 코드가 달라진 경우의 변경항목 표시 (예: Remark 기준 퇴사 월 재계산)
+CODE_LABELS = {"hire": "입사월", "exit": "퇴사월", "type": "사원구분"}
+
+# 키 값 구분자 (셀 값에 나오지 않는 제어 문자)
+KEY_SEPARATOR = "\x1f"
+OCCURRENCE_SEPARATOR = "\x1e"
+
+def normalize_column(series):
+    """
+    컬럼 전체를 비교용 문자열 배열로 변환 (행 반복 없이 컬럼 단위 변환)
+    날짜는 'YYYY-MM-DD', 정수 값인 숫자는 소수점 없이 (스냅샷의 float 저장과 업로드의 int 구분 없음), 결측은 빈 문자열
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y-%m-%d").fillna("").to_numpy(dtype=object)
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(values)
+        integral = ~missing & (values == np.floor(values))
+        text = values.astype(str).astype(object)
+        text[integral] = values[integral].astype(np.int64).astype(str)
+        text[missing] = ""
+        return text
+
+    # 문자열/혼합 컬럼: datetime 객체와 스냅샷에 문자열로 저장된 날짜 모두 'YYYY-MM-DD 00:00:00' -> 'YYYY-MM-DD'
+    text = series.astype(str).str.strip().str.removesuffix(" 00:00:00").to_numpy(dtype=object)
+    text[series.isna().to_numpy()] = ""
+    return text
+
+def values_differ(previous, current):
+    """
+    같은 위치의 두 컬럼 값이 다른지 비교 (둘 다 날짜 또는 둘 다 숫자면 변환 없이 배열 비교, 그 외에는 문자열로 정규화하여 비교)
+    둘 다 결측이면 같은 값으로 봄
+    """
+    for is_kind in (pd.api.types.is_datetime64_any_dtype, pd.api.types.is_numeric_dtype):
+        if is_kind(previous) and is_kind(current) and not pd.api.types.is_bool_dtype(previous):
+            both_missing = previous.isna().to_numpy() & current.isna().to_numpy()
+            return (previous.to_numpy() != current.to_numpy()) & ~both_missing
+    return normalize_column(previous) != normalize_column(current)
+
+def build_key_index(df, key_columns):
+    """
+    키 컬럼 값을 이어 붙인 해시 인덱스 생성 (같은 키가 여러 번 나오면 등장 순서 번호를 붙여 구분)
+    반환값: pandas.Index (위치 = df의 행 위치)
+    """
+    keys = pd.Series(normalize_column(df[key_columns[0]]), dtype=object)
+    for column in key_columns[1:]:
+        keys = keys + KEY_SEPARATOR + normalize_column(df[column])
+    occurrence = keys.groupby(keys, sort=False).cumcount().astype(str)
+    return pd.Index(keys + OCCURRENCE_SEPARATOR + occurrence)
+
+
+class RosterDiff:
+    """
+    전월/당월 명부의 키 기준 비교 결과 (행 위치는 각 DataFrame의 iloc 기준)
+    added: 당월에만 있는 행, removed: 전월에만 있는 행, changed: 키는 같지만 값(또는 월 코드)이 바뀐 행
+    """
+
+    def __init__(self, sheet_name, key_columns, previous, current, added, removed, changed_previous, changed_current, changed_columns):
+        self.sheet_name = sheet_name
+        self.key_columns = key_columns
+        self.previous = previous
+        self.current = current
+        self.added = added
+        self.removed = removed
+        self.changed_previous = changed_previous
+        self.changed_current = changed_current
+        self.changed_columns = changed_columns  # 변경된 행마다 바뀐 컬럼명 목록
+
+    @property
+    def unchanged(self):
+        return len(self.current) - len(self.added) - len(self.changed_current)
+
+    @property
+    def is_empty(self):
+        return not (len(self.added) or len(self.removed) or len(self.changed_current))
+
+    def summary(self):
+        return {"추가": len(self.added), "삭제": len(self.removed), "변경": len(self.changed_current), "동일": self.unchanged}
+
+    def to_frame(self):
+        """ 변경 내역 표 (시트명, 구분, 키 컬럼, 변경항목) """
+        parts = []
+        for label, df, rows, changes in [
+            ("추가", self.current, self.added, None),
+            ("삭제", self.previous, self.removed, None),
+            ("변경", self.current, self.changed_current, self.changed_columns),
+        ]:
+            if not len(rows):
+                continue
+            part = df.iloc[rows][self.key_columns].reset_index(drop=True)
+            part.insert(0, "구분", label)
+            part.insert(0, "시트명", self.sheet_name)
+            part["변경항목"] = [", ".join(columns) for columns in changes] if changes is not None else ""
+            parts.append(part)
+        if not parts:
+            return pd.DataFrame(columns=["시트명", "구분", *self.key_columns, "변경항목"])
+        return pd.concat(parts, ignore_index=True)
+
+
+def diff_roster(previous, current, key_columns=None, previous_codes=None, current_codes=None, sheet_name=""):
+    """
+    전월 명부와 당월 명부를 키 해시 인덱스로 한 번에 대조하는 함수 (O(행 수))
+    key_columns: 사원 식별 키 (양쪽에 모두 있는 컬럼만 사용, 하나도 없으면 ValueError)
+    previous_codes / current_codes: {"hire", "exit", "type"} 월/사원구분 코드 - 주어지면 코드가 다른 행도 변경으로 처리
+    """
+    key_columns = [column for column in (key_columns or DEFAULT_DIFF_KEY_COLUMNS) if column in previous.columns and column in current.columns]
+    if not key_columns:
+        raise ValueError(f"시트 `{sheet_name}` 에 비교할 키 컬럼이 없습니다.")
+
+    previous_index = build_key_index(previous, key_columns)
+    current_index = build_key_index(current, key_columns)
+
+    # ✅ 당월 키를 전월 해시 인덱스에서 한 번에 조회 (-1 = 전월에 없음)
+    matched_previous = previous_index.get_indexer(current_index)
+    is_matched = matched_previous >= 0
+    added = np.flatnonzero(~is_matched)
+    matched_current = np.flatnonzero(is_matched)
+    matched_previous = matched_previous[is_matched]
+
+    previous_seen = np.zeros(len(previous), dtype=bool)
+    previous_seen[matched_previous] = True
+    removed = np.flatnonzero(~previous_seen)
+
+    # ✅ 키 외 공통 컬럼 값 비교 (컬럼별 배열 비교)
+    compare_columns = [
+        column for column in current.columns
+        if column in previous.columns and column not in key_columns and column not in DIFF_IGNORE_COLUMNS
+    ]
+    differs = np.zeros((len(compare_columns), len(matched_current)), dtype=bool)
+    for col_idx, column in enumerate(compare_columns):
+        differs[col_idx] = values_differ(previous[column].iloc[matched_previous], current[column].iloc[matched_current])
+
+    code_differs = np.zeros((0, len(matched_current)), dtype=bool)
+    if previous_codes is not None and current_codes is not None:
+        code_differs = np.stack([
+            np.asarray(previous_codes[name])[matched_previous] != np.asarray(current_codes[name])[matched_current]
+            for name in CODE_LABELS
+        ])
+    changed = differs.any(axis=0) | code_differs.any(axis=0)
+
+    # 변경항목: 값이 바뀐 컬럼 (값은 같고 코드만 바뀐 행은 코드 이름)
+    changed_rows = np.flatnonzero(changed)
+    code_names = list(CODE_LABELS.values())
+    changed_columns = [
+        [compare_columns[col_idx] for col_idx in np.flatnonzero(differs[:, row])]
+        or [code_names[code_idx] for code_idx in np.flatnonzero(code_differs[:, row])]
+        for row in changed_rows
+    ]
+
+    return RosterDiff(
+        sheet_name, key_columns, previous, current,
+        added, removed, matched_previous[changed_rows], matched_current[changed_rows], changed_columns,
+    )
@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+
+import stage_metrics
+
+# ✅ 파싱한 명부 DataFrame을 작은 형식으로 변환할지 여부 (0이면 파싱한 그대로 사용) - 환경변수로 조정 가능
+COMPACT_FRAMES = os.environ.get("EXCEL_COMPACT_FRAMES", "1") != "0"
+
+# 스키마에 없는 문자열 컬럼은 (고유값 수 / 행 수)가 이 값 이하일 때만 categorical로 변환
+CATEGORY_MAX_RATIO = 0.5
+
+# ✅ 명부 컬럼별 형식
+# category: 반복되는 문자열 (정수 코드 + 카테고리 목록), date: datetime64, text: 변환하지 않는 고유 문자열
+# 스키마에 없는 컬럼은 값으로 추론 (반복 문자열 → category, 날짜 → datetime64, 정수 → 가장 작은 정수형, 참/거짓 → bool)
+ROSTER_SCHEMA = {
+    "시트명": "category",
+    "사원구분명": "category",
+    "Contract Type": "category",
+    "부서명": "category",
+    "직급명": "category",
+    "입사일": "date",
+    "Starting Date": "date",
+    "퇴사일": "date",
+    "성명": "text",
+    "English Name": "text",
+    "주민번호": "text",
+}
+
+def frame_bytes(frames):
+    """ DataFrame 목록이 차지하는 메모리 (문자열 값 포함, 바이트) """
+    return sum(int(df.memory_usage(deep=True).sum()) for df in frames if df is not None)
+
+def compact_column(series, kind=None):
+    """
+    컬럼 하나를 값 손실 없이 작은 형식으로 변환하는 함수 (값이 섞여 있어 변환할 수 없으면 그대로 반환)
+    kind: ROSTER_SCHEMA의 형식 (None이면 값으로 추론)
+    """
+    if kind == "text" or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        return series
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    complete = not series.isna().any()
+
+    if inferred == "string":
+        if kind == "category" or series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+            return series.astype("category")
+    elif inferred in ("datetime", "datetime64") and kind in (None, "date"):
+        return pd.to_datetime(series)
+    elif inferred == "integer" and complete:
+        return pd.to_numeric(series, downcast="integer")
+    elif inferred == "boolean" and complete:
+        return series.astype(bool)
+    return series
+
+def compact_frame(df, schema=ROSTER_SCHEMA):
+    """ 스키마에 따라 모든 컬럼을 작은 형식으로 변환한 DataFrame 반환 (COMPACT_FRAMES가 꺼져 있으면 그대로) """
+    if df is None or not COMPACT_FRAMES:
+        return df
+    columns = {column: compact_column(df[column], schema.get(column)) for column in df.columns if df[column].ndim == 1}
+    if len(columns) != len(df.columns):
+        return df  # 중복 컬럼명은 변환하지 않음
+    return pd.DataFrame(columns, index=df.index) if columns else df
+
+def compact_sheets(sheets, record):
+    """ {시트명: DataFrame}의 모든 시트를 압축하고, 기록 중이면 단계(record)에 변환 전/후 크기를 더함 """
+    measure = stage_metrics.is_recording()
+    before = frame_bytes(sheets.values()) if measure else 0
+    sheets = {sheet_name: compact_frame(df) for sheet_name, df in sheets.items()}
+    if measure:
+        record.data_size(before, frame_bytes(sheets.values()))
+    return sheets
+
+def add_categories(series, values):
+    """ categorical 컬럼에 새 값을 대입할 수 있도록 카테고리를 추가 (categorical이 아니면 그대로) """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    missing = [value for value in values if value not in series.cat.categories]
+    return series.cat.add_categories(missing) if missing else series
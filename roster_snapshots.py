@@ -0,0 +1,174 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ✅ 스냅샷 저장 위치 - 환경변수로 조정 가능
+SNAPSHOT_ROOT = os.environ.get("ROSTER_SNAPSHOT_DIR", os.path.join(os.path.expanduser("~"), ".excel_tools", "roster_snapshots"))
+SNAPSHOT_FORMAT_VERSION = 1
+
+def safe_name(name):
+    """ 계열사명을 폴더명으로 사용할 수 있도록 변환 (경로 구분자 등 제거) """
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", str(name)).strip("._") or "_"
+
+def snapshot_key(name):
+    """ 스냅샷 폴더명 (변환한 계열사명 + 원래 이름의 짧은 해시 - 변환 후 같아지는 계열사명끼리 겹치지 않도록) """
+    return f"{safe_name(name)}-{hashlib.sha1(str(name).encode('utf-8')).hexdigest()[:8]}"
+
+def encode_column(series):
+    """
+    컬럼을 .npy로 저장할 수 있는 배열로 변환하는 함수 (pickle 없이 저장)
+    반환값: (종류, 배열, 카테고리 목록)
+    - "array": 숫자/날짜/불리언 배열을 그대로 저장
+    - "category": 문자열 등은 정수 코드 + 카테고리 목록으로 저장 (결측은 -1)
+    """
+    if (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_dtype(series)) and not isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        return "array", series.to_numpy(), None
+    if isinstance(series.dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(series.cat.categories):
+        return "category", series.cat.codes.to_numpy(dtype=np.int32), [str(category) for category in series.cat.categories]  # 이미 압축된 컬럼은 코드 그대로
+
+    values = series.dropna()
+    if len(values) and values.map(lambda value: isinstance(value, (datetime, pd.Timestamp))).all():
+        return "array", pd.to_datetime(series).to_numpy(), None
+    if len(values) and values.map(lambda value: isinstance(value, (int, float, np.number)) and not isinstance(value, bool)).all():
+        return "array", pd.to_numeric(series).to_numpy(dtype=float), None
+
+    codes, categories = pd.factorize(series.map(lambda value: value if pd.isna(value) else str(value)), use_na_sentinel=True)
+    return "category", codes.astype(np.int32), [str(category) for category in categories]
+
+def decode_column(kind, array, categories):
+    """
+    encode_column으로 저장한 배열을 컬럼 값으로 복원 (숫자/날짜 배열은 복사하지 않음)
+    문자열 컬럼은 저장된 코드 + 카테고리 목록 그대로 categorical로 복원 (문자열 객체를 만들지 않아 여러 달을 읽어도 메모리가 작음)
+    """
+    if kind == "array":
+        return array
+    if len(set(categories)) == len(categories):
+        return pd.Categorical.from_codes(array, categories=categories)  # 코드 -1 -> 결측
+    lookup = np.array(list(categories) + [None], dtype=object)  # 문자열로 바꾸면서 겹친 값이 있으면 object로 복원
+    return pd.Series(lookup[array], dtype=object, copy=False)
+
+
+class RosterSnapshotStore:
+    """
+    정리된 인원 명부를 (계열사, 월) 단위로 저장하는 컬럼형 스냅샷 저장소
+    스냅샷 하나 = 폴더 하나 (meta.json + 컬럼별 .npy + 월 코드 .npy), 읽을 때는 메모리 맵으로 열어 파싱 없이 사용
+    """
+
+    def __init__(self, root=SNAPSHOT_ROOT):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, affiliate, month):
+        return os.path.join(self.root, str(month), snapshot_key(affiliate))
+
+    def _legacy_path(self, affiliate, month):
+        """ 해시 없이 저장된 이전 형식의 폴더 (meta.json의 계열사명이 같을 때만, 없으면 None) """
+        path = os.path.join(self.root, str(month), safe_name(affiliate))
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            return path if json.load(f)["affiliate"] == str(affiliate) else None
+
+    def save(self, affiliate, month, df, codes=None):
+        """
+        명부 DataFrame을 스냅샷으로 저장 (같은 계열사/월 스냅샷은 덮어씀)
+        codes: {"hire": 입사 월 코드, "exit": 퇴사 월 코드, "type": 사원구분 코드} 등 함께 저장할 배열
+        """
+        month_dir = os.path.join(self.root, str(month))
+        os.makedirs(month_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix=".tmp_", dir=month_dir)  # 다 쓴 뒤 한 번에 교체
+
+        columns = []
+        for col_idx, (name, series) in enumerate(df.items()):
+            kind, array, categories = encode_column(series)
+            file_name = f"col_{col_idx}.npy"
+            np.save(os.path.join(work_dir, file_name), array, allow_pickle=False)
+            columns.append({"name": name if isinstance(name, str) else str(name), "kind": kind, "file": file_name, "categories": categories})
+
+        for code_name, array in (codes or {}).items():
+            np.save(os.path.join(work_dir, f"code_{code_name}.npy"), np.asarray(array), allow_pickle=False)
+
+        meta = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "affiliate": str(affiliate),
+            "month": str(month),
+            "rows": len(df),
+            "columns": columns,
+            "codes": list(codes or {}),
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(os.path.join(work_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        target = self._path(affiliate, month)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(work_dir, target)
+
+        legacy = self._legacy_path(affiliate, month)  # 이전 형식 폴더는 새 스냅샷으로 대체
+        if legacy is not None:
+            shutil.rmtree(legacy)
+        return target
+
+    def load(self, affiliate, month, mmap=True, columns=None):
+        """
+        스냅샷을 읽어 (DataFrame, {코드명: 배열}) 반환 (없으면 None)
+        mmap=True면 .npy를 메모리 맵으로 열어 필요한 부분만 디스크에서 읽음
+        columns: 읽을 컬럼명 목록 (None이면 전체, 빈 목록이면 코드만)
+        """
+        path = self._path(affiliate, month)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            path = self._legacy_path(affiliate, month)
+            if path is None:
+                return None
+        meta_path = os.path.join(path, "meta.json")
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+
+        data = {}
+        for column in meta["columns"]:
+            if columns is not None and column["name"] not in columns:
+                continue
+            array = np.load(os.path.join(path, column["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+            data[column["name"]] = decode_column(column["kind"], array, column["categories"])
+        df = pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]), copy=False)
+
+        codes = {
+            code_name: np.load(os.path.join(path, f"code_{code_name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+            for code_name in meta["codes"]
+        }
+        return df, codes
+
+    def affiliates(self, month):
+        """ 해당 월에 저장된 계열사 목록 """
+        month_dir = os.path.join(self.root, str(month))
+        if not os.path.isdir(month_dir):
+            return []
+
+        names = []
+        for entry in sorted(os.listdir(month_dir)):
+            if entry.startswith(".tmp_"):
+                continue  # 저장 중 중단된 스냅샷
+            meta_path = os.path.join(month_dir, entry, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding="utf-8") as f:
+                    names.append(json.load(f)["affiliate"])
+        return names
+
+    def months(self):
+        """ 스냅샷이 저장된 월 목록 (오름차순) """
+        return sorted(entry for entry in os.listdir(self.root) if self.affiliates(entry))
+
+    def load_month(self, month, mmap=True, columns=None):
+        """ 해당 월의 모든 계열사 스냅샷을 {계열사: (DataFrame, 코드)}로 반환 """
+        return {affiliate: self.load(affiliate, month, mmap, columns) for affiliate in self.affiliates(month)}
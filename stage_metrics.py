@@ -0,0 +1,264 @@
+import os
+import sys
+import json
+import time
+import logging
+import weakref
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+# ✅ 단계별 측정 결과를 한 줄(JSON)씩 쌓는 로그 파일 - 환경변수로 조정 가능 (기본은 파일 기록 안 함, 예: ~/.excel_tools/stage_metrics.jsonl)
+STAGE_LOG_PATH = os.path.expanduser(os.environ.get("EXCEL_STAGE_LOG", ""))
+
+# 사이드바 측정 패널 표시 여부 (세션 상태 키 - 백그라운드 작업 결과를 표시할 때도 사용)
+METRICS_PANEL_KEY = "stage_metrics_panel"
+
+# ✅ 단계별 최대 메모리를 측정할 때 RSS를 읽는 주기(초) - 환경변수로 조정 가능
+MEMORY_SAMPLE_SECONDS = float(os.environ.get("EXCEL_MEMORY_SAMPLE_SECONDS", "0.05"))
+
+logger = logging.getLogger("excel_tools.metrics")
+
+
+class PeakMemory:
+    """
+    최대 메모리(RSS) 측정기 - reset 이후 샘플링한 RSS의 최댓값 (측정기마다 따로 기록하므로 다른 세션/작업의 측정을 초기화하지 않음)
+    RSS는 프로세스 전체 값이므로 같은 프로세스에서 동시에 실행 중인 세션/백그라운드 작업의 메모리도 포함됨
+    /proc/self/statm을 읽을 수 없으면 프로세스 전체 최댓값(ru_maxrss, 초기화 불가)을 사용 (method로 구분)
+    """
+
+    def __init__(self):
+        self.method = "rss_sampled" if _current_rss() is not None else "ru_maxrss"
+        self._peak = 0
+
+    def reset(self):
+        """ 지금부터 최댓값을 다시 측정 (샘플링 스레드에 등록) """
+        if self.method == "rss_sampled":
+            self._peak = _current_rss()
+            _sampler.watch(self)
+
+    def sample(self, rss):
+        self._peak = max(self._peak, rss)
+
+    def peak_bytes(self):
+        if self.method == "rss_sampled":
+            self.sample(_current_rss())
+            return self._peak
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # macOS는 바이트, Linux는 KB
+
+
+def _current_rss():
+    """ 현재 프로세스의 RSS(바이트) (/proc이 없으면 None) """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class _RssSampler:
+    """ 등록된 측정기들에 주기적으로 현재 RSS를 전달하는 데몬 스레드 (프로세스에 하나, 처음 사용할 때 시작) """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.meters = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def watch(self, meter):
+        with self._lock:
+            self.meters.add(meter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="excel-rss-sampler", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            rss = _current_rss()
+            with self._lock:
+                meters = list(self.meters)
+            for meter in meters:
+                meter.sample(rss)
+
+_sampler = _RssSampler(MEMORY_SAMPLE_SECONDS)
+
+
+class StageRecord:
+    """ 한 단계의 측정 결과 (경과 시간, CPU 시간, 최대 메모리, 처리 행/셀 수, 변환 전/후 데이터 크기) """
+
+    def __init__(self, name, depth=0):
+        self.name = name
+        self.depth = depth  # 바깥 단계 수 (0이면 최상위 단계)
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = 0
+        self.rows = 0
+        self.cells = 0
+        self.data_bytes_before = 0
+        self.data_bytes_after = 0
+
+    def count(self, rows=0, cells=0):
+        """ 처리한 행/셀 수를 더함 """
+        self.rows += int(rows)
+        self.cells += int(cells)
+
+    def data_size(self, before=0, after=0):
+        """ 단계에서 변환한 DataFrame의 변환 전/후 크기(바이트)를 더함 """
+        self.data_bytes_before += int(before)
+        self.data_bytes_after += int(after)
+
+    def to_dict(self):
+        return {
+            "stage": self.name,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "peak_mb": round(self.peak_bytes / 1024 / 1024, 1),
+            "rows": self.rows,
+            "cells": self.cells,
+            "data_mb_before": round(self.data_bytes_before / 1024 / 1024, 2),
+            "data_mb_after": round(self.data_bytes_after / 1024 / 1024, 2),
+        }
+
+
+class StageRecorder:
+    """
+    한 번의 실행(기능 1회 실행)에서 단계별 측정 결과를 모으는 기록기
+    단계 안에서 다른 단계가 시작되면 바깥 단계의 최대 메모리에 안쪽 단계의 최댓값을 반영
+    CPU 시간은 현재 프로세스 기준 (프로세스 풀 워커의 CPU 시간은 포함되지 않음)
+    """
+
+    def __init__(self, feature, memory=None):
+        self.feature = feature
+        self.memory = memory or PeakMemory()
+        self.started_at = datetime.now()
+        self.records = []
+        self._open = []  # 진행 중인 단계 (바깥 → 안쪽)
+
+    def _update_peaks(self):
+        peak = self.memory.peak_bytes()
+        for record in self._open:
+            record.peak_bytes = max(record.peak_bytes, peak)
+
+    @contextmanager
+    def stage(self, name):
+        """ with 블록을 한 단계로 측정 """
+        record = StageRecord(name, len(self._open))
+        self._update_peaks()  # 바깥 단계의 최댓값을 보존한 뒤 초기화
+        self._open.append(record)
+        self.memory.reset()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.process_time() - cpu_start
+            self._update_peaks()
+            self._open.remove(record)
+            self.records.append(record)
+
+    def top_stages(self):
+        """ 최상위 단계의 측정 결과 목록 (안쪽 단계는 바깥 단계 시간에 포함되어 있음) """
+        return [record for record in self.records if record.depth == 0]
+
+    def to_dict(self):
+        return {
+            "feature": self.feature,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "memory_method": self.memory.method,
+            "stages": [record.to_dict() for record in self.records],
+        }
+
+    def to_frame(self):
+        """ 측정 결과를 표로 반환 (사이드바 표시용) """
+        import pandas as pd  # 메인 화면 시작 시 pandas를 불러오지 않도록 표시할 때만 import
+
+        return pd.DataFrame([record.to_dict() for record in self.records], columns=["stage", "wall_seconds", "cpu_seconds", "peak_mb", "rows", "cells", "data_mb_before", "data_mb_after"])
+
+    def write_log(self, path=STAGE_LOG_PATH):
+        """ 측정 결과를 로거와 JSON Lines 파일에 기록 (추이 분석용) """
+        entry = json.dumps(self.to_dict(), ensure_ascii=False)
+        logger.info(entry)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(entry + "\n")
+        except OSError as e:
+            logger.warning(f"단계별 측정 로그를 기록하지 못했습니다: {e}")
+
+
+# 현재 실행 중인 기록기 (Streamlit은 세션마다 별도 스레드에서 실행되므로 세션끼리 섞이지 않음)
+_current_recorder = contextvars.ContextVar("stage_recorder", default=None)
+
+class _NoStage:
+    """ 기록 중이 아닐 때 사용하는 빈 단계 (측정 비용 없음) """
+
+    def count(self, rows=0, cells=0):
+        pass
+
+    def data_size(self, before=0, after=0):
+        pass
+
+_NO_STAGE = _NoStage()
+
+@contextmanager
+def recording(feature, log_path=STAGE_LOG_PATH):
+    """
+    with 블록 안에서 실행되는 단계(stage)를 측정하고, 끝나면 측정된 단계가 있을 때만 로그에 기록
+    반환값: StageRecorder
+    """
+    recorder = StageRecorder(feature)
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+        if recorder.records:
+            recorder.write_log(log_path)
+
+@contextmanager
+def stage(name):
+    """ 현재 기록기에 단계를 추가 (recording 밖에서는 아무것도 측정하지 않음) """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield _NO_STAGE
+        return
+    with recorder.stage(name) as record:
+        yield record
+
+def is_recording():
+    """ 현재 기록 중인지 여부 (측정에만 필요한 계산을 건너뛸 때 사용) """
+    return _current_recorder.get() is not None
+
+def count_frame_cells(frames):
+    """ DataFrame 목록의 (행 수, 셀 수) """
+    frames = [df for df in frames if df is not None]
+    return sum(len(df) for df in frames), sum(df.size for df in frames)
+
+def get_metrics_panel_setting():
+    """ Streamlit 사이드바에서 단계별 측정 패널 표시 여부를 선택 """
+    return st.sidebar.checkbox("⏱️ 단계별 처리 시간/메모리 보기", value=False, key=METRICS_PANEL_KEY)
+
+def show_stage_metrics(recorder, title="⏱️ 단계별 처리 현황"):
+    """ Streamlit 사이드바에 단계별 측정 결과를 표시하는 함수 """
+    if not recorder.records:
+        return
+    st.sidebar.subheader(title)
+    st.sidebar.dataframe(
+        recorder.to_frame().rename(columns={
+            "stage": "단계", "wall_seconds": "경과(초)", "cpu_seconds": "CPU(초)",
+            "peak_mb": "최대 메모리(MB)", "rows": "행", "cells": "셀",
+            "data_mb_before": "데이터 변환 전(MB)", "data_mb_after": "데이터 변환 후(MB)",
+        }),
+        hide_index=True,
+    )
+    st.sidebar.caption(f"📝 측정 로그: {STAGE_LOG_PATH or '기록 안 함'} (메모리 측정 방식: {recorder.memory.method})")
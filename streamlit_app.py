@@ -1,30 +1,49 @@
 import sys
-import requests
+import importlib
 import streamlit as st
-from streamlit_app_HR import run_excel_analysis
-from streamlit_app_insurance import run_insurance_analysis
-from streamlit_app_merge import run_excel_merge
+from stage_metrics import recording, stage, get_metrics_panel_setting, show_stage_metrics
+
+# ✅ 기능 목록 (메뉴명 -> (모듈명, 실행 함수명))
+# 선택한 기능의 모듈만 import하므로 기능이 늘어나도 다른 기능의 시작 시간에는 영향이 없음
+# 새 기능은 여기에 한 줄 추가 (모듈은 import 시점에 계산/화면 출력을 하지 않아야 함)
+FEATURES = {
+    "단순엑셀병합": ("streamlit_app_merge", "run_excel_merge"),
+    "엑셀 병합 및 인원 분석": ("streamlit_app_HR", "run_excel_analysis"),
+    "4대보험료 검증 시스템": ("streamlit_app_insurance", "run_insurance_analysis"),
+}
 
 # ✅ 기능 선택 UI
 def select_feature():
     """ Streamlit UI에서 사용자가 사용할 기능을 선택하는 함수 """
     return st.sidebar.selectbox(
         "📌 사용할 기능을 선택하세요",
-        ["단순엑셀병합", "엑셀 병합 및 인원 분석", "4대보험료 검증 시스템", "급여 업무 시스템", "채용 분석 시스템"]
+        list(FEATURES)
     )
 
+def load_feature(feature_option):
+    """ 선택한 기능의 모듈을 그때 import하여 실행 함수를 반환 (한 번 import한 모듈은 재실행 시 재사용) """
+    module_name, func_name = FEATURES[feature_option]
+    if module_name in sys.modules:
+        return getattr(sys.modules[module_name], func_name)
+
+    with stage("기능 모듈 로드"):  # 처음 선택했을 때만 import 비용 측정
+        module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
 # ✅ 기능 실행
 def main():
     st.title("📊 엑셀 분석 시스템")
 
     feature_option = select_feature()
+    show_metrics = get_metrics_panel_setting()
+
+    # ✅ 단계별 처리 시간/메모리 측정 (측정 결과는 로그 파일에도 기록)
+    with recording(feature_option) as recorder:
+        run_feature = load_feature(feature_option)
+        run_feature()  # ✅ 선택한 기능 실행
 
-    if feature_option == "단순엑셀병합":
-        run_excel_merge()  # ✅ 단순 엑셀 병합 실행~
-    if feature_option == "엑셀 병합 및 인원 분석":
-        run_excel_analysis()  # ✅ 엑셀 병합 및 인원 분석 실행
-    if feature_option == "4대보험료 검증 시스템":
-        run_insurance_analysis()  # ✅ 엑셀 병합 및 인원 분석 실행
+    if show_metrics:
+        show_stage_metrics(recorder)
 
 if __name__ == "__main__":
     main()
@@ -1,34 +1,24 @@
+import io
 import os
+from itertools import chain, islice
+import numpy as np
 import pandas as pd
 import streamlit as st
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import NamedStyle, Font, Border, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
 from datetime import datetime, timedelta
-import tempfile
-import shutil
-import time
-
-def apply_excel_date_format(file_path, date_columns):
-    """ 엑셀 파일의 날짜 컬럼을 'YYYY-MM-DD' 형식으로 변경하는 함수 """
-    wb = load_workbook(file_path)  # 엑셀 파일 로드
-    for sheet in wb.sheetnames:  # 모든 시트에 대해 적용
-        ws = wb[sheet]
-        
-        # 날짜 서식 스타일 생성 (YYYY-MM-DD)
-        date_style = NamedStyle(name="datetime", number_format="YYYY-MM-DD")
-        if "datetime" not in wb.named_styles:
-            wb.add_named_style(date_style)
-
-        # 날짜 컬럼 찾아서 스타일 적용
-        for col_idx, col in enumerate(ws.iter_cols(), start=1):
-            col_letter = get_column_letter(col_idx)
-            if ws[col_letter + "1"].value in date_columns:  # 첫 번째 행이 컬럼명
-                for cell in col[1:]:  # 첫 번째 행 제외하고 적용
-                    if isinstance(cell.value, datetime):
-                        cell.style = date_style
-    
-    wb.save(file_path)  # 적용된 파일 저장
+from excel_stream_writer import StreamingWorkbookWriter, unique_sheet_name
+from headcount_timeline import build_headcount_timeline, summarize_timeline, month_label
+from parallel_ingest import parse_files
+from excel_cache import get_workbook_cache, settings_key, show_cache_stats
+from temp_files import get_temp_manager, show_temp_usage
+from upload_ingest import ingest_uploads, upload_key, source_name, source_data, source_digest
+from background_jobs import report_progress, submit_session_job, wait_for_job
+from roster_snapshots import RosterSnapshotStore
+from roster_diff import DEFAULT_DIFF_KEY_COLUMNS, diff_roster
+from roster_schema import compact_frame, compact_sheets, add_categories, frame_bytes
+from transfer_index import DEFAULT_IDENTITY_COLUMNS, TRANSFER_MAX_GAP_DAYS, find_transfers, has_discriminating_column
+from xlsx_reader import open_workbook
+import reporting
+import stage_metrics
 
 def get_date_info():
     """현재 날짜를 기준으로 전월, 당월, 전월의 마지막 날을 계산하는 함수"""
@@ -39,9 +29,6 @@ def get_date_info():
     
     return current_month, previous_month, previous_month_last_day
 
-# 날짜 정보 가져오기
-current_month, previous_month, previous_month_last_day = get_date_info()
-
 def get_analysis_settings():
     """ 분석에 필요한 날짜 컬럼과 사원 구분 리스트 반환 """
     date_columns = ["입사일", "퇴사일"]
@@ -49,9 +36,6 @@ def get_analysis_settings():
     
     return date_columns, employee_types
 
-# 분석 대상 컬럼 및 사원 구분 정보 가져오기
-date_columns, employee_types = get_analysis_settings()
-
 # ✅ 기본 시트 정렬 순서
 DEFAULT_SHEET_ORDER = [
     "도이치아우토", "브리티시오토", "바이에른오토", "이탈리아오토모빌리",
@@ -114,83 +98,230 @@ def get_include_columns():
     
     return include_columns
 
+def get_timeline_settings():
+    """ Streamlit UI에서 월별 인원 추이 분석 기간(개월 수)을 입력받는 함수 (사용하지 않으면 None) """
+    st.sidebar.subheader("📈 월별 인원 추이 설정")
+
+    if not st.sidebar.checkbox("월별 인원 추이 분석", value=False):
+        return None
+    return st.sidebar.number_input("📌 기준 월까지 분석할 개월 수", min_value=1, max_value=120, value=12, step=1)
+
+def get_snapshot_settings():
+    """ Streamlit UI에서 분석한 명부를 스냅샷으로 저장할지 입력받는 함수 """
+    st.sidebar.subheader("📦 스냅샷 설정")
+    return st.sidebar.checkbox("분석한 명부를 기준 월 스냅샷으로 저장", value=False, help="다음 분석이나 과거 월 비교 시 엑셀 대신 스냅샷을 읽습니다.")
+
+def get_snapshot_diff_settings():
+    """
+    Streamlit UI에서 전월 스냅샷과 비교(명부 변경 내역) 사용 여부와 사원 식별 키 컬럼을 입력받는 함수
+    변경 내역 보고만 추가하며 집계는 항상 전체 분석 결과 (증분 계산 아님)
+    반환값: 키 컬럼 목록 (사용하지 않으면 None)
+    """
+    st.sidebar.subheader("🔁 전월 대비 변경 분석")
+
+    if not st.sidebar.checkbox("전월 스냅샷과 비교 (추가/삭제/변경 사원)", value=False, help="기준 월 전월에 저장된 스냅샷과 사원 키로 대조하여 명부_변경내역 시트를 추가합니다. 입사/퇴사 집계는 그대로이며, 전월 스냅샷이 없는 시트는 비교하지 않습니다."):
+        return None
+    key_input = st.sidebar.text_input("📌 사원 식별 키 컬럼 (쉼표로 구분, 명부에 있는 컬럼만 사용)", ", ".join(DEFAULT_DIFF_KEY_COLUMNS))
+    return [col.strip() for col in key_input.split(",") if col.strip()] or DEFAULT_DIFF_KEY_COLUMNS
+
+def get_transfer_settings():
+    """
+    Streamlit UI에서 계열사 간 이동 분류 사용 여부와 사원 식별 컬럼, 최대 공백 일수를 입력받는 함수
+    반환값: (식별 컬럼 목록, 최대 공백 일수) (사용하지 않으면 (None, None))
+    """
+    st.sidebar.subheader("🔀 계열사 간 이동 설정")
+
+    if not st.sidebar.checkbox("계열사 간 이동을 입사/퇴사와 구분", value=False, help="한 계열사 퇴사 후 다른 계열사에 입사한 인원을 입사자/퇴사자 리스트에서 빼고 계열사이동_리스트로 분류합니다. 이름만으로는 동명이인을 구분할 수 없으므로 생년월일/사번 등 구분 컬럼을 함께 지정하세요."):
+        return None, None
+    key_input = st.sidebar.text_input("📌 사원 식별 컬럼 (쉼표로 구분, 성명/English Name은 둘 중 값이 있는 컬럼 사용)", ", ".join(DEFAULT_IDENTITY_COLUMNS))
+    max_gap_days = st.sidebar.number_input("📌 퇴사일 → 입사일 최대 공백 (일)", min_value=0, max_value=365, value=TRANSFER_MAX_GAP_DAYS, step=1)
+    return [col.strip() for col in key_input.split(",") if col.strip()] or DEFAULT_IDENTITY_COLUMNS, int(max_gap_days)
+
 def upload_excel_files():
     """ Streamlit UI에서 다중 엑셀 파일을 업로드하는 함수 """
     return st.file_uploader("📂 엑셀 파일을 선택하세요", type=["xlsx"], accept_multiple_files=True)
 
 
 
-def save_uploaded_files(uploaded_files):
-    """ 업로드된 엑셀 파일을 임시 폴더에 저장하는 함수 """
-    temp_dir = tempfile.mkdtemp()  # 임시 폴더 생성
-    merged_excel_path = os.path.join(temp_dir, "merged_excel.xlsx")  # 병합된 파일 저장 경로
+# 입사자/퇴사자 분석에 필요한 컬럼 (추출할 컬럼 설정과 관계없이 항상 읽음)
+# 부서명/직급명은 입사자/퇴사자 리스트(EMPLOYEE_LIST_COLUMNS) 컬럼 - 추출 컬럼 설정이 리스트 내용을 바꾸지 않도록 포함
+ANALYSIS_COLUMNS = ["성명", "English Name", "입사일", "Starting Date", "퇴사일", "사원구분명", "Contract Type", "Remark", "부서명", "직급명"]
 
-    file_paths = []
-    for uploaded_file in uploaded_files:
-        file_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.read())
-        file_paths.append(file_path)
-    
-    return temp_dir, merged_excel_path, file_paths
+# "No" 헤더 행을 찾을 때 확인할 최대 행 수
+HEADER_SEARCH_ROWS = 20
+
+def find_header_row(rows):
+    """ 앞부분 행 중 첫 칸이 "No"인 헤더 행 번호를 찾는 함수 (없으면 첫 행) """
+    for idx, row in enumerate(rows):
+        if row and row[0] == "No":
+            return idx
+    return 0
+
+def project_columns(headers, delete_keywords, include_columns):
+    """
+    헤더 행을 기준으로 읽을 열 위치와 컬럼명을 결정하는 함수 (컬럼명 공백 제거)
+    추출할 컬럼이 지정되면 추출 컬럼 + 분석 필수 컬럼만 읽고, 키워드가 포함된 컬럼은 항상 제외
+    """
+    keep = set(include_columns) | set(ANALYSIS_COLUMNS) if include_columns else None
+    positions, names = [], []
+    for idx, header in enumerate(headers):
+        name = header.strip() if isinstance(header, str) else header
+        if keep is not None and name not in keep:
+            continue
+        if any(keyword in str(name) for keyword in delete_keywords):
+            continue
+        positions.append(idx)
+        names.append(name)
+    return positions, names
+
+def parse_roster_workbook(file, delete_keywords, include_columns=None):
+    """
+    엑셀 파일의 모든 시트를 "No" 헤더 행 기준 DataFrame으로 변환하는 함수
+    헤더 행에서 읽을 컬럼을 먼저 정한 뒤 해당 열만 행 단위로 읽음 (삭제 컬럼은 메모리에 올리지 않음)
+    비어 있는 시트는 None으로 반환
+    """
+    sheets = {}
+
+    with open_workbook(file) as reader:  # ✅ 행 단위 스트리밍 읽기 (xlsx_reader.READER_BACKEND)
+        for sheet_name in reader.sheet_names:
+            rows = reader.iter_rows(sheet_name)
+            head = list(islice(rows, HEADER_SEARCH_ROWS))  # 헤더 탐색용 앞부분 행
+
+            if all(all(value is None for value in row) for row in head):
+                sheets[sheet_name] = None
+                continue
+
+            header_row_index = find_header_row(head)
+            positions, names = project_columns(head[header_row_index], delete_keywords, include_columns)
+
+            # ✅ 선택된 열만 추출 (행 길이가 짧으면 빈 값)
+            data = [
+                [row[idx] if idx < len(row) else None for idx in positions]
+                for row in chain(head[header_row_index + 1:], rows)
+            ]
+            sheets[sheet_name] = pd.DataFrame(data, columns=names)
+
+    return sheets
 
 # 📌 엑셀 병합 함수 실행
-def merge_excel_files(files, output_file, sheet_order, delete_keywords, include_columns):
-    """ 여러 개의 엑셀 파일을 병합하고, 특정 키워드가 포함된 컬럼을 삭제하는 함수 """
+def load_roster_sheets(files, sheet_order, delete_keywords, include_columns, workers=None, cache=None):
+    """
+    여러 개의 엑셀 파일을 읽어 특정 키워드가 포함된 컬럼을 삭제하고, 병합 파일의 시트명 순서대로 반환하는 함수
+    캐시에 없는 파일은 프로세스 풀에서 병렬로 파싱 (workers: 워커 수, 0/1이면 직렬)
+    cache: 사용할 WorkbookCache (None이면 Streamlit 전역 캐시)
+    반환값: {병합 시트명: DataFrame}
+    """
     
     # 시트 정렬 순서에 따라 정렬
-    files.sort(key=lambda x: sheet_order.index(os.path.splitext(os.path.basename(x))[0]) if os.path.splitext(os.path.basename(x))[0] in sheet_order else len(sheet_order))
+    files.sort(key=lambda x: sheet_order.index(os.path.splitext(source_name(x))[0]) if os.path.splitext(source_name(x))[0] in sheet_order else len(sheet_order))
+
+    # ✅ 파일 내용 해시 기준 캐시 (기준 월만 바뀐 재실행에서는 다시 파싱하지 않음)
+    cache = cache if cache is not None else get_workbook_cache()
+    parse_settings = settings_key(header="No", delete_keywords=delete_keywords, include_columns=include_columns)
+    merged_sheets = {}
+    used_names = set()  # 시트명 중복 방지 (엑셀은 대소문자 구분 없음)
+
+    # ✅ 캐시에 없는 파일만 병렬 파싱 후 설정된 시트 순서대로 다시 조립
+    digests = [source_digest(file) for file in files]
+    file_sheets = [cache.get_sheets(digest, parse_settings) for digest in digests]
+    missing = [idx for idx, sheets in enumerate(file_sheets) if sheets is None]
+    errors = {}
+    results = parse_files([source_data(files[idx]) for idx in missing], parse_roster_workbook, (delete_keywords, include_columns), workers)
+
+    # ✅ 반복 문자열은 categorical, 정수는 작은 정수형으로 압축한 뒤 캐시에 저장 (roster_schema.ROSTER_SCHEMA)
+    with stage_metrics.stage("형식 압축") as record:
+        for idx, result in zip(missing, results):
+            if result.ok:
+                file_sheets[idx] = cache.put_sheets(digests[idx], parse_settings, compact_sheets(result.value, record))
+            else:
+                errors[idx] = result.error
+
+    for idx, file in enumerate(files):
+        try:
+            if idx in errors:
+                raise RuntimeError(errors[idx])
+            sheets = file_sheets[idx]
+
+            if not sheets:
+                reporting.warning(f"⚠️ 파일 `{source_name(file)}` 에 사용 가능한 시트가 없어 건너뜁니다.")
+                continue
+
+            for sheet_name, df in sheets.items():
+                if df is None:
+                    reporting.warning(f"⚠️ 파일 `{source_name(file)}` 의 시트 `{sheet_name}` 가 비어 있어 건너뜁니다.")
+                    continue
 
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        for file in files:
-            try:
-                wb = load_workbook(file, data_only=True)
-                sheet_names = wb.sheetnames  
+                # 시트 이름이 31자를 초과하지 않도록 잘라서 저장 (중복 시 번호 추가, 단순 병합과 같은 규칙)
+                new_sheet_name = unique_sheet_name(os.path.splitext(source_name(file))[0], used_names)
+                merged_sheets[new_sheet_name] = df
 
-                if not sheet_names:
-                    st.warning(f"⚠️ 파일 `{os.path.basename(file)}` 에 사용 가능한 시트가 없어 건너뜁니다.")
-                    continue
+        except Exception as e:
+            reporting.error(f"🚨 파일 `{source_name(file)}` 처리 중 오류 발생: {e}")
+
+    return merged_sheets
 
-                for sheet_name in sheet_names:
-                    ws = wb[sheet_name]
-                    data = [[cell.value for cell in row] for row in ws.iter_rows()]
-                    
-                    if not data or all(all(cell is None for cell in row) for row in data):
-                        st.warning(f"⚠️ 파일 `{os.path.basename(file)}` 의 시트 `{sheet_name}` 가 비어 있어 건너뜁니다.")
-                        continue
 
-                    header_row_index = None
-                    for idx, row in enumerate(data):
-                        if row[0] == "No":
-                            header_row_index = idx
-                            break
+# ✅ 사원구분 정렬 순서
+EMPLOYEE_TYPE_ORDER = ["임원", "정규직", "계약직", "파견직"]
 
-                    if header_row_index is not None:
-                        headers = data[header_row_index]
-                        df = pd.DataFrame(data[header_row_index + 1:], columns=headers)
-                    else:
-                        df = pd.DataFrame(data[1:], columns=data[0])
+# 날짜가 없는 경우의 월 코드 (어떤 기준 월보다도 큼)
+NO_MONTH = np.iinfo(np.int32).max
 
-                    # 컬럼명 공백 제거
-                    df.columns = df.columns.str.strip()
+def month_code(month_str):
+    """ 'YYYY-MM' 또는 'YYYY-MM-DD' 문자열을 정수 월 코드(연도*12 + 월)로 변환하는 함수 """
+    year, month = month_str.split("-")[:2]
+    return int(year) * 12 + int(month)
 
-                    # ✅ **키워드 기반 삭제 처리**
-                    delete_cols_by_keyword = [col for col in df.columns if any(keyword in col for keyword in delete_keywords)]
-                    
-                    # 컬럼 삭제 (키워드 포함 컬럼만 삭제)
-                    df.drop(columns=[col for col in delete_cols_by_keyword if col in df.columns], errors="ignore", inplace=True)
+def to_month_codes(values):
+    """ 날짜 컬럼을 정수 월 코드 배열로 변환 (변환할 수 없는 값은 NO_MONTH) """
+    dates = pd.to_datetime(values, errors="coerce")
+    codes = (dates.dt.year * 12 + dates.dt.month).to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isnan(codes), NO_MONTH, codes).astype(np.int32)
 
-                    # 시트 이름이 31자를 초과하지 않도록 잘라서 저장
-                    sheet_name_trimmed = os.path.splitext(os.path.basename(file))[0][:31]
-                    df.to_excel(writer, sheet_name=sheet_name_trimmed, index=False)
+def employee_type_codes(values):
+    """ 사원구분명을 정렬 순서 기준 정수 코드로 변환 (목록에 없는 구분은 맨 뒤) """
+    codes = pd.Categorical(values, categories=EMPLOYEE_TYPE_ORDER, ordered=True).codes
+    return np.where(codes < 0, len(EMPLOYEE_TYPE_ORDER), codes)
 
-            except Exception as e:
-                st.error(f"🚨 파일 `{os.path.basename(file)}` 처리 중 오류 발생: {e}")
+# ✅ 분석에서 제외할 인원 (시트명, 성명 또는 English Name)
+EXCLUDED_EMPLOYEES = pd.MultiIndex.from_tuples([
+    ("도이치오토월드", "장준호"),
+    ("DT네트웍스", "권혁민"),
+    ("디티네트웍스", "권혁민"),
+    ("BAMC", "YOON JONG LYOL"),
+], names=["시트명", "이름"])
 
+def excluded_mask(sheet_names, df):
+    """ (시트명, 성명) 또는 (시트명, English Name)이 제외 목록에 있는 행 (제외 목록과의 anti-join을 컬럼 단위로 한 번에 계산) """
+    mask = np.zeros(len(df), dtype=bool)
+    for column in ("성명", "English Name"):
+        if column in df.columns:
+            mask |= pd.MultiIndex.from_arrays([sheet_names, df[column]]).isin(EXCLUDED_EMPLOYEES)
+    return mask
 
-def process_employee_data(df, sheet_name, selected_month_str, previous_month, previous_month_last_day, date_columns):
+def resolve_employee_types(df):
+    """ 사원구분명 컬럼이 없으면 만들고, Contract Type(FDC/UDC)으로 계약직/정규직을 채우는 함수 """
+    if "사원구분명" not in df.columns:
+        df["사원구분명"] = None
+    if "Contract Type" in df.columns:
+        df["사원구분명"] = add_categories(df["사원구분명"], ["계약직", "정규직"])
+        df.loc[df["Contract Type"].astype(str).str.contains("FDC", na=False), "사원구분명"] = "계약직"
+        df.loc[df["Contract Type"].astype(str).str.contains("UDC", na=False), "사원구분명"] = "정규직"
+    return df
+
+def employee_month_codes(df, previous_month_last_day):
+    """ 입사 월 코드, 퇴사 월 코드 (Remark가 'Resigned and last working'으로 시작하면 전월 퇴사) """
+    hire_codes = to_month_codes(df["입사일"]) if "입사일" in df.columns else np.full(len(df), NO_MONTH, dtype=np.int32)
+    exit_codes = to_month_codes(df["퇴사일"]) if "퇴사일" in df.columns else np.full(len(df), NO_MONTH, dtype=np.int32)
+    if "Remark" in df.columns:
+        resigned_by_remark = df["Remark"].astype(str).str.startswith("Resigned and last working").to_numpy()
+        exit_codes[resigned_by_remark] = month_code(previous_month_last_day)
+    return hire_codes, exit_codes
+
+def normalize_employee_data(df, sheet_name, previous_month_last_day):
     """
-    직원 데이터를 정리하고 입사자, 퇴사자, 재직자 수 등을 계산하는 함수
+    직원 데이터의 컬럼명/제외 인원/사원구분을 정리하고 사원구분 순서로 정렬하는 함수
+    반환값: (정리된 DataFrame, 입사 월 코드, 퇴사 월 코드, 사원구분 코드)
     """
     # 📌 컬럼명 정리
     if "Starting Date" in df.columns:
@@ -198,172 +329,441 @@ def process_employee_data(df, sheet_name, selected_month_str, previous_month, pr
     df.columns = df.columns.str.strip()
 
     # 📌 특정 인원 제외
-    exclude_conditions = {
-        "도이치오토월드": ["장준호"],
-        "DT네트웍스": ["권혁민"],
-        "디티네트웍스": ["권혁민"],
-        "BAMC": ["YOON JONG LYOL"]
-    }
-    if sheet_name in exclude_conditions and "성명" in df.columns:
-        df = df.loc[~df["성명"].isin(exclude_conditions[sheet_name])]
-    if "English Name" in df.columns:
-        df = df.loc[~df["English Name"].isin(exclude_conditions[sheet_name])]
-
-    # 📌 날짜 변환
-    if "입사일" in df.columns:
-        df["입사일"] = pd.to_datetime(df["입사일"], errors="coerce").dt.strftime("%Y-%m-%d")
+    df = df.loc[~excluded_mask(np.full(len(df), sheet_name, dtype=object), df)]
+
+    # 📌 날짜 변환 (정수 월 코드: 연도*12 + 월)
     if "퇴사일" not in df.columns:
         df["퇴사일"] = None
-    if "Remark" in df.columns:
-        df.loc[df["Remark"].astype(str).str.startswith("Resigned and last working"), "퇴사일"] = previous_month_last_day
+    hire_codes, exit_codes = employee_month_codes(df, previous_month_last_day)
 
     # 📌 "사원구분명" 컬럼 자동 생성
-    if "사원구분명" not in df.columns:
-        df["사원구분명"] = None
-    if "Contract Type" in df.columns:
-        df.loc[df["Contract Type"].astype(str).str.contains("FDC", na=False), "사원구분명"] = "계약직"
-        df.loc[df["Contract Type"].astype(str).str.contains("UDC", na=False), "사원구분명"] = "정규직"
+    df = resolve_employee_types(df)
 
-    # 📌 날짜 변환 (YYYY-MM)
-    for col in date_columns:
-        df[col] = pd.to_datetime(df[col], errors="coerce").dt.strftime("%Y-%m")
-
-    # 📌 원하는 정렬 순서 지정
-    employee_type_order = ["임원", "정규직", "계약직", "파견직"]
-
-    # ✅ **사원구분명 정렬을 위한 순서 컬럼 추가**
-    df["사원구분_정렬"] = df["사원구분명"].map(lambda x: employee_type_order.index(x) if x in employee_type_order else len(employee_type_order))
-
-    # ✅ **사원구분명 순서로 정렬**
-    df = df.sort_values(by=["사원구분_정렬"], ascending=True).drop(columns=["사원구분_정렬"])
-
-    # 📌 1. 선택한 월 입사자 수
-    new_hires_selected_month = df[df["입사일"] == selected_month_str].shape[0]
-    st.write(f"📌 1. **{selected_month_str} 입사자 수:** {new_hires_selected_month}명")
-
-    # 📌 2. 선택한 월 퇴사자 수
-    resigned_selected_month = df[df["퇴사일"] == selected_month_str].shape[0]
-    st.write(f"📌 2. **{selected_month_str} 퇴사자 수:** {resigned_selected_month}명")
-
-    # 📌 3. 선택한 월 기준 총 재직자 수
-    active_this_month = df[
-        (df["입사일"] <= selected_month_str) & 
-        (df["퇴사일"].isna() | (df["퇴사일"] > selected_month_str))
-    ].shape[0]
-    st.write(f"📌 3. **{selected_month_str} 기준 총 재직자 수:** {active_this_month}명")
-
-    # 📌 4. 선택한 월 입사자 수 (사원구분별)
-    new_hires_by_type_selected_month = df[df["입사일"] == selected_month_str]["사원구분명"].value_counts()
-    new_hires_by_type_selected_month = new_hires_by_type_selected_month.reindex(employee_type_order, fill_value=0)
-    st.write(f"📌 4. **{selected_month_str} 입사자 수 (사원구분별)**")
-    for emp_type, count in new_hires_by_type_selected_month.items():
-        st.write(f"  - {emp_type}: {count}명")
-
-    # 📌 5. 선택한 월 퇴사자 수 (사원구분별)
-    resigned_by_type_selected_month = df[df["퇴사일"] == selected_month_str]["사원구분명"].value_counts()
-    resigned_by_type_selected_month = resigned_by_type_selected_month.reindex(employee_type_order, fill_value=0)
-    st.write(f"📌 5. **{selected_month_str} 퇴사자 수 (사원구분별)**")
-    for emp_type, count in resigned_by_type_selected_month.items():
-        st.write(f"  - {emp_type}: {count}명")
-
-    # 📌 6. 선택한 월 기준 재직자 수 (사원구분별)
-    active_this_month_by_type = df[
-        (df["입사일"] <= selected_month_str) & 
-        (df["퇴사일"].isna() | (df["퇴사일"] > selected_month_str))
-    ]["사원구분명"].value_counts()
-    active_this_month_by_type = active_this_month_by_type.reindex(employee_type_order, fill_value=0)
-    st.write(f"📌 6. **{selected_month_str} 기준 총 재직자 수 (사원구분별)**")
-    for emp_type, count in active_this_month_by_type.items():
-        st.write(f"  - {emp_type}: {count}명")
+    # ✅ **사원구분명 순서로 정렬** (ordered categorical 코드 기준 안정 정렬)
+    type_codes = employee_type_codes(df["사원구분명"])
+    order = np.argsort(type_codes, kind="stable")
+    df = df.iloc[order]
+    hire_codes, exit_codes, type_codes = hire_codes[order], exit_codes[order], type_codes[order]
 
-    # 📌 입사자 및 퇴사자 정보 저장
-    all_new_hires = []
-    all_resigned = []
+    return df, hire_codes, exit_codes, type_codes
+
+# 지표 이름 (employee_metric_table의 컬럼 순서)
+METRIC_NAMES = ["입사자", "퇴사자", "재직자"]
 
-    if {"입사일", "사원구분명", "부서명", "성명", "직급명"}.issubset(df.columns):
-        new_hires = df[df["입사일"] == previous_month][["사원구분명", "부서명", "성명", "직급명"]]
-        if not new_hires.empty:
-            new_hires["시트명"] = sheet_name
-            all_new_hires.append(new_hires)
+def metrics_from_counts(counts):
+    """ (지표 3개 × (사원구분 수 + 기타)) 집계 배열을 지표 딕셔너리로 변환 (합계에는 기타 구분 포함) """
+    metrics = {}
+    for name, row in zip(METRIC_NAMES, counts):
+        metrics[name] = int(row.sum())
+        metrics[f"{name}_사원구분별"] = {emp_type: int(count) for emp_type, count in zip(EMPLOYEE_TYPE_ORDER, row)}
+    return metrics
 
-    if {"퇴사일", "사원구분명", "부서명", "성명", "직급명"}.issubset(df.columns):
-        resigned = df[df["퇴사일"] == previous_month][["사원구분명", "부서명", "성명", "직급명"]]
-        if not resigned.empty:
-            resigned["시트명"] = sheet_name
-            all_resigned.append(resigned)
+# 전체 시트를 합친 분석용 DataFrame에 담는 컬럼 (명부의 나머지 컬럼은 분석에 쓰지 않음)
+EMPLOYEE_FRAME_COLUMNS = ["성명", "English Name", "입사일", "퇴사일", "사원구분명", "Contract Type", "Remark", "부서명", "직급명"]
 
-    return all_new_hires, all_resigned
+# 입사자/퇴사자 리스트 컬럼 (시트에 모두 있어야 리스트에 포함)
+EMPLOYEE_LIST_COLUMNS = ["사원구분명", "부서명", "성명", "직급명"]
 
+def build_employee_frame(sheets, previous_month_last_day, extra_columns=()):
+    """
+    모든 시트의 분석 컬럼을 하나의 긴 DataFrame으로 합치는 함수 (시트명: 시트 순서의 categorical)
+    시트마다 분석 컬럼만 골라 normalize_employee_data로 정리하고 (스냅샷 저장/비교와 같은 정리 경로),
+    입사/퇴사 월 코드와 사원구분 코드 컬럼을 추가 - 행 순서는 (시트, 사원구분) 순
+    extra_columns: EMPLOYEE_FRAME_COLUMNS 외에 함께 담을 컬럼 (예: 계열사 이동 식별 컬럼)
+    반환값: (DataFrame, {시트명: 시트의 컬럼 집합})
+    """
+    frame_columns = EMPLOYEE_FRAME_COLUMNS + [column for column in extra_columns if column not in EMPLOYEE_FRAME_COLUMNS]
+    parts, sheet_columns = [], {}
+    codes = {"입사월코드": [], "퇴사월코드": [], "사원구분코드": []}
+    for sheet_name, df in sheets.items():
+        columns = df.rename(columns={"Starting Date": "입사일"}).columns.str.strip()
+        sheet_columns[sheet_name] = set(columns) | {"퇴사일", "사원구분명"}  # 분석 중 항상 만들어지는 컬럼 포함
+        part = df.loc[:, [column in frame_columns for column in columns]]
+
+        # 📌 시트별 정리는 normalize_employee_data 하나로 (제외 인원, 사원구분, 월 코드, 사원구분 순서 정렬)
+        part, hire_codes, exit_codes, type_codes = normalize_employee_data(part, sheet_name, previous_month_last_day)
+        # 날짜는 시트마다 변환 (시트별로 날짜 표기가 달라도 합친 컬럼에서 형식 추론이 섞이지 않도록)
+        parts.append(part.assign(**{column: pd.to_datetime(part[column], errors="coerce") for column in ("입사일", "퇴사일") if column in part.columns}))
+        for column, values in zip(codes, (hire_codes, exit_codes, type_codes)):
+            codes[column].append(values)
+
+    sheet_codes = np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+    frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    frame["시트명"] = pd.Categorical.from_codes(sheet_codes, categories=list(sheets))
+
+    # ✅ 시트마다 카테고리가 달라 합치면서 풀린 컬럼을 다시 압축
+    with stage_metrics.stage("분석 데이터 압축") as record:
+        before = frame_bytes([frame]) if stage_metrics.is_recording() else 0
+        frame = compact_frame(frame)
+        if before:
+            record.data_size(before, frame_bytes([frame]))
+
+    # 📌 월 코드 / 사원구분 코드 (시트 순서대로 이어 붙임 - 행 순서는 시트 순서 → 사원구분 순서)
+    for column, values in codes.items():
+        frame[column] = np.concatenate(values) if values else np.array([], dtype=np.int32)
+    return frame, sheet_columns
+
+def employee_metric_table(frame, selected_month_str):
+    """
+    (시트명, 사원구분)별 입사자 / 퇴사자 / 재직자 수를 groupby 한 번으로 집계하는 함수
+    반환값: index (시트명, 사원구분), 컬럼 METRIC_NAMES 인 DataFrame (인원이 없는 조합은 0)
+    """
+    selected_code = month_code(selected_month_str)
+    hire_codes, exit_codes = frame["입사월코드"].to_numpy(), frame["퇴사월코드"].to_numpy()
+    flags = pd.DataFrame({
+        "시트명": frame["시트명"],
+        "사원구분": pd.Categorical.from_codes(frame["사원구분코드"].to_numpy(), categories=EMPLOYEE_TYPE_ORDER + ["기타"]),
+        "입사자": hire_codes == selected_code,
+        "퇴사자": exit_codes == selected_code,
+        "재직자": (hire_codes <= selected_code) & (exit_codes > selected_code),
+    })
+    return flags.groupby(["시트명", "사원구분"], observed=False)[METRIC_NAMES].sum()
+
+def frame_employee_lists(frame, sheet_columns, previous_month, transfers=None):
+    """
+    전체 시트의 전월 입사자 / 퇴사자 목록 (리스트 컬럼이 모두 있는 시트만, 없으면 None)
+    transfers: TransferIndex - 계열사 간 이동으로 분류된 전입/전출 행은 입사자/퇴사자에서 제외
+    """
+    previous_code = month_code(previous_month)
+    list_sheets = [sheet_name for sheet_name, columns in sheet_columns.items() if set(EMPLOYEE_LIST_COLUMNS).issubset(columns)]
+    hire_sheets = [sheet_name for sheet_name in list_sheets if "입사일" in sheet_columns[sheet_name]]
+    moved_in, moved_out = (transfers.in_mask, transfers.out_mask) if transfers is not None else (False, False)
+
+    list_columns = [column for column in EMPLOYEE_LIST_COLUMNS if column in frame.columns]  # 리스트 컬럼이 없는 명부도 분석 가능하도록
+
+    lists = []
+    for codes, sheet_names, moved in [(frame["입사월코드"], hire_sheets, moved_in), (frame["퇴사월코드"], list_sheets, moved_out)]:
+        rows = frame.loc[(codes == previous_code) & frame["시트명"].isin(sheet_names) & ~moved, [*list_columns, "시트명"]]
+        lists.append(rows.astype({"시트명": str}).reset_index(drop=True) if not rows.empty else None)
+    return lists
+
+def frame_transfer_list(frame, transfers, previous_month):
+    """ 전월에 전입 또는 전출한 계열사 간 이동 목록 (없으면 None) """
+    previous_code = month_code(previous_month)
+    hire_codes, exit_codes = frame["입사월코드"].to_numpy(), frame["퇴사월코드"].to_numpy()
+    selected = (hire_codes[transfers.in_rows] == previous_code) | (exit_codes[transfers.out_rows] == previous_code)
+    return transfers.to_frame(selected) if selected.any() else None
+
+def employee_metrics_frame(sheet_metrics):
+    """ 시트별 지표를 하나의 표로 변환 (행: 시트명 × 지표, 열: 합계 + 사원구분별 인원, 마지막에 전체 합계) """
+    rows = []
+    for sheet_name, metrics in sheet_metrics.items():
+        for name in METRIC_NAMES:
+            rows.append({"시트명": sheet_name, "구분": name, "합계": metrics[name], **metrics[f"{name}_사원구분별"]})
+    table = pd.DataFrame(rows, columns=["시트명", "구분", "합계", *EMPLOYEE_TYPE_ORDER])
+    if table.empty:
+        return table
+    total = table.groupby("구분", sort=False).sum(numeric_only=True).reset_index().assign(시트명="전체")
+    return pd.concat([table, total[table.columns]], ignore_index=True)
+
+def show_employee_metrics(sheet_metrics, selected_month_str):
+    """ 시트별 입사자 / 퇴사자 / 재직자 수(합계 및 사원구분별)를 하나의 표로 Streamlit 화면에 표시하는 함수 """
+    st.subheader(f"📊 {selected_month_str} 시트별 입사자 / 퇴사자 / 재직자 수")
+    st.dataframe(employee_metrics_frame(sheet_metrics), hide_index=True)
+
+
+def analyze_employee_data(sheets, selected_month_str, previous_month, previous_month_last_day, date_columns, identity_columns=None, max_gap_days=TRANSFER_MAX_GAP_DAYS):
+    """
+    병합된 전체 시트를 하나의 DataFrame으로 합쳐 입사자 및 퇴사자 분석 (시트별 반복 없이 groupby 한 번으로 집계)
+    identity_columns: 지정하면 그룹 전체 사원 식별 인덱스로 계열사 간 이동을 찾아 입사자/퇴사자 리스트와 구분
+    반환값: (입사자 리스트, 퇴사자 리스트, 계열사 이동 리스트, {시트명: 지표})
+    """
+    report_progress(0, 1, "입·퇴사 분석")
+    frame, sheet_columns = build_employee_frame(sheets, previous_month_last_day, identity_columns or ())
 
+    # 📌 1~3. 선택한 월 입사자 / 퇴사자 / 기준 총 재직자 수, 4~6. 사원구분별 인원
+    table = employee_metric_table(frame, selected_month_str)
+    sheet_metrics = {sheet_name: metrics_from_counts(table.loc[sheet_name].to_numpy().T) for sheet_name in sheets}
 
-def analyze_employee_data(merged_excel_path, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order):
-    """ 병합된 엑셀에서 입사자 및 퇴사자 분석 후 새로운 시트 추가 """
-    
-    with pd.ExcelWriter(merged_excel_path, engine="openpyxl", mode="a") as writer:
-        sheets = pd.read_excel(merged_excel_path, sheet_name=None, engine="openpyxl")
+    # 📌 계열사 간 이동 (퇴사 → 다른 계열사 입사)은 입사자/퇴사자와 구분 (계열사별 지표에는 그대로 포함)
+    transfers = find_transfers(frame, identity_columns, max_gap_days) if identity_columns else None
+    if transfers is not None and not has_discriminating_column(frame, identity_columns):
+        reporting.warning("⚠️ 계열사 이동 식별 컬럼이 이름뿐이라 동명이인이 이동으로 분류될 수 있습니다. 생년월일/사번 등 구분 컬럼을 식별 컬럼에 추가하세요.")
+    transfers_df = frame_transfer_list(frame, transfers, previous_month) if transfers else None
 
-        all_new_hires = []
-        all_resigned = []
+    # 📌 입사자 및 퇴사자 정보 저장
+    new_hires_df, resigned_df = frame_employee_lists(frame, sheet_columns, previous_month, transfers)
+
+    return new_hires_df, resigned_df, transfers_df, sheet_metrics
+
+def collect_sheet_month_codes(sheets, previous_month_last_day):
+    """ 시트별 입사 월 코드, 퇴사 월 코드, 사원구분 코드를 모으는 함수 (월별 인원 추이 계산용) """
+    sheet_codes = {}
+    for sheet_name, df in sheets.items():
+        _, hire_codes, exit_codes, type_codes = normalize_employee_data(df.copy(), sheet_name, previous_month_last_day)
+        sheet_codes[sheet_name] = (hire_codes, exit_codes, type_codes)
+    return sheet_codes
+
+def show_roster_changes(diffs, snapshot_month):
+    """ 전월 스냅샷 대비 시트별 추가/삭제/변경 인원과 변경 내역을 표시하는 함수 """
+    st.subheader(f"🔁 {snapshot_month} 스냅샷 대비 명부 변경")
+    if not diffs:
+        st.info(f"ℹ️ {snapshot_month} 스냅샷이 없어 전체 분석으로 계산했습니다.")
+        return
+
+    summary = pd.DataFrame({sheet_name: diff.summary() for sheet_name, diff in diffs.items()}).T
+    st.dataframe(summary.rename_axis("시트명"))
+    changes = pd.concat([diff.to_frame() for diff in diffs.values()], ignore_index=True)
+    if not changes.empty:
+        st.dataframe(changes, hide_index=True)
+
+def show_transfers(transfers, previous_month):
+    """ 전월 계열사 간 이동 목록을 표시하는 함수 """
+    st.subheader(f"🔀 {previous_month} 계열사 간 이동")
+    if transfers is None:
+        st.info("ℹ️ 계열사 간 이동으로 분류된 인원이 없습니다.")
+        return
+    st.caption(f"🔀 {len(transfers):,}명은 입사자/퇴사자 리스트에서 제외하고 계열사이동_리스트에 기록합니다.")
+    st.dataframe(transfers, hide_index=True)
+
+def show_headcount_timeline(timeline):
+    """ 월별 인원 추이를 차트와 표로 표시하는 함수 """
+    st.subheader("📈 월별 인원 추이")
+    if timeline.empty:
+        st.info("ℹ️ 분석 기간에 해당하는 인원이 없습니다.")
+        return
+
+    st.write("**월별 재직자 수 (시트별)**")
+    st.line_chart(summarize_timeline(timeline, "재직자"))
+    st.dataframe(timeline, hide_index=True)
+
+def write_analysis_workbook(output_file, sheets, new_hires, resigned, date_columns, timeline=None, roster_changes=None, transfers=None):
+    """
+    병합 시트와 입사자/퇴사자 리스트(및 계열사 이동 리스트, 월별 인원 추이, 전월 대비 명부 변경 내역)를 한 번에 엑셀로 저장하는 함수
+    날짜 컬럼은 기록 시점에 'YYYY-MM-DD' 형식 적용
+    """
+    writer = StreamingWorkbookWriter()
 
-        for sheet_name, df in sheets.items():
-            st.subheader(f"📄 시트 이름: {sheet_name}")
+    for sheet_idx, (sheet_name, df) in enumerate(sheets.items(), start=1):
+        report_progress(sheet_idx, len(sheets), f"시트 기록: {sheet_name}")
+        date_formats = {col_idx: "YYYY-MM-DD" for col_idx, col in enumerate(df.columns, start=1) if col in date_columns}
+        writer.add_sheet(sheet_name, column_formats=date_formats).write_dataframe(df)
 
-            new_hires, resigned = process_employee_data(df, sheet_name, selected_month_str, previous_month, previous_month_last_day, date_columns)
+    # 📌 입사자 및 퇴사자 데이터를 엑셀 시트에 저장
+    if new_hires is not None:
+        writer.add_sheet("입사자_리스트").write_dataframe(new_hires)
+    if resigned is not None:
+        writer.add_sheet("퇴사자_리스트").write_dataframe(resigned)
+    if transfers is not None:
+        writer.add_sheet("계열사이동_리스트", column_formats={4: "YYYY-MM-DD", 5: "YYYY-MM-DD"}).write_dataframe(transfers)
+    if timeline is not None:
+        writer.add_sheet("월별_인원추이").write_dataframe(timeline)
+    if roster_changes is not None:
+        writer.add_sheet("명부_변경내역").write_dataframe(roster_changes)
 
-            if new_hires:
-                all_new_hires.extend(new_hires)
-            if resigned:
-                all_resigned.extend(resigned)
+    writer.save(output_file)
 
-        # 📌 입사자 및 퇴사자 데이터를 엑셀 시트에 저장
-        if all_new_hires:
-            pd.concat(all_new_hires).to_excel(writer, sheet_name="입사자_리스트", index=False)
-        if all_resigned:
-            pd.concat(all_resigned).to_excel(writer, sheet_name="퇴사자_리스트", index=False)
 
+class EmployeeAnalysisPipeline:
+    """
+    업로드 파일을 한 번만 파싱하고 단계 간에는 DataFrame을 그대로 전달하는 인원 분석 파이프라인
+    load(병합) → analyze(입사/퇴사 분석) → timeline(월별 인원 추이, 선택) → write(날짜 서식을 적용하여 한 번만 저장)
+    compare_snapshots로 기준 월 전월 스냅샷과 대조하여 명부 변경 내역(self.diffs)을 추가 (집계는 analyze 결과 그대로)
+    identity_columns를 넘기면 그룹 전체에서 계열사 간 이동을 찾아 입사자/퇴사자 리스트와 구분 (self.transfers)
+    """
 
+    def __init__(self, sheet_order, delete_keywords, include_columns, date_columns, workers=None, cache=None):
+        self.sheet_order = sheet_order
+        self.workers = workers
+        self.cache = cache
+        self.delete_keywords = delete_keywords
+        self.include_columns = include_columns
+        self.date_columns = date_columns
+        self.sheets = {}
+        self.new_hires = None
+        self.resigned = None
+        self.transfers = None
+        self.metrics = {}
+        self.timeline = None
+        self.diffs = {}  # 시트명 -> RosterDiff (전월 스냅샷과 비교한 경우)
+
+    def load(self, files):
+        """ 📌 엑셀 병합 및 키워드 기반 컬럼 삭제 """
+        with stage_metrics.stage("명부 파싱") as record:
+            self.sheets = load_roster_sheets(files, self.sheet_order, self.delete_keywords, self.include_columns, self.workers, self.cache)
+            record.count(*stage_metrics.count_frame_cells(self.sheets.values()))
+        return self
+
+    def load_snapshots(self, store, month):
+        """ 📌 엑셀 대신 저장된 기준 월 스냅샷을 읽어 시트 순서대로 병합 (메모리 맵) """
+        with stage_metrics.stage("스냅샷 읽기") as record:
+            snapshots = store.load_month(month)
+            affiliates = sorted(snapshots, key=lambda name: self.sheet_order.index(name) if name in self.sheet_order else len(self.sheet_order))
+            self.sheets = {affiliate: snapshots[affiliate][0] for affiliate in affiliates}
+            record.count(*stage_metrics.count_frame_cells(self.sheets.values()))
+        return self
+
+    def save_snapshots(self, store, month, previous_month_last_day):
+        """ 📌 정리된 명부와 입사/퇴사/사원구분 코드를 계열사별 기준 월 스냅샷으로 저장 """
+        with stage_metrics.stage("스냅샷 저장") as record:
+            for sheet_name, df in self.sheets.items():
+                df, hire_codes, exit_codes, type_codes = normalize_employee_data(df.copy(), sheet_name, previous_month_last_day)
+                store.save(sheet_name, month, df, {"hire": hire_codes, "exit": exit_codes, "type": type_codes})
+                record.count(rows=len(df), cells=df.size)
+        return self
+
+    def analyze(self, selected_month_str, previous_month, previous_month_last_day, identity_columns=None, max_gap_days=TRANSFER_MAX_GAP_DAYS):
+        """ 📌 병합된 데이터에서 입사자 및 퇴사자 분석 (identity_columns: 계열사 간 이동 식별 컬럼, None이면 구분하지 않음) """
+        with stage_metrics.stage("입·퇴사 분석") as record:
+            self.new_hires, self.resigned, self.transfers, self.metrics = analyze_employee_data(
+                self.sheets, selected_month_str, previous_month, previous_month_last_day, self.date_columns, identity_columns, max_gap_days
+            )
+            record.count(*stage_metrics.count_frame_cells(self.sheets.values()))
+        return self
+
+    def compare_snapshots(self, store, selected_month_str, previous_month_last_day, key_columns=None):
+        """
+        📌 기준 월 전월 스냅샷과 사원 키 해시 인덱스로 대조하여 추가/삭제/변경된 사원을 self.diffs에 저장 (변경 내역 보고용)
+        전월 스냅샷이 없거나 키 컬럼이 없는 시트는 비교하지 않음
+        """
+        snapshot_month = month_label(month_code(selected_month_str) - 1)
+
+        with stage_metrics.stage("전월 대비 변경") as record:
+            self.diffs = {}
+            for sheet_idx, (sheet_name, df) in enumerate(self.sheets.items(), start=1):
+                report_progress(sheet_idx, len(self.sheets), f"전월 대비 변경: {sheet_name}")
+                snapshot = store.load(sheet_name, snapshot_month)
+                if snapshot is None:
+                    continue
 
-def download_excel_file(file_path, temp_dir, file_name="merged_excel.xlsx"):
-    """ 병합된 엑셀 파일을 다운로드할 수 있도록 제공하는 함수 """
-    if st.download_button(
+                previous_df, previous_codes = snapshot
+                df, hire_codes, exit_codes, type_codes = normalize_employee_data(df.copy(), sheet_name, previous_month_last_day)
+                current_codes = {"hire": hire_codes, "exit": exit_codes, "type": type_codes}
+                try:
+                    self.diffs[sheet_name] = diff_roster(previous_df, df, key_columns, previous_codes, current_codes, sheet_name)
+                except ValueError as e:
+                    reporting.warning(f"⚠️ {e} 전월 대비 변경 내역에서 제외합니다.")
+                record.count(rows=len(previous_df) + len(df))
+        return self
+
+    def roster_changes(self):
+        """ 전월 대비 명부 변경 내역 표 (전월 스냅샷과 비교하지 않았으면 None) """
+        if not self.diffs:
+            return None
+        return pd.concat([diff.to_frame() for diff in self.diffs.values()], ignore_index=True)
+
+    def build_timeline(self, selected_month_str, months, previous_month_last_day):
+        """ 📌 기준 월까지 최근 months개월의 월별 입사자/퇴사자/재직자 수 계산 (이벤트 누적합 한 번) """
+        with stage_metrics.stage("월별 추이") as record:
+            end_code = month_code(selected_month_str)
+            sheet_codes = collect_sheet_month_codes(self.sheets, previous_month_last_day)
+            self.timeline = build_headcount_timeline(sheet_codes, EMPLOYEE_TYPE_ORDER + ["기타"], end_code - months + 1, end_code)
+            record.count(rows=sum(len(df) for df in self.sheets.values()))
+        return self
+
+    def write(self, output_file):
+        """ 📌 날짜 형식을 적용하여 최종 엑셀을 한 번만 저장 """
+        with stage_metrics.stage("엑셀 저장 (날짜 서식)") as record:
+            roster_changes = self.roster_changes()
+            write_analysis_workbook(output_file, self.sheets, self.new_hires, self.resigned, self.date_columns, self.timeline, roster_changes, self.transfers)
+            record.count(*stage_metrics.count_frame_cells([*self.sheets.values(), self.new_hires, self.resigned, self.transfers, self.timeline, roster_changes]))
+        return self
+
+
+def download_excel_file(data, file_name="merged_excel.xlsx"):
+    """ 병합된 엑셀 파일(메모리의 바이트)을 다운로드할 수 있도록 제공하는 함수 """
+    st.download_button(
         label="📥 병합된 엑셀 다운로드",
-        data=open(file_path, "rb").read(),
+        data=data,
         file_name=file_name,
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    ):
-        # 일정 시간 후 파일 및 임시 폴더 삭제
-        time.sleep(10)
-        os.remove(file_path)
-        shutil.rmtree(temp_dir)  
-        st.warning("🔒 다운로드 후 10초가 지나 파일이 자동 삭제되었습니다.")
-
-def apply_date_format_to_excel(file_path, date_columns):
-    """ 병합된 엑셀 파일의 날짜 컬럼을 YYYY-MM-DD 형식으로 변환하는 함수 """
-    apply_excel_date_format(file_path, date_columns)
-
-def process_excel_files(uploaded_files, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, delete_keywords, include_columns):
-    """ 엑셀 파일을 병합, 분석, 서식 적용 후 다운로드할 수 있도록 처리하는 함수 """
-    
-    # 📌 1. 업로드된 파일을 저장
-    temp_dir, merged_excel_path, file_paths = save_uploaded_files(uploaded_files)
-    
-    # 📌 2. 엑셀 병합 및 키워드 기반 컬럼 삭제
-    merge_excel_files(file_paths, merged_excel_path, sheet_order, delete_keywords, include_columns)
-    
-    # 📌 3. 병합된 데이터에서 입사자 및 퇴사자 분석
-    analyze_employee_data(merged_excel_path, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order)
-    
-    # 📌 4. 날짜 형식 적용
-    apply_date_format_to_excel(merged_excel_path, date_columns)
+    )
+    st.caption("🔒 업로드 및 병합 파일은 서버에 보관하지 않고 자동 삭제됩니다.")
+
+def build_employee_analysis(uploaded_files, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, delete_keywords, include_columns, timeline_months=None, save_snapshots=False, diff_key_columns=None, transfer_settings=(None, None), cache=None, temp_manager=None):
+    """
+    (백그라운드 작업) 엑셀 파일을 병합, 분석, 서식 적용하여 저장하는 함수 (화면 표시 없음)
+    cache / temp_manager: 스크립트 스레드에서 구한 WorkbookCache / 임시 파일 관리자
+    반환값: (EmployeeAnalysisPipeline, 결과 엑셀 바이트)
+    """
+
+    # 📌 1. 업로드 수집 (업로드 버퍼에서 바로 파싱, 큰 파일만 디스크에 기록 / 같은 내용의 파일은 한 번만)
+    with stage_metrics.stage("업로드 수집"):
+        uploads = ingest_uploads(uploaded_files, manager=temp_manager)
+
+    # 📌 2~4. 병합 → 입사자/퇴사자 분석 → 날짜 서식 적용 저장 (파일은 한 번만 기록)
+    pipeline = EmployeeAnalysisPipeline(sheet_order, delete_keywords, include_columns, date_columns, cache=cache)
+    try:
+        pipeline.load(uploads.sources)
+    finally:
+        uploads.release()  # ✅ 파싱이 끝나면 디스크에 기록한 업로드는 바로 삭제 대상으로 표시 (백그라운드에서 삭제)
+    if save_snapshots:
+        pipeline.save_snapshots(RosterSnapshotStore(), selected_month_str, previous_month_last_day)
+    identity_columns, max_gap_days = transfer_settings
+    max_gap_days = TRANSFER_MAX_GAP_DAYS if max_gap_days is None else max_gap_days
+    pipeline.analyze(selected_month_str, previous_month, previous_month_last_day, identity_columns, max_gap_days)
+    if diff_key_columns:
+        pipeline.compare_snapshots(RosterSnapshotStore(), selected_month_str, previous_month_last_day, diff_key_columns)
+    if timeline_months:
+        pipeline.build_timeline(selected_month_str, int(timeline_months), previous_month_last_day)
+    output = io.BytesIO()
+    pipeline.write(output)
+    return pipeline, output.getvalue()
+
+def process_excel_files(uploaded_files, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, delete_keywords, include_columns, timeline_months=None, save_snapshots=False, diff_key_columns=None, transfer_settings=(None, None)):
+    """
+    엑셀 파일을 병합, 분석, 서식 적용 후 다운로드할 수 있도록 처리하는 함수
+    처리는 백그라운드 작업으로 실행하고 (진행률 표시/취소 가능), 같은 업로드와 설정이면 재실행 시 기존 작업 결과를 사용
+    diff_key_columns: 지정하면 전월 스냅샷과 이 키로 대조한 명부 변경 내역 추가
+    transfer_settings: (식별 컬럼, 최대 공백 일수) - 식별 컬럼을 지정하면 계열사 간 이동을 입사자/퇴사자와 구분
+    """
+    identity_columns, max_gap_days = transfer_settings
+    settings = (
+        selected_month_str, previous_month, previous_month_last_day, tuple(date_columns), tuple(sheet_order),
+        tuple(delete_keywords), tuple(include_columns), timeline_months, save_snapshots, tuple(diff_key_columns or ()),
+        tuple(identity_columns or ()), max_gap_days,
+    )
+    submit_session_job(
+        "hr_analysis", (upload_key(uploaded_files), settings), "엑셀 병합 및 인원 분석",
+        build_employee_analysis, uploaded_files, selected_month_str, previous_month, previous_month_last_day,
+        date_columns, sheet_order, delete_keywords, include_columns, timeline_months, save_snapshots, diff_key_columns, transfer_settings,
+        # 작업 스레드에는 Streamlit 실행 컨텍스트가 없으므로 캐시/임시 파일 관리자는 여기서 구해 넘김
+        cache=get_workbook_cache(), temp_manager=get_temp_manager(),
+    )
+    job = wait_for_job("hr_analysis")
+    if job is None:
+        return
+    pipeline, output = job.result
+
+    if save_snapshots:
+        st.sidebar.caption(f"📦 {selected_month_str} 스냅샷 {len(pipeline.sheets)}개 저장")
+    if diff_key_columns:
+        show_roster_changes(pipeline.diffs, month_label(month_code(selected_month_str) - 1))
+    show_employee_metrics(pipeline.metrics, selected_month_str)
+    if identity_columns:
+        show_transfers(pipeline.transfers, previous_month)
+    if timeline_months:
+        show_headcount_timeline(pipeline.timeline)
     
     # 📌 5. 다운로드 버튼 제공
-    download_excel_file(merged_excel_path, temp_dir)
+    download_excel_file(output)
+
+def process_snapshot_month(store, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, timeline_months=None, transfer_settings=(None, None)):
+    """ 엑셀 업로드 없이 저장된 기준 월 스냅샷으로 분석 후 다운로드할 수 있도록 처리하는 함수 """
+    identity_columns, max_gap_days = transfer_settings
+    pipeline = EmployeeAnalysisPipeline(sheet_order, [], [], date_columns)
+    pipeline.load_snapshots(store, selected_month_str)
+    pipeline.analyze(selected_month_str, previous_month, previous_month_last_day, identity_columns, TRANSFER_MAX_GAP_DAYS if max_gap_days is None else max_gap_days)
+    show_employee_metrics(pipeline.metrics, selected_month_str)
+    if identity_columns:
+        show_transfers(pipeline.transfers, previous_month)
+    if timeline_months:
+        pipeline.build_timeline(selected_month_str, int(timeline_months), previous_month_last_day)
+        show_headcount_timeline(pipeline.timeline)
+    output = io.BytesIO()
+    pipeline.write(output)
+
+    download_excel_file(output.getvalue())
 
 
 def run_excel_analysis():
     """ Streamlit UI에서 사용자의 입력을 받고 엑셀 병합 및 분석을 실행하는 함수 """
     st.subheader(" 엑셀 병합 및 인원 분석")
 
+    # ✅ 날짜 정보 / 분석 대상 컬럼 (import 시점이 아니라 실행할 때마다 계산 - 서버를 오래 띄워도 전월 기준이 맞음)
+    _, previous_month, previous_month_last_day = get_date_info()
+    date_columns, _ = get_analysis_settings()
+
     # 시트 정렬 순서 가져오기
     sheet_order = get_sheet_order()
 
@@ -376,12 +776,36 @@ def run_excel_analysis():
     # ✅ 개인정보 보호 설정 (추출할 키워드 입력)# 추출할 키워드 리스트 가져오기
     include_columns = get_include_columns()
 
+    # ✅ 월별 인원 추이 분석 기간
+    timeline_months = get_timeline_settings()
+
+    # ✅ 명부 스냅샷 저장 여부
+    save_snapshots = get_snapshot_settings()
+
+    # ✅ 전월 스냅샷 대비 명부 변경 내역 (사원 식별 키)
+    diff_key_columns = get_snapshot_diff_settings()
+
+    # ✅ 계열사 간 이동 구분 (그룹 전체 사원 식별 컬럼, 최대 공백 일수)
+    transfer_settings = get_transfer_settings()
+
     # ✅ 다중 엑셀 파일 업로드 # 엑셀 파일 업로드 함수 호출
     uploaded_files = upload_excel_files()
 
     if uploaded_files:
         # ✅ # 전체 엑셀 처리 함수 호출 (한 번에 실행)
-        process_excel_files(uploaded_files, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, delete_keywords, include_columns)
+        process_excel_files(uploaded_files, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, delete_keywords, include_columns, timeline_months, save_snapshots, diff_key_columns, transfer_settings)
+    else:
+        # ✅ 업로드가 없으면 저장된 기준 월 스냅샷으로 분석 (엑셀 파싱 없음)
+        store = RosterSnapshotStore()
+        affiliates = store.affiliates(selected_month_str)
+        if affiliates:
+            st.info(f"📦 {selected_month_str} 스냅샷이 저장되어 있습니다: {', '.join(affiliates)}")
+            if st.button("📦 저장된 스냅샷으로 분석"):
+                process_snapshot_month(store, selected_month_str, previous_month, previous_month_last_day, date_columns, sheet_order, timeline_months, transfer_settings)
+
+    # ✅ 파싱 캐시 현황 표시
+    show_cache_stats(get_workbook_cache())
+    show_temp_usage(get_temp_manager())
 
 if __name__ == "__main__":
     # Streamlit UI 실행 함수 호출
@@ -1,13 +1,22 @@
-import os
-import pandas as pd
+import io
 import streamlit as st
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import NamedStyle, Font, Border, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-from datetime import datetime, timedelta
-import tempfile
-import shutil
-import time
+from openpyxl import load_workbook
+from openpyxl.styles import Font, Border, Alignment, PatternFill
+from openpyxl.utils import column_index_from_string
+from openpyxl.cell import Cell, WriteOnlyCell
+from datetime import datetime
+from copy import copy
+from excel_stream_writer import StreamingWorkbookWriter
+from excel_cache import get_workbook_cache, show_cache_stats
+from temp_files import get_temp_manager, show_temp_usage
+from upload_ingest import ingest_uploads, upload_key, source_name, source_data
+from background_jobs import report_progress, submit_session_job, wait_for_job
+from parallel_ingest import parse_files
+from insurance_validation import validate_premiums, summarize_validation
+from insurance_reconcile import reconcile_premiums, summarize_reconciliation, changed_rows, NEW, LOST, UNEXPLAINED
+from xlsx_reader import open_workbook
+import reporting
+import stage_metrics
 
 def upload_insurance_files():
     """ Streamlit UI에서 4대보험 데이터 엑셀 파일을 업로드하는 함수 """
@@ -17,123 +26,321 @@ def upload_insurance_files():
         accept_multiple_files=True
     )
 
-def save_uploaded_insurance_files(uploaded_files):
-    """ 업로드된 4대보험 엑셀 파일을 임시 폴더에 저장하는 함수 """
-    temp_dir = tempfile.mkdtemp()
-    merged_excel_path = os.path.join(temp_dir, "merged_insurance_data.xlsx")  # 병합 파일 경로
-    
-    file_paths = []
-    for uploaded_file in uploaded_files:
-        file_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.read())
-        file_paths.append(file_path)
+def get_reconcile_settings():
+    """ Streamlit UI에서 월별 파일을 전월과 대사할지 입력받는 함수 """
+    st.sidebar.subheader("🔁 전월 대비 보험료 대사")
+    return st.sidebar.checkbox(
+        "월별 보험료를 전월과 사원별로 대사", value=False,
+        help="시트명(또는 파일명)의 적용 월로 달을 구분하여 보험료 증감, 신규 취득/상실 인원, 요율표로 설명되지 않는 변동을 찾습니다.",
+    )
 
-    return temp_dir, merged_excel_path, file_paths 
+class InsuranceSheet:
+    """ 프로세스 풀에서 읽은 4대보험 시트 (값 + 스타일 번호 + 열 너비/행 높이/병합 셀, 프로세스 간 전달 가능) """
 
-def merge_insurance_files(file_paths):
-    """ 여러 개의 4대보험 엑셀 파일을 병합하고 서식을 유지하는 함수 """
-    
-    # 📌 병합을 위한 새로운 워크북 생성
-    merged_wb = Workbook()
-    merged_wb.remove(merged_wb.active)  # 기본 시트 제거
+    def __init__(self, title, column_widths, row_heights, merged_ranges, rows, styles):
+        self.title = title
+        self.column_widths = column_widths  # 열 번호(1부터) -> 너비
+        self.row_heights = row_heights  # 행 번호 -> 높이
+        self.merged_ranges = merged_ranges  # 병합 셀 범위 문자열 목록 (예: "A1:C1")
+        self.rows = rows  # 행별 (값, 스타일 번호, 데이터 타입) 목록
+        self.styles = styles  # 스타일 번호 -> (font, fill, border, alignment) - 같은 파일의 시트끼리 공유
+
+def read_insurance_workbook(file_path):
+    """ 4대보험 엑셀 파일의 시트별 값과 서식을 읽는 함수 (프로세스 풀에서 실행되므로 pickle 가능한 값만 반환) """
+    source_wb = load_workbook(file_path, data_only=False)  # 수식 유지
+    sheets = []
+    style_ids = {}  # 원본 스타일 배열 -> 스타일 번호 (같은 서식은 한 번만 복사, 워크북의 모든 시트가 공유)
+    styles = []
+
+    for source_ws in source_wb.worksheets:
+        rows = []
+
+        for row in source_ws.iter_rows():
+            new_row = []
+            for cell in row:
+                style_key = tuple(cell._style or ())  # 병합된 셀은 스타일 배열이 없음 (기본 서식)
+                style_id = style_ids.get(style_key)
+                if style_id is None:
+                    style_id = style_ids[style_key] = len(styles)
+                    # copy()로 StyleProxy를 실제 Font/PatternFill/Border/Alignment 객체로 풀어서 저장 (프로세스 간 전달 가능)
+                    styles.append((copy(cell.font), copy(cell.fill), copy(cell.border), copy(cell.alignment)))
+                new_row.append((cell.value, style_id, cell.data_type))
+            rows.append(new_row)
+
+        sheets.append(InsuranceSheet(
+            title=source_ws.title,
+            column_widths={
+                column_index_from_string(col): dim.width
+                for col, dim in source_ws.column_dimensions.items() if dim.width
+            },
+            row_heights={row: dim.height for row, dim in source_ws.row_dimensions.items() if dim.height},
+            merged_ranges=[str(merged_cell) for merged_cell in source_ws.merged_cells.ranges],
+            rows=rows,
+            styles=styles,
+        ))
+
+    return sheets
+
+class InsuranceStyleCopier:
+    """
+    원본 파일의 스타일 번호마다 대상 워크북 스타일을 한 번만 만들어 재사용하는 스타일 복사기
+    셀마다 Font / PatternFill / Border / Alignment를 새로 만들지 않고 미리 만든 스타일 배열을 붙임
+    """
+
+    def __init__(self, source_styles):
+        self.source_styles = source_styles  # 스타일 번호 -> (font, fill, border, alignment)
+        self._target_styles = {}  # (스타일 번호, 1000단위 쉼표 여부) -> 대상 워크북 스타일 배열
+
+    def _build_style(self, ws, style_id, is_number):
+        """ 원본 스타일을 대상 워크북에 등록하고 스타일 배열을 반환 """
+        font, fill, border, alignment = self.source_styles[style_id]
+        template = WriteOnlyCell(ws)
+
+        # ✅ 스타일 복사 (서식 유지) + 텍스트 검정색 적용
+        if font:
+            template.font = Font(
+                name=font.name,
+                size=font.size,
+                bold=font.bold,
+                italic=font.italic,
+                underline=font.underline,
+                strike=font.strike,
+                color="000000"  # 모든 텍스트를 검정색으로 설정
+            )
+        if isinstance(fill, PatternFill):  # ✅ 배경색 유지 (copy()로 풀어 둔 PatternFill이므로 원본 배경색이 그대로 복사됨)
+            template.fill = PatternFill(
+                fill_type=fill.fill_type,
+                fgColor=fill.fgColor,
+                bgColor=fill.bgColor
+            )
+        if border:
+            template.border = Border(
+                left=border.left,
+                right=border.right,
+                top=border.top,
+                bottom=border.bottom
+            )
+        if alignment:
+            template.alignment = Alignment(
+                horizontal=alignment.horizontal,
+                vertical=alignment.vertical,
+                wrap_text=alignment.wrap_text
+            )
+
+        # ✅ 1000단위 쉼표 적용 (숫자인 경우만)
+        if is_number:
+            template.number_format = "#,##0"  # 1000 단위 콤마 적용
+        return template._style
+
+    def make_cell(self, ws, value, style_id, data_type):
+        """ 값과 원본 스타일 번호로 스타일이 적용된 셀 생성 (수식 또는 값 복사) """
+        is_number = isinstance(value, (int, float)) and data_type != "f"  # 수식이 아닌 숫자만 적용
+        style_key = (style_id, is_number)
+        style = self._target_styles.get(style_key)
+        if style is None:
+            style = self._target_styles[style_key] = self._build_style(ws, style_id, is_number)
+        return Cell(ws, row=1, column=1, value=value, style_array=style)
 
-    if not file_paths:  # 📌 업로드된 파일이 없는 경우 처리
-        st.error("❌ 업로드된 4대보험 데이터 파일이 없습니다.")
+def merge_insurance_files(files, workers=None):
+    """
+    여러 개의 4대보험 엑셀 파일(파일 경로 또는 수집한 업로드)을 병합하고 서식을 유지하는 함수
+    파일 읽기는 프로세스 풀에서 병렬로 처리 (workers: 워커 수, 0/1이면 직렬)
+    """
+
+    if not files:  # 📌 업로드된 파일이 없는 경우 처리
+        reporting.error("❌ 업로드된 4대보험 데이터 파일이 없습니다.")
         return None
 
-    for file_path in file_paths:
-        try:
-            source_wb = load_workbook(file_path, data_only=False)  # 수식 유지
-
-            for sheet_name in source_wb.sheetnames:
-                source_ws = source_wb[sheet_name]
-
-                # ✅ 이미 존재하는 시트가 있으면 덮어쓰기
-                if sheet_name in merged_wb.sheetnames:
-                    merged_wb.remove(merged_wb[sheet_name])
-
-                new_ws = merged_wb.create_sheet(title=sheet_name)
-
-                # ✅ 열 너비 유지
-                for col in source_ws.column_dimensions:
-                    new_ws.column_dimensions[col].width = source_ws.column_dimensions[col].width
-
-                # ✅ 행 높이 유지
-                for row in source_ws.row_dimensions:
-                    new_ws.row_dimensions[row].height = source_ws.row_dimensions[row].height
-
-                # ✅ 원본 시트 데이터를 복사 (수식 + 서식 유지 + 검정색 텍스트 적용)
-                for row in source_ws.iter_rows():
-                    for cell in row:
-                        new_cell = new_ws[cell.coordinate]
-                        new_cell.value = cell.value  # 수식 또는 값 복사
-
-                        # ✅ 스타일 복사 (서식 유지) + 텍스트 검정색 적용
-                        if cell.font:
-                            new_cell.font = Font(
-                                name=cell.font.name,
-                                size=cell.font.size,
-                                bold=cell.font.bold,
-                                italic=cell.font.italic,
-                                underline=cell.font.underline,
-                                strike=cell.font.strike,
-                                color="000000"  # 모든 텍스트를 검정색으로 설정
-                            )
-                        if isinstance(cell.fill, PatternFill):  # ✅ 배경색 유지
-                            new_cell.fill = PatternFill(
-                                fill_type=cell.fill.fill_type,
-                                fgColor=cell.fill.fgColor,
-                                bgColor=cell.fill.bgColor
-                            )
-                        if cell.border:
-                            new_cell.border = Border(
-                                left=cell.border.left,
-                                right=cell.border.right,
-                                top=cell.border.top,
-                                bottom=cell.border.bottom
-                            )
-                        if cell.alignment:
-                            new_cell.alignment = Alignment(
-                                horizontal=cell.alignment.horizontal,
-                                vertical=cell.alignment.vertical,
-                                wrap_text=cell.alignment.wrap_text
-                            )
-
-                        # ✅ 1000단위 쉼표 적용 (숫자인 경우만)
-                        if isinstance(cell.value, (int, float)) and cell.data_type != "f":  # 수식이 아닌 숫자만 적용
-                            new_cell.number_format = "#,##0"  # 1000 단위 콤마 적용
-
-                # ✅ 원본 병합된 셀 유지
-                for merged_cell in source_ws.merged_cells.ranges:
-                    new_ws.merge_cells(str(merged_cell))
-
-        except Exception as e:
-            st.error(f"❌ 파일 `{os.path.basename(file_path)}` 처리 중 오류 발생: {e}")
-        
-    return merged_wb  # 📌 `Workbook` 객체 반환
+    # 📌 병합을 위한 스트리밍 워크북 생성 (행 단위로 기록하여 메모리 사용량 일정)
+    merged_wb = StreamingWorkbookWriter()
+
+    with stage_metrics.stage("파일 읽기") as record:
+        results = parse_files([source_data(file) for file in files], read_insurance_workbook, (), workers)
+        for result in results:
+            for source_ws in result.value or []:
+                record.count(rows=len(source_ws.rows), cells=sum(len(row) for row in source_ws.rows))
+
+    # ✅ 이미 존재하는 시트는 나중 파일로 덮어쓰기 (스트리밍 기록은 삭제가 불가하므로 미리 결정)
+    sheet_owners = {}
+    for file_idx, result in enumerate(results):
+        for source_ws in result.value or []:
+            if source_ws.title in sheet_owners:
+                reporting.warning(f"⚠️ 시트 `{source_ws.title}`이(가) 여러 파일에 있어 `{source_name(files[file_idx])}`의 시트만 병합합니다.")
+            sheet_owners[source_ws.title] = file_idx
+
+    with stage_metrics.stage("서식 복사") as record:
+        copied = 0
+        for file_idx, (file, result) in enumerate(zip(files, results)):
+            try:
+                if not result.ok:
+                    raise RuntimeError(result.error)
+
+                # ✅ 같은 파일의 시트는 스타일 표를 공유하므로 복사기도 파일마다 하나 (대상 스타일 배열을 파일당 한 번만 생성)
+                style_copier = InsuranceStyleCopier(result.value[0].styles) if result.value else None
+
+                for source_ws in result.value:
+                    if sheet_owners[source_ws.title] != file_idx:
+                        continue
+
+                    # ✅ 열 너비 / 행 높이 유지 (행을 쓰기 전에 선언)
+                    new_ws = merged_wb.add_sheet(source_ws.title, column_widths=source_ws.column_widths, row_heights=source_ws.row_heights)
+
+                    # ✅ 원본 시트 데이터를 복사 (수식 + 서식 유지 + 검정색 텍스트 적용)
+                    for row in source_ws.rows:
+                        new_ws.append_cells([style_copier.make_cell(new_ws.ws, value, style_id, data_type) for value, style_id, data_type in row])
+                    record.count(rows=len(source_ws.rows), cells=sum(len(row) for row in source_ws.rows))
+
+                    # ✅ 원본 병합된 셀 유지
+                    for merged_range in source_ws.merged_ranges:
+                        new_ws.merge_cells(merged_range)
+
+                    copied += 1
+                    report_progress(copied, len(sheet_owners), f"시트 복사: {source_ws.title}")
+
+            except Exception as e:
+                reporting.error(f"❌ 파일 `{source_name(file)}` 처리 중 오류 발생: {e}")
+
+    return merged_wb  # 📌 `StreamingWorkbookWriter` 객체 반환 (save로 저장)
         
     
+def build_merged_insurance_data(files):
+    """ 4대보험 파일을 병합하고, 병합된 엑셀의 바이트를 반환하는 함수 (디스크에 기록하지 않음) """
+    merged_wb = merge_insurance_files(files)
+    if merged_wb is None:
+        return None
+
+    output = io.BytesIO()
+    with stage_metrics.stage("엑셀 저장"):
+        merged_wb.save(output)  # 📌 병합된 엑셀 저장
+    return output.getvalue()
+
 # ✅ 다운로드 버튼 생성
-def download_merged_insurance_file(merged_wb, merged_excel_path, temp_dir):
+def download_merged_insurance_file(merged_data):
     """ 병합된 4대보험 데이터를 다운로드할 수 있도록 제공하는 함수 """
-    if merged_wb is None:
+    if merged_data is None:
         return  # 병합된 파일이 없으면 실행 중지
 
-    merged_wb.save(merged_excel_path)  # 📌 병합된 엑셀 저장
+    st.download_button(
+        label="📥 병합된 4대보험 데이터 다운로드",
+        data=merged_data,
+        file_name="merged_insurance_data.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
-    with open(merged_excel_path, "rb") as file:
-        st.download_button(
-            label="📥 병합된 4대보험 데이터 다운로드",
-            data=file,
-            file_name="merged_insurance_data.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+    st.caption("🔒 업로드 및 병합 파일은 서버에 보관하지 않고 자동 삭제됩니다.")
+
+def build_premium_validation(merged_data, default_month_code):
+    """ 병합된 4대보험 엑셀의 모든 시트를 읽어 요율표 기준으로 보험료를 재계산/검증하는 함수 """
+    if merged_data is None:
+        return None
+    with stage_metrics.stage("보험료 검증") as record:
+        with open_workbook(io.BytesIO(merged_data)) as reader:  # header=None으로 읽은 시트별 DataFrame
+            sheets = reader.read_frames()
+        report = validate_premiums(sheets, default_month_code)
+        record.count(*stage_metrics.count_frame_cells(sheets.values()))
+    return report
+
+def read_premium_frames(file_path):
+    """ 파일의 모든 시트를 header=None DataFrame으로 읽는 함수 (프로세스 풀에서 실행) """
+    with open_workbook(file_path) as reader:
+        return reader.read_frames()
+
+def build_premium_reconciliation(files, default_month_code, workers=None):
+    """
+    파일별로 읽은 월별 보험료를 사원 키로 전월과 대사하는 함수 (병합 엑셀이 아니라 원본 파일을 읽어 같은 시트명도 모두 사용)
+    반환값: 사원별 대사 결과 DataFrame (전월과 비교할 달이 없으면 None)
+    """
+    with stage_metrics.stage("전월 대비 대사") as record:
+        results = parse_files([source_data(file) for file in files], read_premium_frames, (), workers)
+        workbooks = []
+        for file, result in zip(files, results):
+            if result.ok:
+                workbooks.append((source_name(file), result.value))
+                record.count(*stage_metrics.count_frame_cells(result.value.values()))
+            else:
+                reporting.error(f"❌ 파일 `{source_name(file)}` 대사 중 오류 발생: {result.error}")
+
+        reconciliation, replaced = reconcile_premiums(workbooks, default_month_code)
+        for file_name, sheet_name in replaced:
+            reporting.warning(f"⚠️ `{file_name}`의 시트 `{sheet_name}`은(는) 같은 계열사/월 시트가 뒤에 있어 대사에서 제외합니다.")
+    return reconciliation
+
+def write_reconciliation_sheets(writer, reconciliation):
+    """ 대사 결과(변동 없음 제외)와 (계열사, 기준월)별 요약 시트를 추가하는 함수 """
+    writer.add_sheet("전월대비_대사").write_dataframe(changed_rows(reconciliation))
+    writer.add_sheet("대사_요약").write_dataframe(summarize_reconciliation(reconciliation).reset_index())
+
+def build_insurance_outputs(uploaded_files, cache, default_month_code, reconcile=False, temp_manager=None):
+    """
+    (백그라운드 작업) 업로드 수집 → 병합 → 보험료 검증 (→ 전월 대비 대사)
+    업로드 내용이 같으면 병합/검증/대사 결과를 캐시에서 재사용 (파일별 경고/오류도 함께 저장하여 다시 표시)
+    cache / temp_manager: 스크립트 스레드에서 구한 WorkbookCache / 임시 파일 관리자
+    반환값: (병합 엑셀 바이트, 검증 결과, 대사 결과)
+    """
+    # ✅ 업로드 버퍼에서 바로 읽음 (큰 파일만 디스크에 기록, 같은 내용의 파일은 한 번만)
+    with stage_metrics.stage("업로드 수집"):
+        uploads = ingest_uploads(uploaded_files, manager=temp_manager)
 
-    # ✅ 일정 시간 후 자동 삭제
-    time.sleep(10)
-    shutil.rmtree(temp_dir)  
-    st.warning("🔒 다운로드 후 10초가 지나 파일이 자동 삭제되었습니다.")
+    cache_key = ("insurance_merged", tuple(source.digest for source in uploads.sources))
+    reconciliation = None
+    try:
+        merged_data = cache.get_or_compute_reported(cache_key, lambda: build_merged_insurance_data(uploads.sources))
+        if reconcile:
+            reconcile_key = ("insurance_reconcile",) + cache_key[1:] + (default_month_code,)
+            reconciliation = cache.get_or_compute_reported(reconcile_key, lambda: build_premium_reconciliation(uploads.sources, default_month_code))
+    finally:
+        uploads.release()  # ✅ 병합이 끝나면 디스크에 기록한 업로드는 바로 삭제 대상으로 표시 (백그라운드에서 삭제)
+
+    # ✅ 요율표 기준 보험료 재계산 검증
+    validation_key = ("insurance_validation",) + cache_key[1:] + (default_month_code,)
+    report = cache.get_or_compute_reported(validation_key, lambda: build_premium_validation(merged_data, default_month_code))
+    return merged_data, report, reconciliation
+
+def show_premium_validation(report):
+    """ 보험료 검증 결과를 시트별 요약과 불일치 사원 목록으로 표시하는 함수 """
+    st.subheader("🔍 4대보험료 검증 결과")
+    if report is None:
+        st.info("ℹ️ '보수월액' 컬럼이 있는 시트를 찾지 못해 보험료 검증을 건너뜁니다.")
+        return
+
+    mismatches = report[report["검증결과"] == "불일치"]
+    st.write(f"검증 인원: {len(report)}명, 불일치 인원: {len(mismatches)}명 (요율 버전: {', '.join(report['요율버전'].unique())})")
+    st.dataframe(summarize_validation(report))
+
+    if mismatches.empty:
+        st.success("✅ 모든 보험료가 요율표 기준 계산액과 일치합니다.")
+    else:
+        st.warning("⚠️ 신고 보험료와 계산액이 다른 사원이 있습니다.")
+        st.dataframe(mismatches)
+
+def show_reconciliation(reconciliation):
+    """ 전월 대비 대사 결과를 (계열사, 기준월)별 요약과 미설명 변동 사원 목록으로 표시하고 리포트를 내려받게 하는 함수 """
+    st.subheader("🔁 전월 대비 보험료 대사")
+    if reconciliation is None:
+        st.info("ℹ️ 같은 계열사의 연속된 두 달 시트가 없어 대사를 건너뜁니다. (시트명 또는 파일명에 'YYYY-MM' 형식으로 적용 월 표기)")
+        return
+
+    status = reconciliation["구분"]
+    st.write(f"대사 인원: {len(reconciliation)}명, 신규 취득: {(status == NEW).sum()}명, 상실: {(status == LOST).sum()}명, 미설명 변동: {(status == UNEXPLAINED).sum()}명")
+    st.dataframe(summarize_reconciliation(reconciliation))
+
+    unexplained = reconciliation[status == UNEXPLAINED]
+    if unexplained.empty:
+        st.success("✅ 모든 보험료 증감이 보수월액/요율 변경으로 설명됩니다.")
+    else:
+        st.warning("⚠️ 보수월액/요율 변경으로 설명되지 않는 보험료 증감이 있습니다.")
+        st.dataframe(unexplained, hide_index=True)
+
+    writer = StreamingWorkbookWriter()
+    write_reconciliation_sheets(writer, reconciliation)
+    output = io.BytesIO()
+    writer.save(output)
+    st.download_button(
+        label="📥 전월 대비 대사 리포트 다운로드",
+        data=output.getvalue(),
+        file_name="insurance_reconciliation.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
 # ✅ 4대보험 검증 시스템 실행
 def run_insurance_analysis():
@@ -141,12 +348,26 @@ def run_insurance_analysis():
     st.subheader("4대보험료 검증 시스템")
 
     uploaded_insurance_files = upload_insurance_files()
+    reconcile = get_reconcile_settings()
 
     if uploaded_insurance_files:
-        temp_dir, merged_excel_path, file_paths = save_uploaded_insurance_files(uploaded_insurance_files)
-
-        merged_wb = merge_insurance_files(file_paths)
-
-        download_merged_insurance_file(merged_wb, merged_excel_path, temp_dir)
-
+        # ✅ 병합/검증은 백그라운드 작업으로 실행 (시트명에 적용 월이 없으면 이번 달 요율 적용)
+        # 같은 업로드/기준 월이면 재실행 시 다시 처리하지 않고 진행 중인 작업을 계속 표시
+        # 작업 스레드에는 Streamlit 실행 컨텍스트가 없으므로 캐시/임시 파일 관리자는 여기서 구해 넘김
+        cache, temp_manager = get_workbook_cache(), get_temp_manager()
+        today = datetime.today()
+        default_month_code = today.year * 12 + today.month
+        submit_session_job(
+            "insurance", (upload_key(uploaded_insurance_files), default_month_code, reconcile), "4대보험 병합·검증",
+            build_insurance_outputs, uploaded_insurance_files, cache, default_month_code, reconcile, temp_manager,
+        )
+        job = wait_for_job("insurance")
+        if job is not None:
+            merged_data, report, reconciliation = job.result
+            show_premium_validation(report)
+            if reconcile:
+                show_reconciliation(reconciliation)
+            download_merged_insurance_file(merged_data)
 
+        show_cache_stats(cache)
+        show_temp_usage(temp_manager)
@@ -1,7 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
-from openpyxl import load_workbook
+import os
+from openpyxl.worksheet.dimensions import SheetFormatProperties
+from excel_stream_writer import StreamingWorkbookWriter, unique_sheet_name
+from excel_cache import get_workbook_cache, settings_key, show_cache_stats
+from parallel_ingest import parse_files
+from upload_ingest import ingest_uploads, source_name, source_data, source_digest
+from roster_schema import compact_sheets
+from xlsx_reader import open_workbook
+import reporting
+import stage_metrics
+
+# ✅ 형식이 섞인 열의 너비를 추정할 때 사용할 표본 값 수 (숫자/날짜/문자열 열은 전체 값으로 계산) - 환경변수로 조정 가능
+WIDTH_SAMPLE_ROWS = int(os.environ.get("EXCEL_WIDTH_SAMPLE_ROWS", "2000"))
+
+# 새 워크북의 기본 행 높이 (이 높이의 행은 복사하지 않음)
+DEFAULT_ROW_HEIGHT = SheetFormatProperties().defaultRowHeight
 
 def upload_excel_files():
     """ Streamlit UI에서 다중 엑셀 파일을 업로드하는 함수 """
@@ -27,69 +43,233 @@ def get_include_columns():
     
     return include_columns
 
-def merge_excel_files(uploaded_files, delete_keywords, include_columns):
-    """ 업로드된 다수의 엑셀 파일을 하나의 파일로 병합 """
+class SheetData:
+    """ 한 번의 워크북 로드로 읽은 시트의 값과 서식 정보 (열 너비, 행 높이, 숫자 표기법) """
+
+    def __init__(self, name, df, source_columns, column_widths, row_heights, column_formats, number_formats):
+        self.name = name
+        self.df = df
+        self.source_columns = source_columns  # df 각 컬럼의 원본 열 번호 (0부터)
+        self.column_widths = column_widths  # 원본 열 번호 -> 최대 글자 수
+        self.row_heights = row_heights  # 행 번호 -> 높이 (기본 높이가 아닌 행만)
+        self.column_formats = column_formats  # 원본 열 번호 -> 열에서 가장 많이 쓰인 숫자/날짜 표기법
+        self.number_formats = number_formats  # (데이터 행 위치(0부터), 원본 열 번호) -> 열 표기법과 다른 셀의 표기법
+
+def make_unique_columns(headers):
+    """ pandas.read_excel과 동일하게 빈 컬럼명은 'Unnamed: n', 중복 컬럼명은 '.1', '.2'를 붙여 구분하는 함수 """
+    columns = []
+    seen = {}
+    for idx, header in enumerate(headers):
+        name = f"Unnamed: {idx}" if header is None else header
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def split_number_formats(reader, format_ids, has_value):
+    """
+    열 하나의 셀별 표기법 번호(reader.number_format으로 조회)를 (열 표기법, {데이터 행 위치: 다른 표기법}) 으로 나누는 함수
+    값이 있는 셀에서 가장 많이 쓰인 표기법을 열 표기법으로 사용하고, 다른 셀만 예외로 남김 (열 전체가 같으면 예외 없음)
+    """
+    present = format_ids[has_value]
+    if not present.size:
+        return None, {}
+    ids, counts = np.unique(present, return_counts=True)
+    column_id = ids[counts.argmax()]
+    exceptions = np.flatnonzero(has_value & (format_ids != column_id))
+    column_format = reader.number_format(int(column_id))
+    return (
+        None if column_format == "General" else column_format,
+        {int(row): reader.number_format(int(format_ids[row])) for row in exceptions},
+    )
+
+def text_width(value):
+    """ 셀 값의 글자 수 (비어 있거나 0/False인 값은 0) """
+    return len(str(value)) if value else 0
+
+def column_text_width(series, sample_rows=WIDTH_SAMPLE_ROWS):
+    """
+    열 값의 최대 글자 수를 셀 반복 없이 열 단위로 계산하는 함수 (셀마다 len(str(값))을 구한 것과 같은 값)
+    형식이 섞인 열은 sample_rows개 값의 표본으로 추정
+    """
+    values = series.dropna()
+    if values.empty:
+        return 0
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.remove_unused_categories().cat.categories.to_series()  # 고유값만 계산
+    if pd.api.types.is_bool_dtype(values):
+        return len(str(True)) if values.any() else 0
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return len(str(values.iloc[0].to_pydatetime().replace(microsecond=1 if (values.dt.microsecond != 0).any() else 0)))
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = values[values != 0]
+        if numbers.empty:
+            return 0
+        if pd.api.types.is_integer_dtype(numbers):
+            return max(len(str(numbers.max())), len(str(numbers.min())))
+        # 원본의 정수 값은 결측값 때문에 float로 읽히므로 '.0' 없이 계산
+        widths = numbers.astype(str).str.len()
+        integral = (numbers == np.floor(numbers)) & (numbers.abs() < 1e16)
+        return int((widths - 2 * integral).max())
+    if pd.api.types.infer_dtype(values, skipna=True) == "string":
+        return int(values.str.len().max())
+
+    if len(values) > sample_rows:
+        values = values.iloc[np.linspace(0, len(values) - 1, sample_rows).astype(int)]
+    return max(map(text_width, values), default=0)
+
+def read_sheet_data(reader, sheet_name, delete_keywords, include_columns):
+    """
+    시트 하나의 값과 서식 정보를 읽고 추출/삭제 컬럼 설정을 적용하는 함수 (첫 번째 행을 컬럼명으로 사용)
+    서식은 셀 단위가 아니라 열 단위로 계산 (열 너비는 DataFrame 열에서, 표기법은 열별 대표 표기법 + 다른 셀만 예외)
+    """
+    sheet = reader.read_sheet(sheet_name, formats=True)
+    values, format_ids = sheet.rows, sheet.format_keys
+
+    # 마지막의 빈 행 제거 (pandas.read_excel과 동일)
+    while values and all(value is None for value in values[-1]):
+        values.pop()
+        format_ids.pop()
+
+    # 행 길이를 가장 긴 행에 맞춤 (빈 셀은 값 없음, 표기법 General)
+    row_length = max(map(len, values), default=0)
+    for row_values, row_formats in zip(values, format_ids):
+        if len(row_values) < row_length:
+            row_values.extend([None] * (row_length - len(row_values)))
+            row_formats.extend([0] * (row_length - len(row_formats)))
+
+    if values:
+        columns = make_unique_columns(values[0])
+        sheet_df = pd.DataFrame(values[1:], columns=columns)
+    else:
+        columns = []
+        sheet_df = pd.DataFrame()
+
+    # 사용자가 지정한 컬럼만 추출
+    source_columns = list(range(len(columns)))
+    if include_columns:
+        source_columns = [idx for idx in source_columns if columns[idx] in include_columns]
+
+    # 키워드에 해당하는 컬럼 삭제
+    source_columns = [idx for idx in source_columns if not any(keyword in str(columns[idx]) for keyword in delete_keywords)]
+    sheet_df = sheet_df.iloc[:, source_columns]
+
+    # ✅ 열 너비: 헤더와 열 값의 최대 글자 수 / 표기법: 열 표기법 + 다른 셀만 예외로 기록
+    column_widths, column_formats, number_formats = {}, {}, {}
+    format_ids = np.array(format_ids[1:], dtype=np.int64).reshape(len(sheet_df), len(columns))
+    has_value = sheet_df.notna().to_numpy()
+    for position, idx in enumerate(source_columns):
+        width = max(text_width(values[0][idx]), column_text_width(sheet_df.iloc[:, position]))
+        if width:
+            column_widths[idx] = width
+        column_format, exceptions = split_number_formats(reader, format_ids[:, idx], has_value[:, position])
+        if column_format:
+            column_formats[idx] = column_format
+        number_formats.update(((row, idx), fmt) for row, fmt in exceptions.items())
+
+    return SheetData(
+        name=sheet_name,
+        df=sheet_df,
+        source_columns=source_columns,
+        column_widths=column_widths,
+        row_heights={idx: height for idx, height in sheet.row_heights.items() if height != DEFAULT_ROW_HEIGHT},
+        column_formats=column_formats,
+        number_formats=number_formats,
+    )
+
+def read_workbook_sheets(file, delete_keywords, include_columns):
+    """ 엑셀 파일을 한 번만 읽어 시트별 값과 서식 정보를 반환하는 함수 (xlsx_reader.READER_BACKEND) """
+    with open_workbook(file, formats=True) as reader:  # ✅ 파일당 한 번만 읽음 (값 + 표기법 + 행 높이)
+        return {
+            sheet_name: read_sheet_data(reader, sheet_name, delete_keywords, include_columns)
+            for sheet_name in reader.sheet_names
+        }
+
+def make_sheet_name(file_name, sheet_name, sheet_count, used_names):
+    """
+    병합 파일의 시트명을 생성하는 함수
+    시트가 하나면 파일명, 여러 개면 '파일명_시트명' (31자 제한, 중복 시 번호 추가)
+    """
+    base_name = file_name if sheet_count == 1 else f"{file_name}_{sheet_name}"
+    return unique_sheet_name(base_name, used_names)
+
+def merge_excel_files(uploaded_files, delete_keywords, include_columns, workers=None, cache=None):
+    """
+    업로드된 다수의 엑셀 파일(수집한 업로드 또는 파일 경로)을 하나의 파일로 병합
+    cache: 사용할 WorkbookCache (None이면 Streamlit 전역 캐시)
+    """
     output = io.BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        for file in uploaded_files:
-            file_name = file.name.split('.')[0]  # 파일명에서 확장자 제거
-            xls = pd.ExcelFile(file, engine='openpyxl')  # openpyxl로 엑셀 파일 로드
-            
-            for sheet_name in xls.sheet_names:
-                sheet_df = pd.read_excel(xls, sheet_name=sheet_name, engine='openpyxl')
-                
-                # 사용자가 지정한 컬럼만 추출
-                if include_columns:
-                    columns_to_include = [col for col in sheet_df.columns if col in include_columns]
-                    sheet_df = sheet_df[columns_to_include]
-
-                # 키워드에 해당하는 컬럼 삭제
-                columns_to_delete = [col for col in sheet_df.columns if any(keyword in col for keyword in delete_keywords)]
-                sheet_df.drop(columns=columns_to_delete, inplace=True, errors='ignore')
-
-                # 엑셀 파일의 서식을 복사하기 위한 작업
-                wb = load_workbook(file)
-                sheet = wb[sheet_name]
-                
-                new_sheet_name = f"{file_name}"  # 파일명_원래시트명 형식
-                sheet_df.to_excel(writer, sheet_name=new_sheet_name, index=False)
-                
-                # 시트의 열 너비, 행 높이, 숫자 표기법, 날짜 표기법 복사
-                worksheet = writer.sheets[new_sheet_name]
-                
-                # 열 너비 자동 조정
-                for col in sheet.columns:
-                    column = col[0].column_letter  # 열 번호 (A, B, C, ...)
-                    max_length = 0
-                    for cell in col:
-                        try:
-                            if cell.value:
-                                max_length = max(max_length, len(str(cell.value)))
-                        except:
-                            pass
-                    adjusted_width = (max_length + 2)  # 여유 공간을 위해 2 추가
-                    worksheet.column_dimensions[column].width = adjusted_width
-                
-                # 행 높이 복사
-                for row in sheet.iter_rows():
-                    row_height = sheet.row_dimensions[row[0].row].height
-                    worksheet.row_dimensions[row[0].row].height = row_height
-                
-                # 숫자 표기법 및 날짜 표기법 복사
-                for row in sheet.iter_rows():
-                    for cell in row:
-                        new_cell = worksheet[cell.coordinate]
-                        if cell.number_format:
-                            new_cell.number_format = cell.number_format
 
+    # ✅ 파일 내용 해시 + 컬럼 설정 기준 캐시 (재실행 시 다시 파싱하지 않음)
+    cache = cache if cache is not None else get_workbook_cache()
+    parse_settings = settings_key(header="first_row", delete_keywords=delete_keywords, include_columns=include_columns)
+    used_names = set()  # 시트명 중복 방지 (엑셀은 대소문자 구분 없음)
+
+    # ✅ write-only 워크북으로 행 단위 기록 (행 수와 관계없이 메모리 사용량 일정)
+    writer = StreamingWorkbookWriter()
+
+    # ✅ 캐시에 없는 파일만 프로세스 풀에서 병렬 파싱 (결과는 업로드 순서대로 기록)
+    with stage_metrics.stage("파일 파싱") as record:
+        digests = [source_digest(file) for file in uploaded_files]
+        file_sheets = [cache.get_sheets(digest, parse_settings) for digest in digests]
+        missing = [idx for idx, sheets in enumerate(file_sheets) if sheets is None]
+        results = parse_files([source_data(uploaded_files[idx]) for idx in missing], read_workbook_sheets, (delete_keywords, include_columns), workers)
+
+        # ✅ 반복 문자열은 categorical, 정수는 작은 정수형으로 압축한 뒤 캐시에 저장 (기록되는 값은 같음)
+        with stage_metrics.stage("형식 압축") as compact_record:
+            for idx, result in zip(missing, results):
+                if result.ok:
+                    frames = compact_sheets({sheet_name: sheet_data.df for sheet_name, sheet_data in result.value.items()}, compact_record)
+                    for sheet_name, sheet_data in result.value.items():
+                        sheet_data.df = frames[sheet_name]
+                    file_sheets[idx] = cache.put_sheets(digests[idx], parse_settings, result.value)
+                else:
+                    reporting.error(f"❌ 파일 `{source_name(uploaded_files[idx])}` 처리 중 오류 발생: {result.error}")
+        record.count(*stage_metrics.count_frame_cells(sheet_data.df for sheets in file_sheets if sheets for sheet_data in sheets.values()))
+
+    with stage_metrics.stage("시트 기록") as record:
+        for file, sheets in zip(uploaded_files, file_sheets):
+            if sheets is None:
+                continue  # 파싱에 실패한 파일은 건너뜀
+            file_name = source_name(file).split('.')[0]  # 파일명에서 확장자 제거
+
+            for sheet_name, sheet_data in sheets.items():
+                new_sheet_name = make_sheet_name(file_name, sheet_name, len(sheets), used_names)
+                target_columns = {source_idx: target_idx for target_idx, source_idx in enumerate(sheet_data.source_columns, start=1)}
+
+                # 열 너비 자동 조정 (원본 열 위치 -> 추출 후 열 위치로 매핑) 및 행 높이 복사 - 행을 쓰기 전에 선언
+                column_widths = {
+                    target_idx: sheet_data.column_widths.get(source_idx, 0) + 2  # 여유 공간을 위해 2 추가
+                    for source_idx, target_idx in target_columns.items()
+                }
+                # 숫자 표기법 및 날짜 표기법은 열 단위로 복사하고, 열 표기법과 다른 셀만 행별로 모아서 복사
+                copied_formats = {target_columns[source_idx]: fmt for source_idx, fmt in sheet_data.column_formats.items()}
+                sheet = writer.add_sheet(
+                    new_sheet_name, column_widths=column_widths, row_heights=sheet_data.row_heights, copied_formats=copied_formats,
+                )
+
+                row_formats = {}
+                for (position, source_idx), number_format in sheet_data.number_formats.items():
+                    row_formats.setdefault(position + 2, {})[target_columns[source_idx]] = number_format  # 헤더 다음 행부터
+
+                sheet.write_header(sheet_data.df.columns)
+                for row_idx, values in enumerate(sheet_data.df.itertuples(index=False, name=None), start=2):
+                    sheet.append(values, row_formats.get(row_idx))
+                record.count(rows=len(sheet_data.df), cells=sheet_data.df.size)
+
+    with stage_metrics.stage("엑셀 저장"):
+        writer.save(output)
     output.seek(0)
     return output
 
 def run_excel_merge():
     """ Streamlit에서 엑셀 병합 기능 실행 """
     st.title("엑셀 파일 병합기")
-    st.write("다수의 엑셀 파일을 업로드하여 하나의 파일로 병합합니다. 각 파일의 내용은 파일명과 동일한 시트명으로 저장됩니다.")
+    st.write("다수의 엑셀 파일을 업로드하여 하나의 파일로 병합합니다. 각 파일의 내용은 파일명과 동일한 시트명으로 저장되며, 시트가 여러 개인 파일은 '파일명_시트명'으로 저장됩니다.")
 
     include_columns = get_include_columns()  # 추출할 컬럼만 입력 받기
     delete_keywords = get_delete_keywords()
@@ -101,8 +281,10 @@ def run_excel_merge():
     
     st.success(f"{len(uploaded_files)}개의 파일이 업로드되었습니다.")  # 업로드된 파일 개수 확인
     
-    # 병합된 엑셀 파일 생성
-    merged_file = merge_excel_files(uploaded_files, delete_keywords, include_columns)
+    # 병합된 엑셀 파일 생성 (업로드 버퍼에서 바로 파싱, 큰 파일만 디스크에 기록 / 같은 내용의 파일은 한 번만)
+    uploads = ingest_uploads(uploaded_files)
+    merged_file = merge_excel_files(uploads.sources, delete_keywords, include_columns)
+    uploads.release()
 
     # 다운로드 버튼 추가
     st.download_button(
@@ -112,3 +294,6 @@ def run_excel_merge():
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
+    # ✅ 파싱 캐시 현황 표시
+    show_cache_stats(get_workbook_cache())
+
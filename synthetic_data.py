@@ -0,0 +1,250 @@
+"""
+벤치마크/재현용 합성 엑셀 생성기 (같은 seed면 항상 같은 파일)
+
+- 인원 명부: 계열사명(DEFAULT_SHEET_ORDER) 파일, 제목 행 아래 "No" 헤더 행
+  국문 형식(성명/입사일/퇴사일/사원구분명/부서명/직급명) 또는 영문 형식(Starting Date/Contract Type/Remark)
+- 4대보험: 제목 병합 셀 + 서식이 지정된 헤더/본문 + 합계 수식 행, 보험료는 요율표로 계산 (일부 행은 일부러 틀리게 기록)
+  계열사별 인원은 한 번 만들고 다음 달로 이어 가며, 월마다 일부만 취득/상실/보수 변경
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Font, Border, Side, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+
+from excel_stream_writer import StreamingWorkbookWriter
+from insurance_validation import compute_expected_premiums, parse_rate_month
+
+# ✅ 영문 형식 명부를 사용하는 계열사
+ENGLISH_AFFILIATES = {"BAMC"}
+
+LAST_NAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+FIRST_NAME_PARTS = list("민서지현준우예도하윤수진영성재은유태경호")
+ENGLISH_LAST_NAMES = ["KIM", "LEE", "PARK", "CHOI", "JUNG", "KANG", "CHO", "YOON", "JANG", "LIM"]
+ENGLISH_FIRST_NAMES = ["MIN JUN", "SEO YEON", "JI HO", "HYUN WOO", "YE JIN", "DO YUN", "HA EUN", "SU BIN", "JAE WON", "EUN JI"]
+DEPARTMENTS = ["영업1팀", "영업2팀", "서비스팀", "부품팀", "재무팀", "인사팀", "마케팅팀", "IT팀"]
+POSITIONS = ["사원", "주임", "대리", "과장", "차장", "부장", "이사"]
+EMPLOYEE_TYPES = ["정규직", "계약직", "파견직", "임원"]
+EMPLOYEE_TYPE_WEIGHTS = [0.7, 0.2, 0.07, 0.03]
+
+ROSTER_HEADERS = ["No", "성명", "주민번호", "입사일", "퇴사일", "사원구분명", "부서명", "직급명", "연봉"]
+ENGLISH_ROSTER_HEADERS = ["No", "English Name", "성명", "Starting Date", "Contract Type", "부서명", "직급명", "Remark", "연봉"]
+INSURANCE_HEADERS = ["No", "성명", "부서명", "보수월액", "국민연금", "건강보험", "장기요양보험", "고용보험", "근로자부담계"]
+
+# 퇴사자 / 보험료 오기재 비율
+EXIT_RATE = 0.2
+PREMIUM_ERROR_RATE = 0.01
+
+# 4대보험 월별 취득 / 상실 / 보수 변경 비율 (전월 인원 대비)
+INSURANCE_HIRE_RATE = 0.03
+INSURANCE_EXIT_RATE = 0.03
+WAGE_CHANGE_RATE = 0.1
+
+def korean_names(rng, count):
+    """ 무작위 한글 이름 배열 """
+    last = np.array(LAST_NAMES)[rng.integers(len(LAST_NAMES), size=count)]
+    first = np.array(FIRST_NAME_PARTS)[rng.integers(len(FIRST_NAME_PARTS), size=(count, 2))]
+    return np.char.add(last, np.char.add(first[:, 0], first[:, 1]))
+
+def month_start(month_str):
+    """ 'YYYY-MM' 문자열의 1일 """
+    return datetime.strptime(month_str, "%Y-%m")
+
+def random_dates(rng, start, end, count):
+    """ start ~ end 사이의 무작위 날짜(datetime) 목록 """
+    days = rng.integers(0, max((end - start).days, 1), size=count)
+    dates = np.datetime64(start.date()) + days.astype("timedelta64[D]")
+    return dates.astype("datetime64[s]").astype(datetime)  # 초 단위로 바꿔야 date가 아닌 datetime으로 변환됨
+
+def roster_rows(rng, rows, reference_month, english=False):
+    """
+    명부 본문 행 목록 생성 (입사일은 기준 월 이전 10년 ~ 기준 월 말, 약 EXIT_RATE 비율은 퇴사 처리)
+    영문 형식은 퇴사 여부를 Remark("Resigned and last working day ...")로 표기
+    """
+    reference = month_start(reference_month)
+    first_day = reference.replace(year=reference.year - 10)
+    month_end = reference.replace(year=reference.year + (reference.month == 12), month=reference.month % 12 + 1)
+
+    hires = random_dates(rng, first_day, month_end, rows)
+    exited = rng.random(rows) < EXIT_RATE
+    exits = [random_dates(rng, hire, month_end, 1)[0] if is_exited and hire < month_end else None for hire, is_exited in zip(hires, exited)]
+    names = korean_names(rng, rows)
+    types = np.array(EMPLOYEE_TYPES)[rng.choice(len(EMPLOYEE_TYPES), size=rows, p=EMPLOYEE_TYPE_WEIGHTS)]
+    departments = np.array(DEPARTMENTS)[rng.integers(len(DEPARTMENTS), size=rows)]
+    positions = np.array(POSITIONS)[rng.integers(len(POSITIONS), size=rows)]
+    salaries = rng.integers(30, 150, size=rows) * 1_000_000
+
+    if not english:
+        birth = rng.integers(700101, 991231, size=rows)
+        return [
+            [idx + 1, str(names[idx]), f"{birth[idx]}-*******", hires[idx], exits[idx], str(types[idx]), str(departments[idx]), str(positions[idx]), int(salaries[idx])]
+            for idx in range(rows)
+        ]
+
+    english_names = np.char.add(
+        np.array(ENGLISH_LAST_NAMES)[rng.integers(len(ENGLISH_LAST_NAMES), size=rows)],
+        np.char.add(" ", np.array(ENGLISH_FIRST_NAMES)[rng.integers(len(ENGLISH_FIRST_NAMES), size=rows)]),
+    )
+    contracts = np.where(types == "계약직", "FDC", "UDC")
+    return [
+        [
+            idx + 1, str(english_names[idx]), str(names[idx]), hires[idx], str(contracts[idx]), str(departments[idx]), str(positions[idx]),
+            f"Resigned and last working day {exits[idx]:%Y-%m-%d}" if exits[idx] is not None else None,
+            int(salaries[idx]),
+        ]
+        for idx in range(rows)
+    ]
+
+def write_roster_workbook(path, rows, reference_month, english=False):
+    """ 제목 행 + 빈 행 + "No" 헤더 행 + 본문 형식의 명부 파일 저장 (시트명 = 파일명) """
+    headers = ENGLISH_ROSTER_HEADERS if english else ROSTER_HEADERS
+    date_format = {headers.index(name) + 1: "yyyy-mm-dd" for name in ("입사일", "퇴사일", "Starting Date") if name in headers}
+
+    writer = StreamingWorkbookWriter()
+    affiliate = os.path.splitext(os.path.basename(path))[0]
+    sheet = writer.add_sheet(affiliate[:31], column_widths={idx + 1: 14 for idx in range(len(headers))}, column_formats=date_format)
+    sheet.append([f"{affiliate} 인원 현황 ({reference_month})"])
+    sheet.append([])
+    sheet.write_header(headers)
+    for row in rows:
+        sheet.append(row)
+    writer.save(path)
+    return path
+
+def generate_roster_files(directory, total_rows, seed=0, reference_month="2025-01", affiliates=None):
+    """
+    계열사별 명부 파일을 생성하고 경로 목록을 반환 (전체 행 수를 계열사 수로 나눠 배분)
+    affiliates: 파일로 만들 계열사 목록 (None이면 DEFAULT_SHEET_ORDER 전체)
+    """
+    from streamlit_app_HR import DEFAULT_SHEET_ORDER
+
+    affiliates = list(affiliates or DEFAULT_SHEET_ORDER)
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    paths = []
+    for idx, affiliate in enumerate(affiliates):
+        rows = total_rows // len(affiliates) + (idx < total_rows % len(affiliates))
+        english = affiliate in ENGLISH_AFFILIATES
+        path = os.path.join(directory, f"{affiliate}.xlsx")
+        paths.append(write_roster_workbook(path, roster_rows(rng, rows, reference_month, english), reference_month, english))
+    return paths
+
+
+class InsuranceStyles:
+    """ 4대보험 시트용 스타일 (셀마다 스타일 객체를 만들지 않도록 스타일 배열을 한 번만 등록) """
+
+    def __init__(self, ws):
+        thin = Side(style="thin")
+        border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        self.ws = ws
+        self.title = self._style(font=Font(name="맑은 고딕", size=14, bold=True), alignment=Alignment(horizontal="center"))
+        self.header = self._style(
+            font=Font(name="맑은 고딕", bold=True, color="FFFFFF"),
+            fill=PatternFill(fill_type="solid", fgColor="4F81BD"),
+            border=border,
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        )
+        self.text = self._style(font=Font(name="맑은 고딕", color="1F1F1F"), border=border)
+        self.number = self._style(font=Font(name="맑은 고딕", color="1F1F1F"), border=border, alignment=Alignment(horizontal="right"))
+        self.total = self._style(font=Font(name="맑은 고딕", bold=True), fill=PatternFill(fill_type="solid", fgColor="D9D9D9"), border=border)
+
+    def _style(self, font=None, fill=None, border=None, alignment=None):
+        template = WriteOnlyCell(self.ws)
+        for name, value in (("font", font), ("fill", fill), ("border", border), ("alignment", alignment)):
+            if value is not None:
+                setattr(template, name, value)
+        return template._style
+
+    def cell(self, value, style):
+        return Cell(self.ws, row=1, column=1, value=value, style_array=style)
+
+def insurance_workforce(rng, rows):
+    """ 4대보험 대상 인원 {"성명", "부서명", "보수월액"} 배열 생성 """
+    return {
+        "성명": korean_names(rng, rows),
+        "부서명": np.array(DEPARTMENTS)[rng.integers(len(DEPARTMENTS), size=rows)],
+        "보수월액": rng.integers(200, 1200, size=rows) * 10_000 + rng.integers(0, 10, size=rows) * 1_000,
+    }
+
+def next_month_workforce(rng, workforce, hire_rate=INSURANCE_HIRE_RATE, exit_rate=INSURANCE_EXIT_RATE, wage_change_rate=WAGE_CHANGE_RATE):
+    """
+    전월 인원에서 다음 달 인원 생성 (순서 유지)
+    exit_rate 비율은 상실, wage_change_rate 비율은 보수월액 변경, 전월 인원의 hire_rate 비율만큼 신규 취득을 뒤에 추가
+    """
+    rows = len(workforce["성명"])
+    stay = rng.random(rows) >= exit_rate
+    wages = workforce["보수월액"].copy()
+    changed = rng.random(rows) < wage_change_rate
+    wages[changed] += rng.integers(1, 50, size=int(changed.sum())) * 10_000
+    hires = insurance_workforce(rng, rng.binomial(rows, hire_rate))
+    return {
+        "성명": np.concatenate([workforce["성명"][stay], hires["성명"]]),
+        "부서명": np.concatenate([workforce["부서명"][stay], hires["부서명"]]),
+        "보수월액": np.concatenate([wages[stay], hires["보수월액"]]),
+    }
+
+def insurance_rows(rng, workforce, month_code, error_rate=PREMIUM_ERROR_RATE):
+    """ 인원별 보험료 본문 값 목록 생성 (요율표 기준 계산액, error_rate 비율의 행은 국민연금을 1,000원 더 기재) """
+    names, departments, wages = workforce["성명"], workforce["부서명"], workforce["보수월액"]
+    rows = len(names)
+    premiums = compute_expected_premiums(wages, np.full(rows, month_code))
+    premiums.loc[rng.random(rows) < error_rate, "국민연금"] += 1000
+    values = premiums[["국민연금", "건강보험", "장기요양보험", "고용보험"]].to_numpy(dtype=np.int64)
+    return [
+        [idx + 1, str(names[idx]), str(departments[idx]), int(wages[idx]), *(int(value) for value in values[idx])]
+        for idx in range(rows)
+    ]
+
+def write_insurance_sheet(writer, title, rows):
+    """ 제목(병합) + 헤더 + 본문 + 합계 수식 행 형식의 4대보험 시트 기록 (행별 근로자부담계도 수식) """
+    column_count = len(INSURANCE_HEADERS)
+    widths = {1: 6, 2: 10, 3: 12, **{idx: 13 for idx in range(4, column_count + 1)}}
+    sheet = writer.add_sheet(title, column_widths=widths, row_heights={1: 28, 3: 32})
+    styles = InsuranceStyles(sheet.ws)
+    last_col = get_column_letter(column_count)
+
+    sheet.append_cells([styles.cell(f"{title} 4대보험 공제 내역", styles.title)])
+    sheet.append([])
+    sheet.append_cells([styles.cell(header, styles.header) for header in INSURANCE_HEADERS])
+    for row_idx, row in enumerate(rows, start=4):
+        cells = [styles.cell(value, styles.number if isinstance(value, int) else styles.text) for value in row]
+        cells.append(styles.cell(f"=SUM(E{row_idx}:H{row_idx})", styles.number))
+        sheet.append_cells(cells)
+
+    end_row = len(rows) + 3
+    total = [styles.cell(None, styles.total), styles.cell("합계", styles.total), styles.cell(None, styles.total)]
+    total += [styles.cell(f"=SUM({get_column_letter(col)}4:{get_column_letter(col)}{end_row})", styles.total) for col in range(4, column_count + 1)]
+    sheet.append_cells(total)
+    sheet.merge_cells(f"A1:{last_col}1")
+
+def generate_insurance_files(directory, total_rows, seed=0, months=("2025-06", "2025-07"), affiliates=None, error_rate=PREMIUM_ERROR_RATE, month_only_sheets=False):
+    """
+    계열사별 4대보험 파일(월별 시트)을 생성하고 경로 목록을 반환
+    시트명은 "계열사 YYYY-MM" (요율 적용 월을 시트명에서 찾을 수 있도록)
+    계열사 인원은 첫 달에 전체 행 수를 시트 수로 나눈 만큼 만들고, 다음 달부터는 next_month_workforce로 이어 감
+    affiliates: None이면 DEFAULT_SHEET_ORDER 앞 3개 계열사
+    month_only_sheets: True면 시트명을 "YYYY-MM"만 사용 (계열사는 파일명으로만 구분)
+    """
+    from streamlit_app_HR import DEFAULT_SHEET_ORDER
+
+    affiliates = list(affiliates or DEFAULT_SHEET_ORDER[:3])
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    sheet_count = len(affiliates) * len(months)
+
+    paths = []
+    for idx, affiliate in enumerate(affiliates):
+        writer = StreamingWorkbookWriter()
+        workforce = insurance_workforce(rng, total_rows // sheet_count + (idx < total_rows % sheet_count))
+        for month_idx, month in enumerate(months):
+            if month_idx:
+                workforce = next_month_workforce(rng, workforce)
+            title = month if month_only_sheets else f"{affiliate[:20]} {month}"
+            write_insurance_sheet(writer, title, insurance_rows(rng, workforce, parse_rate_month(month), error_rate))
+        path = os.path.join(directory, f"{affiliate}_4대보험.xlsx")
+        writer.save(path)
+        paths.append(path)
+    return paths
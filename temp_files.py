@@ -0,0 +1,147 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+
+import streamlit as st
+
+# ✅ 임시 파일 보관 위치 / 보관 시간(초) / 정리 주기(초) - 환경변수로 조정 가능
+TEMP_ROOT = os.environ.get("EXCEL_TEMP_ROOT", os.path.join(tempfile.gettempdir(), "excel_tools"))
+DEFAULT_TEMP_TTL_SECONDS = int(os.environ.get("EXCEL_TEMP_TTL_SECONDS", "600"))
+SWEEP_INTERVAL_SECONDS = int(os.environ.get("EXCEL_TEMP_SWEEP_SECONDS", "60"))
+
+def path_size(path):
+    """ 파일 또는 폴더 전체의 크기(바이트)를 계산하는 함수 """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    total = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                total += os.path.getsize(os.path.join(dir_path, file_name))
+            except OSError:
+                pass  # 정리 중 삭제된 파일
+    return total
+
+def remove_path(path):
+    """ 파일 또는 폴더를 삭제하는 함수 (이미 없으면 무시) """
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class TempFileManager:
+    """
+    업로드/결과 임시 파일을 보관 시간(TTL)과 함께 등록하고 백그라운드 스레드에서 삭제하는 관리자
+    요청 처리 중에는 대기하지 않으며, 등록되지 않은 오래된 파일(이전 실행에서 남은 파일)도 함께 정리함
+    """
+
+    def __init__(self, root=TEMP_ROOT, ttl=DEFAULT_TEMP_TTL_SECONDS, interval=SWEEP_INTERVAL_SECONDS):
+        self.root = root
+        self.ttl = ttl
+        self.interval = interval
+        self.removed = 0
+        self._expires = {}  # 경로 -> 삭제 시각 (time.time 기준)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        os.makedirs(self.root, exist_ok=True)
+        self.sweep()  # ✅ 시작 시 이전 실행에서 남은 파일 정리
+
+        self._thread = threading.Thread(target=self._run, name="temp-file-cleanup", daemon=True)
+        self._thread.start()
+
+    def make_temp_dir(self, prefix="upload_", ttl=None):
+        """ 관리 폴더 아래에 임시 폴더를 만들고 보관 시간과 함께 등록 """
+        path = tempfile.mkdtemp(prefix=prefix, dir=self.root)
+        return self.register(path, ttl)
+
+    def register(self, path, ttl=None):
+        """ 임시 파일/폴더를 등록 (ttl초 후 삭제) """
+        with self._lock:
+            self._expires[os.path.abspath(path)] = time.time() + (self.ttl if ttl is None else ttl)
+        return path
+
+    def release(self, path):
+        """ 더 이상 필요 없는 임시 파일/폴더를 즉시 삭제 대상으로 표시 (삭제는 백그라운드에서 수행) """
+        self.register(path, ttl=0)
+        self._wakeup.set()
+
+    def sweep(self, now=None):
+        """ 보관 시간이 지난 등록 항목과 관리 폴더 안의 오래된 미등록 항목을 삭제 """
+        now = time.time() if now is None else now
+
+        with self._lock:
+            expired = [path for path, expires in self._expires.items() if expires <= now]
+            for path in expired:
+                del self._expires[path]
+            registered = set(self._expires)
+
+        # 관리 폴더 안의 미등록 항목은 마지막 수정 시각 기준으로 판단
+        try:
+            entries = [os.path.join(self.root, name) for name in os.listdir(self.root)]
+        except FileNotFoundError:
+            os.makedirs(self.root, exist_ok=True)
+            entries = []
+        for path in entries:
+            path = os.path.abspath(path)
+            if path in registered or path in expired:
+                continue
+            try:
+                if os.path.getmtime(path) + self.ttl <= now:
+                    expired.append(path)
+            except OSError:
+                pass
+
+        for path in expired:
+            remove_path(path)
+        self.removed += len(expired)
+        return len(expired)
+
+    def _run(self):
+        """ 백그라운드 정리 루프 (release 호출 시 즉시, 그 외에는 주기적으로 실행) """
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.sweep()
+            except Exception:
+                pass  # 정리 실패는 다음 주기에 다시 시도
+
+    def stop(self):
+        """ 백그라운드 정리 중지 """
+        self._stopped.set()
+        self._wakeup.set()
+
+    def disk_usage(self):
+        """ 관리 중인 임시 파일의 개수와 사용량(바이트) 반환 """
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            names = []
+        return {
+            "entries": len(names),
+            "used_bytes": sum(path_size(os.path.join(self.root, name)) for name in names),
+            "removed": self.removed,
+        }
+
+
+@st.cache_resource
+def get_temp_manager():
+    """ Streamlit 재실행(rerun) 간에 유지되는 전역 임시 파일 관리자 반환 """
+    return TempFileManager()
+
+def show_temp_usage(manager):
+    """ Streamlit 사이드바에 임시 파일 사용량을 표시하는 함수 """
+    usage = manager.disk_usage()
+    st.sidebar.caption(
+        f"🧹 임시 파일: {usage['entries']}개 · {usage['used_bytes'] / 1024 / 1024:.1f}MB "
+        f"(보관 {manager.ttl // 60}분, 정리 {usage['removed']}건)"
+    )
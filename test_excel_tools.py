@@ -0,0 +1,213 @@
+"""
+synthetic_data 생성기로 만든 파일 기반 회귀 테스트 (python -m pytest -q)
+
+- native / openpyxl 리더 결과 일치
+- 추출 컬럼 지정 / 리스트 컬럼이 없는 명부 분석
+- 스냅샷 경로 분석 지표 = 전체 분석 지표, 전월 스냅샷 비교 결과
+- 계열사 간 이동: 동명이인 구분
+- 전월 대비 보험료 대사: 월 표기만 있는 시트명, 취득/상실은 일부만
+- 단계별 측정: 최상위 단계 구분, 로그 파일은 지정한 경우에만 기록
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import stage_metrics
+import streamlit_app_HR as hr
+from excel_cache import WorkbookCache
+from insurance_reconcile import LOST, NEW, reconcile_premiums
+from insurance_validation import parse_rate_month
+from roster_snapshots import RosterSnapshotStore
+from synthetic_data import generate_insurance_files, generate_roster_files
+from transfer_index import find_transfers, has_discriminating_column
+from xlsx_reader import NativeXlsxReader, OpenpyxlReader
+
+
+@pytest.fixture(scope="module")
+def roster_files(tmp_path_factory):
+    return generate_roster_files(str(tmp_path_factory.mktemp("rosters")), 1500, reference_month="2025-01")
+
+@pytest.fixture(scope="module")
+def insurance_files(tmp_path_factory):
+    return generate_insurance_files(str(tmp_path_factory.mktemp("insurance")), 600)
+
+def new_pipeline(delete_keywords=(), include_columns=()):
+    date_columns, _ = hr.get_analysis_settings()
+    return hr.EmployeeAnalysisPipeline(hr.DEFAULT_SHEET_ORDER, list(delete_keywords), list(include_columns), date_columns, 0, WorkbookCache())
+
+def trimmed(rows):
+    """ 행 끝의 빈 셀과 끝의 빈 행 제거 (openpyxl은 시트 범위까지 빈 셀을 채움) """
+    rows = [list(row) for row in rows]
+    for row in rows:
+        while row and row[-1] is None:
+            row.pop()
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def test_native_reader_matches_openpyxl(roster_files, insurance_files):
+    for path in [*roster_files, *insurance_files]:
+        with NativeXlsxReader(path) as native, OpenpyxlReader(path, formats=True) as fallback:
+            assert native.sheet_names == fallback.sheet_names
+            native_frames, fallback_frames = native.read_frames(), fallback.read_frames()
+            for sheet_name in native.sheet_names:
+                pd.testing.assert_frame_equal(native_frames[sheet_name], fallback_frames[sheet_name])
+
+                expected, actual = fallback.read_sheet(sheet_name, formats=True), native.read_sheet(sheet_name, formats=True)
+                assert trimmed(actual.rows) == trimmed(expected.rows)
+                for native_keys, fallback_keys in zip(actual.format_keys, expected.format_keys):
+                    native_formats = [native.number_format(key) for key in native_keys]
+                    assert native_formats == [fallback.number_format(key) for key in fallback_keys][:len(native_formats)]
+
+
+def test_analysis_with_default_include_columns(roster_files):
+    # 화면의 기본 추출 컬럼("성명, 입사일, 퇴사일")을 지정해도 입사자/퇴사자 리스트와 지표는 전체 컬럼 분석과 같음
+    full, projected = new_pipeline(), new_pipeline(include_columns=["성명", "입사일", "퇴사일"])
+    for pipeline in (full, projected):
+        pipeline.load(list(roster_files))
+        pipeline.analyze("2025-01", "2024-12", "2024-12-31")
+    assert projected.metrics == full.metrics
+    assert full.resigned is not None and list(full.resigned.columns) == [*hr.EMPLOYEE_LIST_COLUMNS, "시트명"]
+    for expected, actual in [(full.new_hires, projected.new_hires), (full.resigned, projected.resigned)]:
+        assert (expected is None and actual is None) or actual.equals(expected)
+
+    # 리스트 컬럼(부서명/직급명)이 없는 명부도 오류 없이 분석 (리스트는 없음)
+    missing = new_pipeline(delete_keywords=["부서명", "직급명"])
+    missing.load(list(roster_files))
+    missing.analyze("2025-01", "2024-12", "2024-12-31")
+    assert missing.metrics == full.metrics
+    assert missing.new_hires is None and missing.resigned is None
+
+
+def test_snapshot_analysis_matches_full_analysis(roster_files, tmp_path):
+    # 증분 집계(incremental_counts)는 제거됨 - 스냅샷 경로의 지표가 전체 분석과 같고, 스냅샷 비교는 지표를 바꾸지 않는지 확인
+    store = RosterSnapshotStore(str(tmp_path))
+    full = new_pipeline()
+    full.load(list(roster_files))
+    full.save_snapshots(store, "2025-01", "2024-12-31")
+
+    # 전월 스냅샷: 첫 시트의 마지막 사원이 없고, 둘째 시트의 한 사원 부서가 다른 명부
+    previous = new_pipeline()
+    first, second = list(full.sheets)[:2]
+    previous.sheets = dict(full.sheets)
+    previous.sheets[first] = full.sheets[first].iloc[:-1]
+    changed = full.sheets[second].copy()
+    changed["부서명"] = changed["부서명"].astype(object)
+    changed.iloc[0, changed.columns.get_loc("부서명")] = "이전부서"
+    previous.sheets[second] = changed
+    previous.save_snapshots(store, "2024-12", "2024-12-31")
+
+    full.analyze("2025-01", "2024-12", "2024-12-31")
+    snapshot = new_pipeline()
+    snapshot.load_snapshots(store, "2025-01")
+    snapshot.analyze("2025-01", "2024-12", "2024-12-31")
+    assert snapshot.metrics == full.metrics
+
+    metrics = dict(full.metrics)
+    full.compare_snapshots(store, "2025-01", "2024-12-31", ["성명", "입사일"])
+    assert full.metrics == metrics
+    assert full.diffs[first].summary()["추가"] == 1
+    assert full.diffs[second].summary()["변경"] == 1
+    assert all(diff.is_empty for sheet_name, diff in full.diffs.items() if sheet_name not in (first, second))
+
+
+def test_snapshot_keys_do_not_collide(tmp_path):
+    # safe_name으로 변환하면 같아지는 계열사명도 각자 폴더에 저장
+    store = RosterSnapshotStore(str(tmp_path))
+    store.save("A/B", "2025-01", pd.DataFrame({"성명": ["김민수"]}))
+    store.save("A B", "2025-01", pd.DataFrame({"성명": ["이서연", "박지호"]}))
+    assert sorted(store.affiliates("2025-01")) == ["A B", "A/B"]
+    assert store.load("A/B", "2025-01")[0]["성명"].tolist() == ["김민수"]
+    assert len(store.load("A B", "2025-01")[0]) == 2
+
+
+def test_find_transfers_keeps_homonyms_apart():
+    sheets = ["A사", "A사", "B사", "B사"]
+    frame = pd.DataFrame({
+        "시트명": pd.Categorical(sheets, categories=["A사", "B사"]),
+        "성명": ["김민수", "이서연", "김 민수", "이서연"],
+        "생년월일": ["1990-01-01", "1985-05-05", "1992-03-03", "1985-05-05"],
+        "입사일": pd.to_datetime(["2020-01-01", "2019-01-01", "2025-01-10", "2025-01-20"]),
+        "퇴사일": pd.to_datetime(["2025-01-05", "2025-01-15", None, None]),
+    })
+
+    # 이름만으로는 동명이인(생년월일이 다른 김민수)도 이동으로 분류됨 - 구분 컬럼이 없다는 경고 대상
+    name_only = find_transfers(frame, ["성명"])
+    assert len(name_only) == 2
+    assert not has_discriminating_column(frame, ["성명"])
+
+    transfers = find_transfers(frame, ["성명", "생년월일"])
+    assert has_discriminating_column(frame, ["성명", "생년월일"])
+    assert list(transfers.out_rows) == [1] and list(transfers.in_rows) == [3]
+    assert transfers.to_frame()[["성명", "전출 계열사", "전입 계열사"]].values.tolist() == [["이서연", "A사", "B사"]]
+
+
+def test_reconcile_premiums_with_month_only_sheet_names(tmp_path):
+    def workbooks(paths):
+        return [(os.path.basename(path), pd.read_excel(path, sheet_name=None, header=None)) for path in paths]
+
+    default_month = parse_rate_month("2025-06")
+    expected, _ = reconcile_premiums(workbooks(generate_insurance_files(str(tmp_path / "named"), 600)), default_month)
+    month_only = generate_insurance_files(str(tmp_path / "month_only"), 600, month_only_sheets=True)
+    report, replaced = reconcile_premiums(workbooks(month_only), default_month)
+
+    assert replaced == []
+    assert report["계열사"].nunique() == len(month_only)
+    assert report["구분"].isin([NEW, LOST]).mean() < 0.1  # 생성기는 인원을 다음 달로 이어 감 (취득/상실은 일부만)
+    pd.testing.assert_frame_equal(report, expected)
+
+    # 파일명에서도 계열사를 알 수 없으면 파일별로 구분하여 데이터를 버리지 않음
+    unnamed = [(f"2025-0{idx}.xlsx", sheets) for idx, (_, sheets) in enumerate(workbooks(month_only), start=1)]
+    report, replaced = reconcile_premiums(unnamed, default_month)
+    assert replaced == []
+    assert np.array_equal(report["구분"].value_counts().sort_index(), expected["구분"].value_counts().sort_index())
+
+
+def test_insurance_merge_copies_fonts_fills_and_borders(tmp_path):
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from streamlit_app_insurance import merge_insurance_files
+
+    source = Workbook()
+    ws = source.active
+    ws.title = "계열사 2025-06"
+    ws["A1"] = "성명"
+    ws["A1"].font = Font(name="맑은 고딕", size=14, bold=True, color="FF0000")
+    ws["A1"].fill = PatternFill(fill_type="solid", fgColor="FFFF00")
+    ws["A1"].border = Border(left=Side(style="thin"), bottom=Side(style="medium"))
+    ws["A1"].alignment = Alignment(horizontal="center", wrap_text=True)
+    ws["B1"] = 1234567
+    ws["B1"].fill = PatternFill(fill_type="solid", fgColor="00CCFF")
+    path = str(tmp_path / "계열사_4대보험.xlsx")
+    source.save(path)
+
+    merged = merge_insurance_files([path], workers=0)
+    output = tmp_path / "merged.xlsx"
+    merged.save(str(output))
+    title, number = load_workbook(output)["계열사 2025-06"]["A1":"B1"][0]
+
+    assert (title.font.name, title.font.size, title.font.bold, title.font.color.rgb) == ("맑은 고딕", 14, True, "00000000")  # 글자색은 검정으로 통일
+    assert (title.fill.fill_type, title.fill.fgColor.rgb) == ("solid", "00FFFF00")
+    assert (title.border.left.style, title.border.bottom.style) == ("thin", "medium")
+    assert getattr(title.border.right, "style", None) is None
+    assert (title.alignment.horizontal, title.alignment.wrap_text) == ("center", True)
+    assert (number.value, number.number_format, number.fill.fgColor.rgb) == (1234567, "#,##0", "0000CCFF")
+
+
+def test_stage_metrics_top_stages_and_log_opt_in(tmp_path):
+    with stage_metrics.recording("test") as recorder:
+        with stage_metrics.stage("outer"):
+            with stage_metrics.stage("inner") as record:
+                record.count(rows=3)
+    assert [record.name for record in recorder.records] == ["inner", "outer"]
+    assert [record.name for record in recorder.top_stages()] == ["outer"]
+
+    log_path = tmp_path / "metrics" / "stage_metrics.jsonl"
+    for _ in range(2):
+        with stage_metrics.recording("test", log_path=str(log_path)):
+            with stage_metrics.stage("only"):
+                pass
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from roster_diff import KEY_SEPARATOR, normalize_column
+
+# ✅ 계열사 간 이동으로 볼 최대 공백 일수 (이전 계열사 퇴사일 → 새 계열사 입사일) - 환경변수로 조정 가능
+TRANSFER_MAX_GAP_DAYS = int(os.environ.get("EXCEL_TRANSFER_MAX_GAP_DAYS", "31"))
+
+# ✅ 그룹 전체에서 같은 사람을 식별하는 기본 컬럼 (계열사 이동 분류는 선택 기능 - 기본 꺼짐)
+# 이름 컬럼(NAME_COLUMNS)은 값이 있는 첫 컬럼을 이름으로 사용하고, 그 외 컬럼(예: 생년월일)은 값이 모두 같아야 같은 사람
+# 📌 이름만으로는 동명이인을 구분할 수 없으므로 생년월일/사번 등 구분 컬럼을 함께 지정해야 함
+DEFAULT_IDENTITY_COLUMNS = ["성명", "English Name"]
+NAME_COLUMNS = ("성명", "English Name")
+
+# 계열사 이동 리스트 컬럼 (새 계열사 기준 사원구분/부서/직급)
+TRANSFER_LIST_COLUMNS = ["성명", "전출 계열사", "전입 계열사", "퇴사일", "입사일", "사원구분명", "부서명", "직급명"]
+
+def normalize_name(series):
+    """ 이름을 비교용 문자열로 변환 (공백 제거 + 대문자, 결측은 빈 문자열) - 컬럼 단위 변환 """
+    text = series.astype(str).str.replace(r"\s+", "", regex=True).str.upper().to_numpy(dtype=object, copy=True)
+    text[series.isna().to_numpy()] = ""
+    return text
+
+def identity_keys(frame, identity_columns=None):
+    """
+    행별 사원 식별 키 배열 (이름 + 나머지 식별 컬럼 값, 구분자로 연결)
+    식별 컬럼 중 하나라도 값이 없는 행은 빈 문자열 (이동 판별에서 제외)
+    """
+    columns = [column for column in (identity_columns or DEFAULT_IDENTITY_COLUMNS) if column in frame.columns]
+    name_columns = [column for column in columns if column in NAME_COLUMNS]
+    other_columns = [column for column in columns if column not in NAME_COLUMNS]
+    if not columns:
+        return np.full(len(frame), "", dtype=object)
+
+    parts = []
+    if name_columns:
+        names = np.full(len(frame), "", dtype=object)
+        for column in name_columns:
+            empty = names == ""
+            names[empty] = normalize_name(frame[column])[empty]
+        parts.append(names)
+    parts.extend(normalize_column(frame[column]) for column in other_columns)
+
+    keys = pd.Series(parts[0], dtype=object)
+    missing = parts[0] == ""
+    for part in parts[1:]:
+        keys = keys + KEY_SEPARATOR + part
+        missing |= part == ""
+    keys = keys.to_numpy(copy=True)
+    keys[missing] = ""
+    return keys
+
+def has_discriminating_column(frame, identity_columns=None):
+    """ 식별 컬럼 중 이름 외의 구분 컬럼(생년월일, 사번 등)이 명부에 있는지 여부 (없으면 동명이인을 구분할 수 없음) """
+    return any(column in frame.columns and column not in NAME_COLUMNS for column in (identity_columns or DEFAULT_IDENTITY_COLUMNS))
+
+def date_days(values):
+    """ 날짜 컬럼을 정수 일수 배열로 변환 (결측은 None 대신 마스크로 구분) """
+    dates = pd.to_datetime(values, errors="coerce")
+    return dates.to_numpy(dtype="datetime64[D]").astype(np.int64), dates.notna().to_numpy()
+
+
+class TransferIndex:
+    """
+    그룹 전체 명부에서 찾은 계열사 간 이동 (같은 위치끼리 한 건, 행 위치는 frame의 iloc 기준)
+    out_rows: 이전 계열사에서 퇴사한 행 (전출), in_rows: 다른 계열사에 입사한 행 (전입)
+    """
+
+    def __init__(self, frame, out_rows, in_rows):
+        self.frame = frame
+        self.out_rows = out_rows
+        self.in_rows = in_rows
+
+    def __len__(self):
+        return len(self.out_rows)
+
+    @property
+    def out_mask(self):
+        """ 전출 행 여부 (퇴사자 리스트에서 제외) """
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[self.out_rows] = True
+        return mask
+
+    @property
+    def in_mask(self):
+        """ 전입 행 여부 (입사자 리스트에서 제외) """
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[self.in_rows] = True
+        return mask
+
+    def to_frame(self, selected=None):
+        """
+        계열사 이동 리스트 (TRANSFER_LIST_COLUMNS 중 명부에 있는 컬럼)
+        selected: 이동 건별 포함 여부 (None이면 전체)
+        """
+        out_rows, in_rows = self.out_rows, self.in_rows
+        if selected is not None:
+            out_rows, in_rows = out_rows[selected], in_rows[selected]
+
+        incoming = self.frame.iloc[in_rows].reset_index(drop=True)
+        outgoing = self.frame.iloc[out_rows].reset_index(drop=True)
+        names = incoming["성명"] if "성명" in incoming.columns else pd.Series(None, index=incoming.index, dtype=object)
+        if "English Name" in incoming.columns:
+            names = names.astype(object).where(names.notna(), incoming["English Name"].astype(object))
+
+        table = pd.DataFrame({
+            "성명": names,
+            "전출 계열사": outgoing["시트명"].astype(str),
+            "전입 계열사": incoming["시트명"].astype(str),
+            "퇴사일": outgoing["퇴사일"],
+            "입사일": incoming["입사일"],
+        })
+        for column in TRANSFER_LIST_COLUMNS[5:]:
+            if column in incoming.columns:
+                table[column] = incoming[column].astype(object)
+        return table
+
+
+def find_transfers(frame, identity_columns=None, max_gap_days=TRANSFER_MAX_GAP_DAYS):
+    """
+    그룹 전체 명부(시트명, 입사일, 퇴사일 컬럼)에서 계열사 간 이동을 찾는 함수 (시트 쌍 비교 없이 한 번에 처리)
+    1. 사원 식별 키를 해시 인덱스(pd.factorize)로 정수 코드화
+    2. 퇴사/입사 기록을 (식별 코드, 날짜, 퇴사 → 입사) 순으로 한 번 정렬
+    3. 같은 사람의 퇴사 바로 다음 기록이 다른 계열사 입사이고 공백이 max_gap_days 이내면 이동으로 분류
+    반환값: TransferIndex
+    """
+    empty = np.array([], dtype=np.intp)
+    if len(frame) == 0 or not {"시트명", "입사일", "퇴사일"}.issubset(frame.columns):
+        return TransferIndex(frame, empty, empty)
+
+    keys = identity_keys(frame, identity_columns)
+    codes, _ = pd.factorize(keys)
+    identified = keys != ""
+    sheet_codes = frame["시트명"].cat.codes.to_numpy() if isinstance(frame["시트명"].dtype, pd.CategoricalDtype) else pd.factorize(frame["시트명"])[0]
+
+    exit_days, has_exit = date_days(frame["퇴사일"])
+    hire_days, has_hire = date_days(frame["입사일"])
+    exit_rows = np.flatnonzero(identified & has_exit)
+    hire_rows = np.flatnonzero(identified & has_hire)
+
+    # ✅ 퇴사(0)와 입사(1) 기록을 하나의 배열로 모아 한 번만 정렬 (같은 날이면 퇴사가 먼저)
+    rows = np.concatenate([exit_rows, hire_rows])
+    kinds = np.concatenate([np.zeros(len(exit_rows), dtype=np.int8), np.ones(len(hire_rows), dtype=np.int8)])
+    days = np.concatenate([exit_days[exit_rows], hire_days[hire_rows]])
+    order = np.lexsort((kinds, days, codes[rows]))
+    rows, kinds, days = rows[order], kinds[order], days[order]
+
+    # 이웃한 두 기록 비교: 같은 사람의 퇴사 → 다른 계열사 입사, 공백 0~max_gap_days일
+    current, following = slice(None, -1), slice(1, None)
+    is_transfer = (
+        (codes[rows[current]] == codes[rows[following]])
+        & (kinds[current] == 0) & (kinds[following] == 1)
+        & (sheet_codes[rows[current]] != sheet_codes[rows[following]])
+        & (days[following] - days[current] <= max_gap_days)
+    )
+    pairs = np.flatnonzero(is_transfer)
+    return TransferIndex(frame, rows[pairs], rows[pairs + 1])
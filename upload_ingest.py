@@ -0,0 +1,97 @@
+import os
+
+from excel_cache import file_digest
+from temp_files import get_temp_manager
+import reporting
+
+# ✅ 이 크기(MB)를 넘는 업로드만 디스크에 기록 (그 이하는 업로드 버퍼에서 바로 파싱) - 환경변수로 조정 가능
+UPLOAD_SPILL_MB = float(os.environ.get("EXCEL_UPLOAD_SPILL_MB", "64"))
+
+
+class UploadSource:
+    """
+    내용 해시로 식별되는 업로드 파일 하나
+    data: 업로드 객체(BytesIO) 그대로 또는 디스크에 기록한 파일 경로 (큰 파일)
+    """
+
+    def __init__(self, name, digest, size, data):
+        self.name = name
+        self.digest = digest
+        self.size = size
+        self.data = data
+
+    @property
+    def spilled(self):
+        return isinstance(self.data, str)
+
+
+class IngestedUploads:
+    """ 업로드 목록 (중복 내용 제외) 과 디스크 기록에 사용한 임시 폴더 """
+
+    def __init__(self, sources, temp_dir=None, duplicates=None, manager=None):
+        self.sources = sources
+        self.temp_dir = temp_dir
+        self.duplicates = duplicates or []  # (건너뛴 파일명, 같은 내용의 파일명)
+        self.manager = manager
+
+    def release(self):
+        """ 디스크에 기록한 업로드가 있으면 임시 폴더를 삭제 대상으로 표시 """
+        if self.temp_dir:
+            (self.manager or get_temp_manager()).release(self.temp_dir)
+            self.temp_dir = None
+
+
+def source_name(source):
+    """ 업로드 객체 또는 파일 경로의 파일명 """
+    return source.name if hasattr(source, "name") else os.path.basename(source)
+
+def source_data(source):
+    """ 파싱에 넘길 실제 입력 (UploadSource는 버퍼 또는 경로, 그 외는 그대로) """
+    return source.data if isinstance(source, UploadSource) else source
+
+def source_digest(source):
+    """ 내용 해시 (UploadSource는 수집할 때 계산한 값을 재사용) """
+    return source.digest if isinstance(source, UploadSource) else file_digest(source)
+
+def upload_key(uploaded_files):
+    """
+    업로드 목록 식별 키 (Streamlit 업로드 ID - 재실행 사이에 같은 업로드면 같은 값)
+    내용 해시를 계산하지 않고 기존 백그라운드 작업을 재사용할지 판단할 때 사용
+    """
+    return tuple(getattr(file, "file_id", None) or (source_name(file), getattr(file, "size", None)) for file in uploaded_files)
+
+def ingest_uploads(uploaded_files, spill_mb=UPLOAD_SPILL_MB, manager=None):
+    """
+    업로드 파일을 복사 없이 수집하는 함수
+    - 업로드 버퍼(memoryview)로 내용 해시를 계산하고, 같은 내용의 파일은 한 번만 처리 (파일명이 같아도 덮어쓰지 않음)
+    - spill_mb를 넘는 파일만 내용 해시 이름으로 임시 폴더에 기록, 나머지는 업로드 객체에서 바로 파싱
+    반환값: IngestedUploads
+    """
+    sources, by_digest, duplicates = [], {}, []
+    temp_dir = None
+
+    for uploaded_file in uploaded_files:
+        with uploaded_file.getbuffer() as buffer:
+            digest = file_digest(buffer)
+            size = buffer.nbytes
+
+            if digest in by_digest:
+                duplicates.append((uploaded_file.name, by_digest[digest].name))
+                continue
+
+            data = uploaded_file
+            if size > spill_mb * 1024 * 1024:
+                if temp_dir is None:
+                    manager = manager or get_temp_manager()
+                    temp_dir = manager.make_temp_dir()
+                data = os.path.join(temp_dir, digest[:32] + (os.path.splitext(uploaded_file.name)[1] or ".xlsx"))
+                with open(data, "wb") as f:
+                    f.write(buffer)
+
+        by_digest[digest] = UploadSource(uploaded_file.name, digest, size, data)
+        sources.append(by_digest[digest])
+
+    for name, original in duplicates:
+        reporting.warning(f"⚠️ 파일 `{name}` 은(는) `{original}` 과(와) 내용이 같아 한 번만 처리합니다.")
+
+    return IngestedUploads(sources, temp_dir, duplicates, manager)
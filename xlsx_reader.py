@@ -0,0 +1,453 @@
+import os
+import re
+import logging
+import zipfile
+import posixpath
+from datetime import datetime, timedelta, time
+from xml.etree.ElementTree import iterparse, parse, ParseError
+from xml.parsers import expat
+
+import pandas as pd
+
+# ✅ 값 읽기에 사용할 엑셀 리더 ("native": zip 안의 XML을 직접 읽는 리더, "openpyxl": 기존 openpyxl 리더) - 환경변수로 조정 가능
+READER_BACKEND = os.environ.get("EXCEL_READER_BACKEND", "native")
+
+# 시트 XML을 한 번에 읽어 파싱할 크기 (바이트)
+PARSE_CHUNK_BYTES = 1024 * 1024
+
+logger = logging.getLogger("excel_tools.reader")
+
+# 엑셀 날짜 일련번호 기준일 (1900 / 1904 날짜 체계)
+WINDOWS_EPOCH = datetime(1899, 12, 30)
+MAC_EPOCH = datetime(1904, 1, 1)
+
+# ✅ 엑셀 내장 숫자 표기법 (openpyxl.styles.numbers.BUILTIN_FORMATS와 같은 값)
+BUILTIN_NUMBER_FORMATS = {
+    0: "General", 1: "0", 2: "0.00", 3: "#,##0", 4: "#,##0.00",
+    5: '"$"#,##0_);("$"#,##0)', 6: '"$"#,##0_);[Red]("$"#,##0)',
+    7: '"$"#,##0.00_);("$"#,##0.00)', 8: '"$"#,##0.00_);[Red]("$"#,##0.00)',
+    9: "0%", 10: "0.00%", 11: "0.00E+00", 12: "# ?/?", 13: "# ??/??",
+    14: "mm-dd-yy", 15: "d-mmm-yy", 16: "d-mmm", 17: "mmm-yy", 18: "h:mm AM/PM", 19: "h:mm:ss AM/PM",
+    20: "h:mm", 21: "h:mm:ss", 22: "m/d/yy h:mm",
+    37: "#,##0_);(#,##0)", 38: "#,##0_);[Red](#,##0)", 39: "#,##0.00_);(#,##0.00)", 40: "#,##0.00_);[Red](#,##0.00)",
+    41: '_(* #,##0_);_(* \\(#,##0\\);_(* "-"_);_(@_)', 42: '_("$"* #,##0_);_("$"* \\(#,##0\\);_("$"* "-"_);_(@_)',
+    43: '_(* #,##0.00_);_(* \\(#,##0.00\\);_(* "-"??_);_(@_)', 44: '_("$"* #,##0.00_)_("$"* \\(#,##0.00\\)_("$"* "-"??_)_(@_)',
+    45: "mm:ss", 46: "[h]:mm:ss", 47: "mmss.0", 48: "##0.0E+0", 49: "@",
+}
+
+# 날짜/경과 시간 표기법 판별 (따옴표 안의 문자열과 [색상] 등은 무시, 첫 번째 구역만 확인)
+_FORMAT_STRIP_RE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+_DATE_FORMAT_RE = re.compile(r"(?<![_\\])[dmhysDMHYS]")
+_TIMEDELTA_FORMAT_RE = re.compile(r"\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?")
+
+_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+def is_date_format(fmt):
+    """ 날짜/시간 표기법 여부 """
+    if fmt is None:
+        return False
+    return _DATE_FORMAT_RE.search(_FORMAT_STRIP_RE.sub("", fmt.split(";")[0])) is not None
+
+def is_timedelta_format(fmt):
+    """ 경과 시간 표기법 여부 (예: [h]:mm:ss) """
+    return fmt is not None and _TIMEDELTA_FORMAT_RE.search(fmt.split(";")[0]) is not None
+
+def from_excel_serial(value, epoch=WINDOWS_EPOCH, as_timedelta=False):
+    """ 엑셀 날짜 일련번호를 datetime (1 미만은 time, 경과 시간 표기법은 timedelta) 으로 변환 """
+    if as_timedelta:
+        delta = timedelta(days=value)
+        if delta.microseconds:
+            delta = timedelta(seconds=delta.total_seconds() // 1, microseconds=round(delta.microseconds, -3))
+        return delta
+
+    day, fraction = divmod(value, 1)
+    diff = timedelta(milliseconds=round(fraction * 86400 * 1000))
+    if 0 <= value < 1 and diff.days == 0:
+        minutes, seconds = divmod(diff.seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return time(hours, minutes, seconds, diff.microseconds)
+    if 0 < value < 60 and epoch == WINDOWS_EPOCH:
+        day += 1  # 1900년 2월 29일(엑셀의 윤년 오류) 이전 날짜 보정
+    return epoch + timedelta(days=day) + diff
+
+_column_numbers = {}  # 열 문자 -> 열 번호 (한 번 계산한 값 재사용)
+
+def column_number(reference):
+    """ 셀 주소(예: 'AB12')의 열 번호 (1부터) """
+    letters = reference.rstrip("0123456789")
+    number = _column_numbers.get(letters)
+    if number is None:
+        number = 0
+        for letter in letters:
+            number = number * 26 + ord(letter) - 64
+        _column_numbers[letters] = number
+    return number
+
+
+class SheetRows:
+    """
+    시트 하나를 읽은 결과
+    rows: 행별 값 목록 (1행부터, 빈 행은 빈 목록 / 행 길이는 마지막 셀까지라 서로 다를 수 있음)
+    format_keys: rows와 같은 모양의 표기법 번호 (formats=True로 읽은 경우, reader.number_format으로 표기법 문자열 조회)
+    row_heights: 행 번호 -> 높이 (formats=True로 읽은 경우)
+    """
+
+    def __init__(self, title, rows, format_keys=None, row_heights=None):
+        self.title = title
+        self.rows = rows
+        self.format_keys = format_keys
+        self.row_heights = row_heights or {}
+
+
+class NativeXlsxReader:
+    """
+    표준 라이브러리만 사용하는 값 전용 xlsx 리더
+    zip 안의 시트 XML을 expat으로 행 단위로 읽고 (셀 객체를 만들지 않음), 공유 문자열과 날짜 일련번호를 변환
+    openpyxl(data_only=True)이 읽는 값과 같은 값을 반환 (수식은 마지막 계산 결과)
+    """
+
+    backend = "native"
+
+    def __init__(self, source):
+        self.archive = zipfile.ZipFile(source)
+        try:
+            self._read_workbook()
+        except Exception:
+            self.archive.close()
+            raise
+
+    def _read_xml(self, path):
+        with self.archive.open(path) as f:
+            return parse(f).getroot()
+
+    def _relationships(self, path):
+        """ part 경로의 관계 파일을 읽어 {관계 ID: (유형, 대상 경로)} 반환 """
+        folder, name = posixpath.split(path)
+        rels_path = posixpath.join(folder, "_rels", name + ".rels")
+        if rels_path not in self.archive.NameToInfo:
+            return {}
+        relationships = {}
+        for rel in self._read_xml(rels_path).iter(f"{_REL_NS}Relationship"):
+            target = rel.get("Target")
+            target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+            relationships[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target)
+        return relationships
+
+    def _read_workbook(self):
+        package = self._relationships("")
+        workbook_path = next((target for kind, target in package.values() if kind == "officeDocument"), "xl/workbook.xml")
+        workbook = self._read_xml(workbook_path)
+        self.ns = workbook.tag[:workbook.tag.index("}") + 1]  # 스프레드시트 네임스페이스 (transitional / strict)
+        ns = self.ns
+
+        properties = workbook.find(f"{ns}workbookPr")
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        self.epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+        relationships = self._relationships(workbook_path)
+        self.sheet_paths = {}
+        for sheet in workbook.iter(f"{ns}sheet"):
+            rel_id = next(value for key, value in sheet.attrib.items() if key.endswith("}id"))
+            kind, target = relationships[rel_id]
+            if kind == "worksheet":  # 차트 시트 제외 (openpyxl의 worksheets와 동일)
+                self.sheet_paths[sheet.get("name")] = target
+        self.sheet_names = list(self.sheet_paths)
+
+        parts = {kind: target for kind, target in relationships.values()}
+        self.shared_strings = self._read_shared_strings(parts.get("sharedStrings"))
+        self._read_styles(parts.get("styles"))
+
+    def _text(self, node):
+        """ 공유 문자열 요소(<si>)의 텍스트 (서식 있는 텍스트는 이어 붙이고, 윗주(rPh)는 제외) """
+        ns = self.ns
+        parts = []
+        for child in node:
+            if child.tag == f"{ns}t":
+                parts.append(child.text or "")
+            elif child.tag == f"{ns}r":
+                text = child.find(f"{ns}t")
+                if text is not None:
+                    parts.append(text.text or "")
+        return "".join(parts)
+
+    def _read_shared_strings(self, path):
+        if not path or path not in self.archive.NameToInfo:
+            return []
+        strings = []
+        tag = f"{self.ns}si"
+        with self.archive.open(path) as f:
+            for _, node in iterparse(f):
+                if node.tag == tag:
+                    strings.append(self._text(node).replace("x005F_", ""))
+                    node.clear()
+        return strings
+
+    def _read_styles(self, path):
+        """
+        셀 스타일(cellXfs)별 숫자 표기법을 읽어 날짜/경과 시간 스타일과 표기법 번호를 미리 계산
+        표기법 번호는 같은 표기법 문자열이면 같은 번호 (0 = General)
+        """
+        self.number_formats = ["General"]
+        self.style_format_keys = []
+        self.date_styles = set()
+        self.timedelta_styles = set()
+        if not path or path not in self.archive.NameToInfo:
+            return
+
+        ns = self.ns
+        styles = self._read_xml(path)
+        custom = {
+            int(fmt.get("numFmtId")): fmt.get("formatCode")
+            for fmt in styles.iterfind(f"{ns}numFmts/{ns}numFmt")
+        }
+        keys = {"General": 0}
+        for idx, xf in enumerate(styles.iterfind(f"{ns}cellXfs/{ns}xf")):
+            format_id = int(xf.get("numFmtId", 0))
+            fmt = custom[format_id] if format_id in custom else BUILTIN_NUMBER_FORMATS.get(format_id)
+            if is_date_format(fmt):
+                self.date_styles.add(idx)
+            if is_timedelta_format(fmt):
+                self.timedelta_styles.add(idx)
+            fmt = fmt or "General"
+            if fmt not in keys:
+                keys[fmt] = len(self.number_formats)
+                self.number_formats.append(fmt)
+            self.style_format_keys.append(keys[fmt])
+
+    def number_format(self, key):
+        """ 표기법 번호의 표기법 문자열 """
+        return self.number_formats[key]
+
+    def _convert(self, text, data_type, style, keep_errors):
+        """ 셀의 <v> 텍스트를 값으로 변환 (openpyxl data_only=True와 같은 변환, 빈 값은 None) """
+        if not text:
+            return None
+        if data_type == "n":
+            value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+            if style in self.date_styles:
+                try:
+                    return from_excel_serial(value, self.epoch, style in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!" if keep_errors else float("nan")
+            return value
+        if data_type == "s":
+            return self.shared_strings[int(text)]
+        if data_type == "b":
+            return bool(int(text))
+        if data_type == "e":
+            return text if keep_errors else float("nan")
+        if data_type == "d":
+            try:
+                return datetime.fromisoformat(text.rstrip("Z"))
+            except ValueError:
+                return text
+        return text  # "str" (수식의 문자열 결과)
+
+    def _iter_sheet(self, sheet_name, formats=False, row_heights=None, keep_errors=True, pad_rows=False):
+        """
+        시트 XML을 expat(SAX 방식)으로 일정 크기씩 읽으며 (값 목록, 표기법 번호 목록) 을 1행부터 순서대로 반환 (빈 행은 빈 목록)
+        요소 트리를 만들지 않으므로 시트 크기와 관계없이 메모리 사용량이 일정함
+        pad_rows: 값 목록을 시트 범위(<dimension>)의 열 수까지 빈 값으로 채움 (openpyxl read-only와 동일)
+        """
+        ns = self.ns[1:]  # expat 태그 형식: '네임스페이스}태그'
+        ROW, CELL, VALUE, INLINE, TEXT, PHONETIC, DIMENSION = (ns + tag for tag in ("row", "c", "v", "is", "t", "rPh", "dimension"))
+        shared_strings, style_keys = self.shared_strings, self.style_format_keys
+        convert = self._convert
+
+        completed = []  # 읽은 조각에서 끝난 행 (값 목록, 표기법 번호 목록)
+        row_number = column = style = width = 0
+        values = keys = reference = data_type = cell_text = inline = None
+        text = None  # 수집 중인 텍스트 조각 (None이면 수집하지 않음)
+        phonetic = False
+
+        def start(tag, attrs):
+            nonlocal row_number, column, style, width, values, keys, reference, data_type, cell_text, inline, text, phonetic
+            if tag == CELL:
+                reference, data_type, style, cell_text = attrs.get("r"), attrs.get("t", "n"), int(attrs.get("s", 0)), None
+            elif tag == VALUE:
+                text = []
+            elif tag == ROW:
+                index = int(attrs.get("r", row_number + 1))
+                while row_number + 1 < index:  # 중간의 빈 행
+                    row_number += 1
+                    completed.append(([None] * width, []))
+                row_number = index
+                if row_heights is not None and "ht" in attrs:
+                    row_heights[index] = float(attrs["ht"])
+                values, keys, column = [], [], 0
+            elif tag == INLINE:
+                inline = []
+            elif tag == TEXT and inline is not None and not phonetic:
+                text = []
+            elif tag == PHONETIC:
+                phonetic = True  # 윗주는 값에서 제외
+            elif tag == DIMENSION and pad_rows:
+                width = column_number(attrs.get("ref", "A1").split(":")[-1])
+
+        def end(tag):
+            nonlocal column, cell_text, inline, text, phonetic
+            if tag == CELL:
+                column = column_number(reference) if reference else column + 1
+                if column > len(values) + 1:  # 중간의 빈 열
+                    gap = column - 1 - len(values)
+                    values.extend([None] * gap)
+                    keys.extend([0] * gap)
+                if data_type == "inlineStr":
+                    value = "".join(inline) if inline is not None else None
+                    inline = None
+                elif data_type == "s" and cell_text:
+                    value = shared_strings[int(cell_text)]
+                else:
+                    value = convert(cell_text, data_type, style, keep_errors)
+                values.append(value)
+                if formats:
+                    keys.append(style_keys[style] if style < len(style_keys) else 0)
+            elif tag == VALUE:
+                cell_text, text = "".join(text), None
+            elif tag == TEXT and text is not None:
+                inline.append("".join(text))
+                text = None
+            elif tag == ROW:
+                if len(values) < width:
+                    values.extend([None] * (width - len(values)))
+                completed.append((values, keys))
+            elif tag == PHONETIC:
+                phonetic = False
+
+        def characters(data):
+            if text is not None:
+                text.append(data)
+
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.buffer_text = True
+        parser.StartElementHandler, parser.EndElementHandler, parser.CharacterDataHandler = start, end, characters
+
+        with self.archive.open(self.sheet_paths[sheet_name]) as f:
+            while True:
+                chunk = f.read(PARSE_CHUNK_BYTES)
+                parser.Parse(chunk, not chunk)
+                yield from completed
+                completed.clear()
+                if not chunk:
+                    break
+
+    def iter_rows(self, sheet_name):
+        """ 시트의 행별 값 목록을 1행부터 순서대로 반환 (시트 범위의 열 수까지 빈 값으로 채움) """
+        for values, _ in self._iter_sheet(sheet_name, pad_rows=True):
+            yield values
+
+    def read_sheet(self, sheet_name, formats=False):
+        """ 시트 전체를 SheetRows로 읽음 (formats=True면 셀별 표기법 번호와 행 높이 포함) """
+        rows, format_keys, row_heights = [], [], {}
+        for values, keys in self._iter_sheet(sheet_name, formats=formats, row_heights=row_heights):
+            rows.append(values)
+            format_keys.append(keys)
+        return SheetRows(sheet_name, rows, format_keys if formats else None, row_heights)
+
+    def read_frames(self):
+        """ 모든 시트를 pandas.read_excel(sheet_name=None, header=None)과 같은 DataFrame으로 읽음 """
+        from pandas.io.parsers import TextParser
+
+        frames = {}
+        for sheet_name in self.sheet_names:
+            data, last_row = [], -1
+            for row_number, (values, _) in enumerate(self._iter_sheet(sheet_name, keep_errors=False)):
+                # read_excel과 같은 변환: 빈 셀은 "", 정수 값인 float는 int, 오류 값은 NaN
+                row = ["" if value is None else int(value) if isinstance(value, float) and value.is_integer() else value for value in values]
+                while row and row[-1] == "":
+                    row.pop()
+                if row:
+                    last_row = row_number
+                data.append(row)
+            data = data[:last_row + 1]
+            if data:
+                width = max(map(len, data))
+                data = [row + [""] * (width - len(row)) for row in data]
+                frames[sheet_name] = TextParser(data, header=None, skip_blank_lines=False).read()
+            else:
+                frames[sheet_name] = pd.DataFrame()
+        return frames
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OpenpyxlReader:
+    """
+    openpyxl 기반 리더 (기존 읽기 방식, native 리더를 사용할 수 없을 때의 대체 경로)
+    formats=True면 서식까지 읽는 전체 로드, 아니면 read-only 스트리밍 로드
+    """
+
+    backend = "openpyxl"
+
+    def __init__(self, source, formats=False):
+        from openpyxl import load_workbook
+
+        self.source = source
+        self.wb = load_workbook(source, read_only=not formats, data_only=True)
+        self.sheet_names = [ws.title for ws in self.wb.worksheets]
+        self.number_formats = ["General"]  # native 리더와 같은 방식의 표기법 번호 (0 = General)
+        self._format_keys = {"General": 0}
+
+    def format_key(self, fmt):
+        """ 셀 표기법 문자열의 표기법 번호 (처음 나온 표기법이면 새 번호) """
+        key = self._format_keys.get(fmt)
+        if key is None:
+            key = self._format_keys[fmt] = len(self.number_formats)
+            self.number_formats.append(fmt)
+        return key
+
+    def number_format(self, key):
+        """ 표기법 번호의 표기법 문자열 """
+        return self.number_formats[key]
+
+    def iter_rows(self, sheet_name):
+        for row in self.wb[sheet_name].iter_rows(values_only=True):
+            yield list(row)
+
+    def read_sheet(self, sheet_name, formats=False):
+        ws = self.wb[sheet_name]
+        rows, format_keys = [], []
+        for row in ws.iter_rows():
+            rows.append([cell.value for cell in row])
+            if formats:
+                format_keys.append([self.format_key(cell.number_format or "General") for cell in row])
+        row_heights = {idx: dim.height for idx, dim in ws.row_dimensions.items() if dim.height is not None} if formats else {}
+        return SheetRows(sheet_name, rows, format_keys if formats else None, row_heights)
+
+    def read_frames(self):
+        if hasattr(self.source, "seek"):
+            self.source.seek(0)
+        return pd.read_excel(self.source, sheet_name=None, header=None)
+
+    def close(self):
+        self.wb.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_workbook(source, formats=False, backend=None):
+    """
+    설정된 리더로 엑셀 파일을 여는 함수 (세 기능의 값 읽기는 모두 이 함수를 사용)
+    formats: 셀 표기법/행 높이도 읽을지 여부 (openpyxl 리더는 전체 로드)
+    native 리더로 열 수 없는 파일(XML 구조가 다른 경우 등)은 openpyxl 리더로 대체
+    """
+    backend = backend or READER_BACKEND
+    if backend == "native":
+        try:
+            return NativeXlsxReader(source)
+        except (zipfile.BadZipFile, KeyError, StopIteration, ParseError, ValueError) as e:
+            logger.warning(f"native 리더로 열 수 없어 openpyxl 리더를 사용합니다: {e}")
+            if hasattr(source, "seek"):
+                source.seek(0)
+    return OpenpyxlReader(source, formats)